@@ -0,0 +1,390 @@
+"""
+Benchmark harness for the integration backends.
+
+Replaces the hand-written timeit loops of bench_iter*.py with one registry of
+backends and suites, repeated measurements with summary statistics, JSON/CSV
+output and a regression check against a stored baseline:
+
+    python benchmark.py iter5 --repeat 7 --json results.json
+    python benchmark.py quick --baseline baseline.json --tolerance 0.15
+
+The exit code is 1 if any case is slower than the baseline, so the command can
+gate a deploy.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+from integrate_pool import IntegrationPool
+from integrate_processes import integrate_processed
+from integrate_py import integrate
+from integrate_threads import integrate_threaded
+
+try:
+    import numpy as np
+
+    from integrate_np import integrate_vectorized
+except ImportError:  # NumPy is optional
+    np = None
+
+try:
+    import cyintegrate
+    import cyintegrate_nogil
+    from integrate_threads_nogil import integrate_threaded_nogil
+except ImportError:  # Cython extensions are not built
+    cyintegrate = cyintegrate_nogil = None
+
+A, B = 0.0, math.pi  # every backend integrates sin on [0, pi]
+
+
+class Backend(NamedTuple):
+    """
+    A way to compute ∫[0,π] sin(x) dx.
+
+    run(n_iter, n_jobs, pool) performs one integration. `parallel` backends use
+    `n_jobs`; backends with `pool_kind` get a warm IntegrationPool of that kind,
+    so pool start-up is not part of the measurement.
+    """
+
+    name: str
+    run: Callable[[int, int, IntegrationPool | None], float]
+    parallel: bool = False
+    pool_kind: str | None = None
+
+
+class Suite(NamedTuple):
+    """Backends measured for every problem size (and every n_jobs if parallel)."""
+
+    backends: tuple[str, ...]
+    sizes: tuple[int, ...]
+    jobs: tuple[int, ...] = (1,)
+    repeat: int = 3
+
+
+class Stats(NamedTuple):
+    """Summary of repeated wall-clock timings, in seconds."""
+
+    times: tuple[float, ...]
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stdev: float
+
+
+class BenchResult(NamedTuple):
+    suite: str
+    backend: str
+    n_iter: int
+    n_jobs: int
+    repeat: int
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stdev: float
+
+    @property
+    def key(self) -> tuple[str, str, int, int]:
+        return self.suite, self.backend, self.n_iter, self.n_jobs
+
+
+class Regression(NamedTuple):
+    key: tuple[str, str, int, int]
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+BACKENDS: dict[str, Backend] = {}
+
+
+def register_backend(
+    name: str,
+    run: Callable[[int, int, IntegrationPool | None], float],
+    *,
+    parallel: bool = False,
+    pool_kind: str | None = None,
+) -> None:
+    """Add a backend to the registry (replacing one with the same name)."""
+    BACKENDS[name] = Backend(name, run, parallel, pool_kind)
+
+
+register_backend("python", lambda n, j, pool: integrate(math.sin, A, B, n_iter=n))
+register_backend(
+    "threads", lambda n, j, pool: integrate_threaded(math.sin, A, B, n_jobs=j, n_iter=n), parallel=True
+)
+register_backend(
+    "threads_pool",
+    lambda n, j, pool: integrate_threaded(math.sin, A, B, n_jobs=j, n_iter=n, pool=pool),
+    parallel=True,
+    pool_kind="thread",
+)
+register_backend(
+    "processes", lambda n, j, pool: integrate_processed(math.sin, A, B, n_jobs=j, n_iter=n), parallel=True
+)
+register_backend(
+    "processes_pool",
+    lambda n, j, pool: integrate_processed(math.sin, A, B, n_jobs=j, n_iter=n, pool=pool),
+    parallel=True,
+    pool_kind="process",
+)
+register_backend(
+    "processes_shm_pool",
+    lambda n, j, pool: integrate_processed(math.sin, A, B, n_jobs=j, n_iter=n, pool=pool, shared_memory=True),
+    parallel=True,
+    pool_kind="process",
+)
+if np is not None:
+    register_backend("numpy", lambda n, j, pool: integrate_vectorized(np.sin, A, B, n_iter=n))
+if cyintegrate is not None:
+    register_backend("cython_generic", lambda n, j, pool: cyintegrate.integrate_cy_generic(math.sin, A, B, n))
+    register_backend("cython_sin", lambda n, j, pool: cyintegrate.integrate_cy_sin(A, B, n))
+    register_backend("cython_sin_fast", lambda n, j, pool: cyintegrate.integrate_cy_sin(A, B, n, fast=True))
+    register_backend("nogil", lambda n, j, pool: cyintegrate_nogil.integrate_nogil("sin", A, B, n))
+    register_backend("nogil_fast", lambda n, j, pool: cyintegrate_nogil.integrate_nogil("sin", A, B, n, fast=True))
+    register_backend(
+        "nogil_threads",
+        lambda n, j, pool: integrate_threaded_nogil("sin", A, B, n_jobs=j, n_iter=n),
+        parallel=True,
+    )
+    register_backend(
+        "nogil_threads_fast",
+        lambda n, j, pool: integrate_threaded_nogil("sin", A, B, n_jobs=j, n_iter=n, fast=True),
+        parallel=True,
+    )
+    register_backend(
+        "nogil_openmp",
+        lambda n, j, pool: cyintegrate_nogil.integrate_nogil_parallel("sin", A, B, n, n_threads=j),
+        parallel=True,
+    )
+    register_backend(
+        "nogil_threads_pool",
+        lambda n, j, pool: integrate_threaded_nogil("sin", A, B, n_jobs=j, n_iter=n, pool=pool),
+        parallel=True,
+        pool_kind="thread",
+    )
+
+# The iterN suites reproduce the measurements of bench_iterN.py.
+SUITES: dict[str, Suite] = {
+    "iter1": Suite(("python",), (10_000, 50_000, 100_000, 300_000, 1_000_000), repeat=5),
+    "iter2_3": Suite(("python", "threads", "processes", "processes_pool"), (2_000_000,), (2, 4, 6, 8)),
+    "iter4": Suite(("python", "cython_generic", "cython_sin"), (5_000_000,)),
+    "iter5": Suite(("nogil", "threads", "processes", "nogil_threads"), (20_000_000,), (2, 4, 6, 8)),
+    "quick": Suite(("python", "numpy", "threads", "cython_sin", "nogil", "nogil_threads"), (200_000,), (2,), repeat=5),
+}
+
+
+def measure(fn: Callable[[], object], *, repeat: int = 5, warmup: int = 1) -> Stats:
+    """
+    Call `fn` `warmup` times without timing, then `repeat` times with timing.
+
+    >>> s = measure(lambda: sum(range(1000)), repeat=4)
+    >>> len(s.times), s.min <= s.median <= s.p95
+    (4, True)
+    """
+    if repeat <= 0:
+        raise ValueError("repeat must be positive")
+    if warmup < 0:
+        raise ValueError("warmup must be non-negative")
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return summarize(times)
+
+
+def summarize(times: Sequence[float]) -> Stats:
+    """Min, median, mean, 95th percentile (linear interpolation) and sample stdev."""
+    times = tuple(times)
+    ordered = sorted(times)
+    pos = 0.95 * (len(ordered) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    p95 = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    stdev = statistics.stdev(times) if len(times) > 1 else 0.0
+    return Stats(times, ordered[0], statistics.median(times), statistics.fmean(times), p95, stdev)
+
+
+def run_case(
+    backend: str | Backend, n_iter: int, n_jobs: int = 1, *, repeat: int = 5, warmup: int = 1
+) -> Stats:
+    """Measure one backend at one problem size."""
+    if isinstance(backend, str):
+        try:
+            backend = BACKENDS[backend]
+        except KeyError:
+            raise KeyError(f"unknown backend {backend!r}, available: {sorted(BACKENDS)}") from None
+    if backend.pool_kind is None:
+        return measure(lambda: backend.run(n_iter, n_jobs, None), repeat=repeat, warmup=warmup)
+    with IntegrationPool(backend.pool_kind, max_workers=n_jobs) as pool:
+        # at least one warm-up call, so the workers are started before timing
+        return measure(lambda: backend.run(n_iter, n_jobs, pool), repeat=repeat, warmup=max(warmup, 1))
+
+
+def run_suite(
+    name: str,
+    suite: Suite | None = None,
+    *,
+    repeat: int | None = None,
+    warmup: int = 1,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    """
+    Run every case of a suite. Backends that are not available here (NumPy or
+    Cython extensions missing) are skipped.
+    """
+    if suite is None:
+        try:
+            suite = SUITES[name]
+        except KeyError:
+            raise KeyError(f"unknown suite {name!r}, available: {sorted(SUITES)}") from None
+    repeat = suite.repeat if repeat is None else repeat
+
+    results = []
+    for backend_name in suite.backends:
+        backend = BACKENDS.get(backend_name)
+        if backend is None:
+            continue
+        for n_iter in suite.sizes:
+            for n_jobs in suite.jobs if backend.parallel else (1,):
+                stats = run_case(backend, n_iter, n_jobs, repeat=repeat, warmup=warmup)
+                res = BenchResult(
+                    name, backend_name, n_iter, n_jobs, repeat,
+                    stats.min, stats.median, stats.mean, stats.p95, stats.stdev,
+                )
+                results.append(res)
+                if progress is not None:
+                    progress(res)
+    return results
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save_json(results: Iterable[BenchResult], path: str | os.PathLike) -> None:
+    data = {"machine": machine_info(), "results": [r._asdict() for r in results]}
+    Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def load_json(path: str | os.PathLike) -> list[BenchResult]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [BenchResult(**row) for row in data["results"]]
+
+
+def save_csv(results: Iterable[BenchResult], path: str | os.PathLike) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=BenchResult._fields)
+        writer.writeheader()
+        for r in results:
+            writer.writerow(r._asdict())
+
+
+def compare(
+    results: Iterable[BenchResult], baseline: Iterable[BenchResult], *, tolerance: float = 0.10
+) -> list[Regression]:
+    """
+    Cases whose median is more than `tolerance` (relative) slower than in the baseline.
+    Cases missing from the baseline are ignored.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must be non-negative")
+    base = {r.key: r.median for r in baseline}
+    return [
+        Regression(r.key, base[r.key], r.median)
+        for r in results
+        if r.key in base and r.median > base[r.key] * (1.0 + tolerance)
+    ]
+
+
+def format_result(r: BenchResult) -> str:
+    return (
+        f"{r.suite:>8} {r.backend:<18} n_iter={r.n_iter:>10} n_jobs={r.n_jobs:<3} "
+        f"median={r.median:.6f} p95={r.p95:.6f} stdev={r.stdev:.6f} (x{r.repeat})"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the integration backends on sin over [0, pi].")
+    parser.add_argument("suites", nargs="*", default=["quick"], help=f"suites to run: {', '.join(SUITES)}")
+    parser.add_argument("--backends", nargs="+", help="override the suite backends")
+    parser.add_argument("--sizes", nargs="+", type=int, help="override the suite n_iter values")
+    parser.add_argument("--jobs", nargs="+", type=int, help="override the suite n_jobs values")
+    parser.add_argument("--repeat", type=int, help="timed runs per case (default: per suite)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per case")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown of the median")
+    parser.add_argument("--list", action="store_true", help="list backends and suites and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("backends:", ", ".join(BACKENDS))
+        for name, suite in SUITES.items():
+            print(f"{name}: {', '.join(suite.backends)}; n_iter={list(suite.sizes)}; n_jobs={list(suite.jobs)}")
+        return 0
+
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error(f"unknown suite {name!r}, available: {', '.join(SUITES)}")
+    for name in args.backends or ():
+        if name not in BACKENDS:
+            parser.error(f"unknown backend {name!r}, available: {', '.join(BACKENDS)}")
+
+    results: list[BenchResult] = []
+    for name in args.suites:
+        suite = SUITES[name]._replace(
+            **{
+                field: tuple(value)
+                for field, value in (("backends", args.backends), ("sizes", args.sizes), ("jobs", args.jobs))
+                if value
+            }
+        )
+        results += run_suite(name, suite, repeat=args.repeat, warmup=args.warmup,
+                             progress=lambda r: print(format_result(r), flush=True))
+
+    if args.json:
+        save_json(results, args.json)
+    if args.csv:
+        save_csv(results, args.csv)
+    if args.baseline:
+        regressions = compare(results, load_json(args.baseline), tolerance=args.tolerance)
+        for reg in regressions:
+            suite, backend, n_iter, n_jobs = reg.key
+            print(
+                f"REGRESSION {suite}/{backend} n_iter={n_iter} n_jobs={n_jobs}: "
+                f"{reg.baseline:.6f} -> {reg.current:.6f} sec (x{reg.ratio:.2f})"
+            )
+        if regressions:
+            return 1
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
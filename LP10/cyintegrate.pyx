@@ -1,9 +1,19 @@
 # cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True, nonecheck=False
 # distutils: define_macros=NPY_NO_DEPRECATED_API=NPY_1_7_API_VERSION
 
-from libc.math cimport sin, cos
+from libc.math cimport sin, cos, fabs
 cimport cython
 
+from cykernels cimport sincos_sums
+from reduction import check_summation
+
+# indices of reduction.SUMMATION_MODES
+cdef enum:
+    SUM_NAIVE = 0
+    SUM_KAHAN = 1
+    SUM_PAIRWISE = 2
+    PAIRWISE_BLOCK = 128
+
 @cython.cfunc
 @cython.inline
 cdef double rect_integrate_c(double (*func)(double), double a, double b, long n_iter):
@@ -17,18 +27,86 @@ cdef double rect_integrate_c(double (*func)(double), double a, double b, long n_
     return acc
 
 
-def integrate_cy_sin(double a, double b, long n_iter=100000):
-    """Fast C-level integration for sin(x)."""
+cdef double rect_integrate_kahan_c(double (*func)(double), double a, double b, long n_iter):
+    # Neumaier compensated sum of f(x); multiplied by step once at the end
+    cdef double acc = 0.0
+    cdef double comp = 0.0
+    cdef double step = (b - a) / n_iter
+    cdef long i
+    cdef double y, t
+    for i in range(n_iter):
+        y = func(a + i * step)
+        t = acc + y
+        if fabs(acc) >= fabs(y):
+            comp += (acc - t) + y
+        else:
+            comp += (y - t) + acc
+        acc = t
+    return (acc + comp) * step
+
+
+cdef double _pairwise_c(double (*func)(double), double a, double step, long start, long count):
+    # sum of f(a + i*step) for i in [start, start + count)
+    cdef double acc = 0.0
+    cdef long i, half
+    if count <= PAIRWISE_BLOCK:
+        for i in range(start, start + count):
+            acc += func(a + i * step)
+        return acc
+    half = count // 2
+    return _pairwise_c(func, a, step, start, half) + _pairwise_c(func, a, step, start + half, count - half)
+
+
+cdef double rect_integrate_pairwise_c(double (*func)(double), double a, double b, long n_iter):
+    cdef double step = (b - a) / n_iter
+    return _pairwise_c(func, a, step, 0, n_iter) * step
+
+
+cdef double _integrate_mode(double (*func)(double), double a, double b, long n_iter, int mode):
+    if mode == SUM_KAHAN:
+        return rect_integrate_kahan_c(func, a, b, n_iter)
+    if mode == SUM_PAIRWISE:
+        return rect_integrate_pairwise_c(func, a, b, n_iter)
+    return rect_integrate_c(func, a, b, n_iter)
+
+
+cdef double _fast_sincos(double a, double b, long n_iter, bint want_cos, str summation) except? -1:
+    if summation != "naive":
+        raise ValueError("fast=True has its own multi-accumulator summation, use summation='naive'")
+    cdef double step = (b - a) / n_iter
+    cdef double sum_sin, sum_cos
+    with nogil:
+        sincos_sums(a, step, n_iter, &sum_sin, &sum_cos)
+    return (sum_cos if want_cos else sum_sin) * step
+
+
+def integrate_cy_sin(double a, double b, long n_iter=100000, str summation="naive", bint fast=False):
+    """
+    Fast C-level integration for sin(x).
+
+    `summation` is "naive", "kahan" or "pairwise" (see reduction.SUMMATION_MODES).
+    `fast=True` evaluates blocks of points with several independent accumulators
+    (see cykernels.pxd), several times faster than one libm call per point.
+    """
     if n_iter <= 0:
         raise ValueError("n_iter must be positive")
-    return rect_integrate_c(sin, a, b, n_iter)
+    if fast:
+        return _fast_sincos(a, b, n_iter, False, summation)
+    return _integrate_mode(sin, a, b, n_iter, check_summation(summation))
 
 
-def integrate_cy_cos(double a, double b, long n_iter=100000):
-    """Fast C-level integration for cos(x)."""
+def integrate_cy_cos(double a, double b, long n_iter=100000, str summation="naive", bint fast=False):
+    """
+    Fast C-level integration for cos(x).
+
+    `summation` is "naive", "kahan" or "pairwise" (see reduction.SUMMATION_MODES).
+    `fast=True` - see `integrate_cy_sin`.
+    """
     if n_iter <= 0:
         raise ValueError("n_iter must be positive")
-    return rect_integrate_c(cos, a, b, n_iter)
+    if fast:
+        return _fast_sincos(a, b, n_iter, True, summation)
+    return _integrate_mode(cos, a, b, n_iter, check_summation(summation))
 
 
 def integrate_cy_generic(f, double a, double b, long n_iter=100000):
@@ -0,0 +1,33 @@
+# cython: language_level=3
+# Declarations shared with other Cython modules, so user code can implement its own
+# C-level integrands and register them with `cyintegrate_nogil.register_integrand`:
+#
+#     from cyintegrate_nogil cimport integrand_capsule
+#
+#     cdef double my_f(double x, const double* params, Py_ssize_t n_params) noexcept nogil:
+#         return params[0] * x
+#
+#     cyintegrate_nogil.register_integrand("scaled_x", integrand_capsule(my_f))
+
+from cpython.pycapsule cimport PyCapsule_New
+
+# f(x, params, n_params) -> double; must not touch Python objects (runs under nogil)
+ctypedef double (*integrand_t)(double x, const double* params, Py_ssize_t n_params) noexcept nogil
+
+
+cdef inline object integrand_capsule(integrand_t func):
+    """Wrap a C integrand into a PyCapsule accepted by `register_integrand`."""
+    return PyCapsule_New(<void*>func, b"cyintegrate_nogil.integrand_t", NULL)
+
+
+cdef double rect_integrate_nogil(integrand_t func, const double* params, Py_ssize_t n_params,
+                                 double a, double b, long n_iter) noexcept nogil
+
+
+# summation: index in reduction.SUMMATION_MODES (0 - naive, 1 - kahan, 2 - pairwise)
+cdef double rect_integrate_nogil_sum(integrand_t func, const double* params, Py_ssize_t n_params,
+                                     double a, double b, long n_iter, int summation) noexcept nogil
+
+# fast=True kernel of integrate_nogil (multiple accumulators, rotation for sin/cos)
+cdef double rect_integrate_nogil_fast(integrand_t func, const double* params, Py_ssize_t n_params,
+                                      double a, double b, long n_iter) noexcept nogil
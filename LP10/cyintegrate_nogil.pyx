@@ -1,8 +1,36 @@
 # cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True, nonecheck=False
 
-from libc.math cimport sin
+from array import array
+
+from cpython.pycapsule cimport PyCapsule_GetPointer, PyCapsule_IsValid
+from cython.parallel cimport prange
+
+from cykernels cimport FAST_LANES, sincos_sums
+from libc.math cimport sin, cos, tan, exp, log, sqrt, fabs, atan, sinh, cosh, tanh, asin, acos, pow, NAN
 cimport cython
 
+from reduction import check_summation
+
+cdef const char* CAPSULE_NAME = b"cyintegrate_nogil.integrand_t"
+
+# Whether the module was compiled with OpenMP (see setup_nogil.py); without it
+# prange loops run serially.
+cdef extern from *:
+    """
+    #ifdef _OPENMP
+    #include <omp.h>
+    #define CYINTEGRATE_OPENMP 1
+    static int cyintegrate_max_threads(void) { return omp_get_max_threads(); }
+    #else
+    #define CYINTEGRATE_OPENMP 0
+    static int cyintegrate_max_threads(void) { return 1; }
+    #endif
+    """
+    const int CYINTEGRATE_OPENMP
+    int cyintegrate_max_threads() nogil
+
+OPENMP = bool(CYINTEGRATE_OPENMP)
+
 @cython.cfunc
 cdef double rect_integrate_sin_nogil(double a, double b, long n_iter) nogil:
     cdef double acc = 0.0
@@ -22,3 +50,407 @@ def integrate_sin_nogil(double a, double b, long n_iter=100000):
     with nogil:
         res = rect_integrate_sin_nogil(a, b, n_iter)
     return res
+
+
+# ---------------------------------------------------------------------------
+# Registry of C-level integrands f(x, params, n_params)
+# ---------------------------------------------------------------------------
+
+cdef double _sin(double x, const double* params, Py_ssize_t n_params) noexcept nogil:
+    return sin(x)
+
+
+cdef double _cos(double x, const double* params, Py_ssize_t n_params) noexcept nogil:
+    return cos(x)
+
+
+cdef double _exp(double x, const double* params, Py_ssize_t n_params) noexcept nogil:
+    return exp(x)
+
+
+cdef double _poly(double x, const double* params, Py_ssize_t n_params) noexcept nogil:
+    # Horner scheme, coefficients from the highest degree (as numpy.polyval)
+    cdef double acc = 0.0
+    cdef Py_ssize_t i
+    for i in range(n_params):
+        acc = acc * x + params[i]
+    return acc
+
+
+# Stack machine for integrands compiled by integrate_expr.compile_integrand.
+# Program = pairs (opcode, operand); keep opcodes in sync with integrate_expr.py.
+cdef enum:
+    OP_X = 0
+    OP_CONST = 1
+    OP_ADD = 2
+    OP_SUB = 3
+    OP_MUL = 4
+    OP_DIV = 5
+    OP_POW = 6
+    OP_NEG = 7
+    OP_SQUARE = 8
+    OP_SIN = 9
+    OP_COS = 10
+    OP_TAN = 11
+    OP_EXP = 12
+    OP_LOG = 13
+    OP_SQRT = 14
+    OP_ABS = 15
+    OP_ATAN = 16
+    OP_SINH = 17
+    OP_COSH = 18
+    OP_TANH = 19
+    OP_ASIN = 20
+    OP_ACOS = 21
+    EXPR_STACK_SIZE = 32
+
+
+cdef double _expr(double x, const double* params, Py_ssize_t n_params) noexcept nogil:
+    cdef double stack[EXPR_STACK_SIZE]
+    cdef int sp = 0
+    cdef Py_ssize_t pc
+    cdef int op
+    # malformed programs give NaN instead of reading outside the stack
+    for pc in range(0, n_params - 1, 2):
+        op = <int>params[pc]
+        if op == OP_X or op == OP_CONST:
+            if sp == EXPR_STACK_SIZE:
+                return NAN
+            stack[sp] = x if op == OP_X else params[pc + 1]
+            sp += 1
+        elif op <= OP_POW:
+            if sp < 2:
+                return NAN
+            sp -= 1
+            if op == OP_ADD:
+                stack[sp - 1] = stack[sp - 1] + stack[sp]
+            elif op == OP_SUB:
+                stack[sp - 1] = stack[sp - 1] - stack[sp]
+            elif op == OP_MUL:
+                stack[sp - 1] = stack[sp - 1] * stack[sp]
+            elif op == OP_DIV:
+                stack[sp - 1] = stack[sp - 1] / stack[sp]
+            else:
+                stack[sp - 1] = pow(stack[sp - 1], stack[sp])
+        else:
+            if sp < 1:
+                return NAN
+            if op == OP_NEG:
+                stack[sp - 1] = -stack[sp - 1]
+            elif op == OP_SQUARE:
+                stack[sp - 1] = stack[sp - 1] * stack[sp - 1]
+            elif op == OP_SIN:
+                stack[sp - 1] = sin(stack[sp - 1])
+            elif op == OP_COS:
+                stack[sp - 1] = cos(stack[sp - 1])
+            elif op == OP_TAN:
+                stack[sp - 1] = tan(stack[sp - 1])
+            elif op == OP_EXP:
+                stack[sp - 1] = exp(stack[sp - 1])
+            elif op == OP_LOG:
+                stack[sp - 1] = log(stack[sp - 1])
+            elif op == OP_SQRT:
+                stack[sp - 1] = sqrt(stack[sp - 1])
+            elif op == OP_ABS:
+                stack[sp - 1] = fabs(stack[sp - 1])
+            elif op == OP_ATAN:
+                stack[sp - 1] = atan(stack[sp - 1])
+            elif op == OP_SINH:
+                stack[sp - 1] = sinh(stack[sp - 1])
+            elif op == OP_COSH:
+                stack[sp - 1] = cosh(stack[sp - 1])
+            elif op == OP_TANH:
+                stack[sp - 1] = tanh(stack[sp - 1])
+            elif op == OP_ASIN:
+                stack[sp - 1] = asin(stack[sp - 1])
+            elif op == OP_ACOS:
+                stack[sp - 1] = acos(stack[sp - 1])
+            else:
+                return NAN
+    if sp != 1:
+        return NAN
+    return stack[0]
+
+
+cdef double rect_integrate_nogil(integrand_t func, const double* params, Py_ssize_t n_params,
+                                 double a, double b, long n_iter) noexcept nogil:
+    cdef double acc = 0.0
+    cdef double step = (b - a) / n_iter
+    cdef long i
+    cdef double x
+    for i in range(n_iter):
+        x = a + i * step
+        acc += func(x, params, n_params) * step
+    return acc
+
+
+# indices of reduction.SUMMATION_MODES
+cdef enum:
+    SUM_NAIVE = 0
+    SUM_KAHAN = 1
+    SUM_PAIRWISE = 2
+    PAIRWISE_BLOCK = 128
+
+
+cdef double _kahan_nogil(integrand_t func, const double* params, Py_ssize_t n_params,
+                         double a, double step, long n_iter) noexcept nogil:
+    # Neumaier compensated sum of f(x)
+    cdef double acc = 0.0
+    cdef double comp = 0.0
+    cdef long i
+    cdef double y, t
+    for i in range(n_iter):
+        y = func(a + i * step, params, n_params)
+        t = acc + y
+        if fabs(acc) >= fabs(y):
+            comp += (acc - t) + y
+        else:
+            comp += (y - t) + acc
+        acc = t
+    return acc + comp
+
+
+cdef double _pairwise_nogil(integrand_t func, const double* params, Py_ssize_t n_params,
+                            double a, double step, long start, long count) noexcept nogil:
+    # sum of f(a + i*step) for i in [start, start + count)
+    cdef double acc = 0.0
+    cdef long i, half
+    if count <= PAIRWISE_BLOCK:
+        for i in range(start, start + count):
+            acc += func(a + i * step, params, n_params)
+        return acc
+    half = count // 2
+    return (_pairwise_nogil(func, params, n_params, a, step, start, half)
+            + _pairwise_nogil(func, params, n_params, a, step, start + half, count - half))
+
+
+cdef double rect_integrate_nogil_sum(integrand_t func, const double* params, Py_ssize_t n_params,
+                                     double a, double b, long n_iter, int summation) noexcept nogil:
+    cdef double step = (b - a) / n_iter
+    if summation == SUM_KAHAN:
+        return _kahan_nogil(func, params, n_params, a, step, n_iter) * step
+    if summation == SUM_PAIRWISE:
+        return _pairwise_nogil(func, params, n_params, a, step, 0, n_iter) * step
+    return rect_integrate_nogil(func, params, n_params, a, b, n_iter)
+
+
+cdef double _unrolled_nogil(integrand_t func, const double* params, Py_ssize_t n_params,
+                            double a, double step, long n_iter) noexcept nogil:
+    # FAST_LANES independent accumulators instead of one dependency chain
+    cdef double acc0 = 0.0, acc1 = 0.0, acc2 = 0.0, acc3 = 0.0
+    cdef long m = n_iter - n_iter % FAST_LANES
+    cdef long k, i
+    for k in range(m // FAST_LANES):
+        i = k * FAST_LANES
+        acc0 += func(a + i * step, params, n_params)
+        acc1 += func(a + (i + 1) * step, params, n_params)
+        acc2 += func(a + (i + 2) * step, params, n_params)
+        acc3 += func(a + (i + 3) * step, params, n_params)
+    for i in range(m, n_iter):
+        acc0 += func(a + i * step, params, n_params)
+    return (acc0 + acc1) + (acc2 + acc3)
+
+
+cdef double rect_integrate_nogil_fast(integrand_t func, const double* params, Py_ssize_t n_params,
+                                      double a, double b, long n_iter) noexcept nogil:
+    cdef double step = (b - a) / n_iter
+    cdef double sum_sin, sum_cos
+    # built-in sin/cos: rotation kernel without a libm call per point
+    if func == _sin or func == _cos:
+        sincos_sums(a, step, n_iter, &sum_sin, &sum_cos)
+        return (sum_sin if func == _sin else sum_cos) * step
+    return _unrolled_nogil(func, params, n_params, a, step, n_iter) * step
+
+
+_REGISTRY = {
+    "sin": integrand_capsule(_sin),
+    "cos": integrand_capsule(_cos),
+    "exp": integrand_capsule(_exp),
+    "poly": integrand_capsule(_poly),
+    "expr": integrand_capsule(_expr),
+}
+
+
+def register_integrand(str name, capsule, bint replace=False):
+    """
+    Register a C integrand under `name`.
+
+    `capsule` must be created with `integrand_capsule()` from
+    `cyintegrate_nogil.pxd` (or be a capsule of another registered name).
+    """
+    if not PyCapsule_IsValid(capsule, CAPSULE_NAME):
+        raise TypeError("capsule must wrap a cyintegrate_nogil.integrand_t function")
+    if name in _REGISTRY and not replace:
+        raise ValueError(f"integrand {name!r} is already registered")
+    _REGISTRY[name] = capsule
+
+
+def unregister_integrand(str name):
+    """Remove a registered integrand."""
+    try:
+        del _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"unknown integrand {name!r}") from None
+
+
+def get_integrand(str name):
+    """Return the capsule registered under `name`."""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"unknown integrand {name!r}, registered: {sorted(_REGISTRY)}") from None
+
+
+def registered_integrands():
+    """Names of all registered integrands."""
+    return sorted(_REGISTRY)
+
+
+cdef integrand_t _lookup(str name) except NULL:
+    return <integrand_t>PyCapsule_GetPointer(get_integrand(name), CAPSULE_NAME)
+
+
+cdef double[::1] _as_params(params):
+    # zero-length buffers are replaced by a single unused slot to keep &p[0] valid
+    if params is None or len(params) == 0:
+        return array("d", [0.0])
+    return array("d", params)
+
+
+def call_integrand(str name, double x, params=None):
+    """Evaluate a registered integrand at a single point (mainly for testing)."""
+    cdef integrand_t func = _lookup(name)
+    cdef double[::1] p = _as_params(params)
+    cdef Py_ssize_t n_params = 0 if params is None else len(params)
+    return func(x, &p[0], n_params)
+
+
+def integrate_nogil(str name, double a, double b, long n_iter=100000, params=None,
+                    str summation="naive", bint fast=False):
+    """
+    Left Riemann sum of a registered integrand, computed without the GIL.
+
+    Args:
+        name: registered integrand ("sin", "cos", "exp", "poly", "expr" or user-registered)
+        a, b: integration interval boundaries
+        n_iter: number of rectangles
+        params: sequence of floats passed to the integrand
+            (for "poly" - coefficients from the highest degree,
+            for "expr" - `CompiledIntegrand.program` from integrate_expr)
+        summation: "naive", "kahan" or "pairwise" (see reduction.SUMMATION_MODES)
+        fast: evaluate blocks of points with several independent accumulators;
+            "sin" and "cos" use a rotation kernel without a libm call per point
+            (see cykernels.pxd). Requires summation="naive".
+    """
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    cdef int mode = check_summation(summation)
+    if fast and mode != SUM_NAIVE:
+        raise ValueError("fast=True has its own multi-accumulator summation, use summation='naive'")
+    cdef integrand_t func = _lookup(name)
+    cdef double[::1] p = _as_params(params)
+    cdef Py_ssize_t n_params = 0 if params is None else len(params)
+    cdef double res
+    with nogil:
+        if fast:
+            res = rect_integrate_nogil_fast(func, &p[0], n_params, a, b, n_iter)
+        else:
+            res = rect_integrate_nogil_sum(func, &p[0], n_params, a, b, n_iter, mode)
+    return res
+
+
+def openmp_max_threads():
+    """Number of threads `integrate_nogil_parallel` uses by default (1 without OpenMP)."""
+    return cyintegrate_max_threads()
+
+
+def integrate_nogil_parallel(str name, double a, double b, long n_iter=100000, params=None,
+                             int n_threads=0, str summation="naive"):
+    """
+    Left Riemann sum of a registered integrand, parallelised with OpenMP inside one call.
+
+    The grid is cut into `n_threads` blocks of nearly equal size (the remainder
+    goes to the first blocks); a `prange` loop integrates the blocks on OpenMP
+    threads and the block sums are added in block order, so the result does not
+    depend on thread timing. No Python threads or executors are involved.
+
+    Args:
+        name: registered integrand
+        a, b: integration interval boundaries
+        n_iter: number of rectangles
+        params: sequence of floats passed to the integrand
+        n_threads: number of OpenMP threads, 0 - `openmp_max_threads()`
+        summation: "naive", "kahan" or "pairwise" inside every block
+    """
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    if n_threads < 0:
+        raise ValueError("n_threads must be non-negative")
+    if n_threads == 0:
+        n_threads = cyintegrate_max_threads()
+    cdef int mode = check_summation(summation)
+    cdef integrand_t func = _lookup(name)
+    cdef double[::1] p = _as_params(params)
+    cdef Py_ssize_t n_params = 0 if params is None else len(params)
+
+    cdef long n_blocks = min(<long>n_threads, n_iter)
+    cdef long base = n_iter // n_blocks
+    cdef long rem = n_iter % n_blocks
+    cdef double step = (b - a) / n_iter
+    cdef double[::1] partial = array("d", bytes(8 * n_blocks))
+    cdef long t, lo, hi
+    cdef double total = 0.0
+    with nogil:
+        for t in prange(n_blocks, schedule="static", num_threads=n_threads):
+            lo = t * base + (t if t < rem else rem)
+            hi = lo + base + (1 if t < rem else 0)
+            partial[t] = rect_integrate_nogil_sum(
+                func, &p[0], n_params, a + lo * step, b if hi == n_iter else a + hi * step, hi - lo, mode
+            )
+        for t in range(n_blocks):
+            total += partial[t]
+    return total
+
+
+def integrate_nogil_batch(str name, const double[::1] a, const double[::1] b, long n_iter=100000,
+                          const double[:, :] params=None, str summation="naive"):
+    """
+    Integrate a registered integrand over many intervals in one call without the GIL.
+
+    Args:
+        name: registered integrand
+        a, b: 1-D float64 buffers of equal length with the interval boundaries
+        n_iter: number of rectangles per integral
+        params: None or a 2-D float64 buffer of shape (len(a), k); row i is passed
+            to the integrand for integral i. Rows must be contiguous, the row
+            stride may be 0 (e.g. `numpy.broadcast_to` of one shared row).
+        summation: "naive", "kahan" or "pairwise" (see reduction.SUMMATION_MODES)
+    Returns:
+        array("d") with one value per interval
+    """
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    cdef Py_ssize_t n = a.shape[0]
+    if b.shape[0] != n:
+        raise ValueError(f"a and b must have the same length, got {n} and {b.shape[0]}")
+    if params is not None and params.shape[0] != n:
+        raise ValueError(f"params must have {n} rows, got {params.shape[0]}")
+    if params is not None and params.shape[1] > 1 and params.strides[1] != sizeof(double):
+        raise ValueError("params rows must be contiguous")
+    cdef int mode = check_summation(summation)
+    cdef integrand_t func = _lookup(name)
+
+    out = array("d", bytes(8 * n))
+    cdef double[::1] res = out
+    cdef double[::1] dummy = _as_params(None)
+    cdef const double* p = &dummy[0]
+    cdef Py_ssize_t n_params = 0
+    cdef Py_ssize_t i
+    if params is not None and params.shape[1] > 0:
+        n_params = params.shape[1]
+    with nogil:
+        for i in range(n):
+            if n_params:
+                p = &params[i, 0]
+            res[i] = rect_integrate_nogil_sum(func, p, n_params, a[i], b[i], n_iter, mode)
+    return out
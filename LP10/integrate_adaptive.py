@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Callable, Iterator, NamedTuple
+
+from integrate_py import integrate
+from reduction import check_summation
+
+
+class IntegrationResult(NamedTuple):
+    """Integral value together with an error estimate and evaluation count."""
+
+    value: float
+    error: float
+    n_evals: int
+
+
+# Gauss–Kronrod 7-15 rule (QUADPACK qk15): Kronrod nodes on [0, 1) in
+# decreasing order, the last node is the centre. Gauss nodes are xgk[1::2].
+_XGK = (
+    0.991455371120812639206854697526329,
+    0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926,
+    0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013,
+    0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245,
+    0.000000000000000000000000000000000,
+)
+_WGK = (
+    0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+    0.209482141084727828012999174891714,
+)
+_WG = (
+    0.129484966168869693270611432679082,
+    0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+    0.417959183673469387755102040816327,
+)
+_EPS = 2.220446049250313e-16
+
+
+def _gk15(f: Callable[[float], float], node: tuple):
+    """Gauss–Kronrod 7-15 estimate on [a, b] (15 evaluations)."""
+    a, b = node
+    centre = 0.5 * (a + b)
+    half = 0.5 * (b - a)
+
+    fc = f(centre)
+    res_k = fc * _WGK[7]
+    res_g = fc * _WG[3]
+    values = [fc]
+    for j in range(7):
+        dx = half * _XGK[j]
+        f1 = f(centre - dx)
+        f2 = f(centre + dx)
+        values.append(f1)
+        values.append(f2)
+        res_k += _WGK[j] * (f1 + f2)
+        if j % 2 == 1:
+            res_g += _WG[j // 2] * (f1 + f2)
+
+    # error scaling as in QUADPACK: |K - G| is pessimistic for smooth f
+    mean = res_k * 0.5
+    res_asc = _WGK[7] * abs(fc - mean)
+    for j in range(7):
+        res_asc += _WGK[j] * (abs(values[2 * j + 1] - mean) + abs(values[2 * j + 2] - mean))
+    res_asc *= abs(half)
+    err = abs((res_k - res_g) * half)
+    if res_asc != 0.0 and err != 0.0:
+        err = res_asc * min(1.0, (200.0 * err / res_asc) ** 1.5)
+
+    value = res_k * half
+    err = max(err, 50.0 * _EPS * abs(value))
+    return value, err, 15, ((a, centre), (centre, b))
+
+
+def _simpson(f: Callable[[float], float], node: tuple):
+    """Compare Simpson on [a, b] with Simpson on both halves (2 new evaluations)."""
+    a, b, fa, fm, fb, whole = node
+    m = 0.5 * (a + b)
+    fl = f(0.5 * (a + m))
+    fr = f(0.5 * (m + b))
+    left = (m - a) / 6.0 * (fa + 4.0 * fl + fm)
+    right = (b - m) / 6.0 * (fm + 4.0 * fr + fb)
+    delta = left + right - whole
+    # Richardson extrapolation: error of the halves is ~ delta / 15
+    value = left + right + delta / 15.0
+    err = max(abs(delta) / 15.0, 50.0 * _EPS * abs(value))
+    return value, err, 2, ((a, m, fa, fl, fm, left), (m, b, fm, fr, fb, right))
+
+
+_RULES = {
+    "gk15": _gk15,
+    "simpson": _simpson,
+}
+
+
+def integrate_adaptive(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    *,
+    tol: float = 1e-10,
+    rtol: float = 0.0,
+    rule: str = "gk15",
+    max_intervals: int = 10_000,
+) -> IntegrationResult:
+    """
+    Compute a definite integral with globally adaptive interval subdivision.
+
+    The interval with the largest error estimate is bisected until the sum of
+    error estimates drops below max(tol, rtol * |value|) or `max_intervals`
+    subintervals are in use. Smooth integrands need only a few hundred
+    evaluations instead of a fixed `n_iter`.
+
+    Parameters
+    ----------
+    f : Callable[[float], float]
+        Integrand.
+    a, b : float
+        Integration interval boundaries.
+    tol : float
+        Target absolute error.
+    rtol : float
+        Target relative error.
+    rule : str
+        "gk15" (Gauss–Kronrod 7-15) or "simpson" (Simpson with Richardson
+        error estimate).
+    max_intervals : int
+        Upper bound on the number of subintervals.
+
+    Returns
+    -------
+    IntegrationResult
+        `(value, error, n_evals)`. If `max_intervals` was reached, `error`
+        may be larger than requested.
+
+    Raises
+    ------
+    ValueError
+        If the tolerances are negative, `max_intervals <= 0` or `rule`
+        is unknown.
+
+    Examples
+    --------
+    >>> import math
+    >>> res = integrate_adaptive(math.sin, 0.0, math.pi)
+    >>> abs(res.value - 2.0) < 1e-10, res.n_evals < 1000
+    (True, True)
+    >>> res = integrate_adaptive(lambda x: x*x + 2*x + 1, 0.0, 1.0, rule="simpson")
+    >>> abs(res.value - 7/3) < 1e-10
+    True
+    """
+    if tol < 0 or rtol < 0:
+        raise ValueError("tol and rtol must be non-negative")
+    if max_intervals <= 0:
+        raise ValueError("max_intervals must be positive")
+    if rule not in _RULES:
+        raise ValueError(f"unknown rule {rule!r}, expected one of {sorted(_RULES)}")
+
+    if a == b:
+        return IntegrationResult(0.0, 0.0, 0)
+
+    estimate = _RULES[rule]
+    if rule == "simpson":
+        fa, fm, fb = f(a), f(0.5 * (a + b)), f(b)
+        root = (a, b, fa, fm, fb, (b - a) / 6.0 * (fa + 4.0 * fm + fb))
+        n_evals = 3
+    else:
+        root = (a, b)
+        n_evals = 0
+
+    value, err, used, children = estimate(f, root)
+    n_evals += used
+    # max-heap on error; the counter keeps ordering stable for equal errors
+    heap = [(-err, 0, value, children)]
+    counter = 1
+    total_value, total_err = value, err
+
+    while len(heap) < max_intervals:
+        if total_err <= max(tol, rtol * abs(total_value)):
+            # running sums drift, confirm with exact sums before stopping
+            total_value = math.fsum(item[2] for item in heap)
+            total_err = math.fsum(-item[0] for item in heap)
+            if total_err <= max(tol, rtol * abs(total_value)):
+                break
+        neg_err, _, value, children = heapq.heappop(heap)
+        total_value -= value
+        total_err += neg_err
+        for child in children:
+            value, err, used, grandchildren = estimate(f, child)
+            n_evals += used
+            total_value += value
+            total_err += err
+            heapq.heappush(heap, (-err, counter, value, grandchildren))
+            counter += 1
+
+    return IntegrationResult(
+        math.fsum(item[2] for item in heap),
+        math.fsum(-item[0] for item in heap),
+        n_evals,
+    )
+
+
+class Refinement(NamedTuple):
+    """One level of `refine`: the grid has `n_iter` rectangles."""
+
+    n_iter: int
+    riemann: float  # left Riemann sum, integrate(f, a, b, n_iter=n_iter)
+    value: float  # Romberg extrapolation
+    error: float  # |value - value of the previous level|, inf on the first level
+    n_evals: int  # evaluations of f over all levels so far
+
+
+def refine(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    *,
+    n_iter: int = 1,
+    max_level: int = 30,
+    vectorized: bool = False,
+    summation: str = "naive",
+) -> Iterator[Refinement]:
+    """
+    Estimates on grids of n_iter, 2 * n_iter, 4 * n_iter, ... rectangles,
+    evaluating every point only once.
+
+    Halving the step adds exactly the midpoints of the previous grid, so the
+    left Riemann sum of the next level is L(2n) = (L(n) + M(n)) / 2, where M(n)
+    is the sum over the n new midpoints. Only M(n) is computed (by `integrate`,
+    so `vectorized` and `summation` work as there). The trapezoid values
+    T(n) = L(n) + step * (f(b) - f(a)) / 2 are extrapolated by the Romberg
+    scheme R[k][j] = R[k][j-1] + (R[k][j-1] - R[k-1][j-1]) / (4**j - 1).
+
+    Parameters
+    ----------
+    f : Callable[[float], float]
+        Integrand (array-aware if `vectorized`).
+    a, b : float
+        Integration interval boundaries.
+    n_iter : int
+        Rectangles on the first level.
+    max_level : int
+        Number of refinements after the first level.
+    vectorized : bool
+        Evaluate `f` on NumPy arrays (see `integrate(..., vectorized=True)`).
+    summation : str
+        Summation mode for the sums of each level.
+
+    Yields
+    ------
+    Refinement
+        `(n_iter, riemann, value, error, n_evals)` per level; stop iterating
+        as soon as the estimate is good enough.
+
+    Examples
+    --------
+    >>> for level in refine(math.exp, 0.0, 1.0, n_iter=4, max_level=3):
+    ...     print(level.n_iter, level.n_evals, f"{level.value:.10f} {level.error:.0e}")
+    4 6 1.7272219046 inf
+    8 10 1.7182841547 9e-03
+    16 18 1.7182818287 2e-06
+    32 34 1.7182818285 2e-10
+    """
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    if max_level < 0:
+        raise ValueError("max_level must be non-negative")
+    check_summation(summation)
+
+    if vectorized:
+        import numpy as np
+
+        fa, fb = (float(v) for v in f(np.array([a, b], dtype=float)))
+    else:
+        fa, fb = f(a), f(b)
+    riemann = integrate(f, a, b, n_iter=n_iter, vectorized=vectorized, summation=summation)
+    n_evals = n_iter + 2
+    step = (b - a) / n_iter
+    row = [riemann + 0.5 * step * (fb - fa)]
+    yield Refinement(n_iter, riemann, row[0], math.inf, n_evals)
+
+    for _ in range(max_level):
+        half = 0.5 * step
+        # the midpoints of the current grid are the left points of a grid shifted by half a step
+        mid = integrate(f, a + half, b + half, n_iter=n_iter, vectorized=vectorized, summation=summation)
+        riemann = 0.5 * (riemann + mid)
+        n_evals += n_iter
+        n_iter *= 2
+        step = half
+
+        new_row = [riemann + 0.5 * step * (fb - fa)]
+        factor = 1.0
+        for prev in row:
+            factor *= 4.0
+            new_row.append(new_row[-1] + (new_row[-1] - prev) / (factor - 1.0))
+        error = abs(new_row[-1] - row[-1])
+        row = new_row
+        yield Refinement(n_iter, riemann, row[-1], error, n_evals)
+
+
+def integrate_romberg(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    *,
+    tol: float = 1e-10,
+    rtol: float = 0.0,
+    n_iter: int = 1,
+    max_level: int = 30,
+    vectorized: bool = False,
+) -> IntegrationResult:
+    """
+    Refine (see `refine`) until the error estimate drops below
+    max(tol, rtol * |value|) or `max_level` is reached.
+
+    At least three levels are computed, so that two consecutive estimates
+    agreeing by chance do not stop the refinement.
+
+    >>> res = integrate_romberg(math.sin, 0.0, math.pi)
+    >>> abs(res.value - 2.0) < 1e-10, res.n_evals
+    (True, 66)
+    """
+    if tol < 0 or rtol < 0:
+        raise ValueError("tol and rtol must be non-negative")
+    level = None
+    for i, level in enumerate(refine(f, a, b, n_iter=n_iter, max_level=max_level, vectorized=vectorized)):
+        if i >= 2 and level.error <= max(tol, rtol * abs(level.value)):
+            break
+    return IntegrationResult(level.value, level.error, level.n_evals)
+
+
+if __name__ == "__main__":
+    print(integrate_adaptive(math.cos, 0, math.pi / 2))
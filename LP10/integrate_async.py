@@ -0,0 +1,246 @@
+"""
+asyncio front-end for the integration backends.
+
+Every integration call is CPU-bound and blocking, so an event loop (e.g. of a
+web service) must not run it itself. `AsyncIntegrator` offloads the work to an
+`IntegrationPool` and awaits the result:
+
+    async with AsyncIntegrator("thread", max_workers=4, max_pending=8) as ai:
+        value = await ai.integrate(math.sin, 0.0, math.pi, n_iter=1_000_000, timeout=2.0)
+
+Many coroutines can share one integrator: at most `max_pending` integrals are
+handed to the executor at a time, the others wait on a semaphore inside the
+event loop. An integral is cut into jobs (`n_jobs` slices or `chunk_size`
+points); when the awaiting task is cancelled or its timeout expires, jobs
+that have not started yet are cancelled, so an abandoned request frees the
+workers after at most one job per worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+from typing import Callable, Sequence
+
+from integrate_pool import IntegrationPool, split_interval
+from integrate_py import integrate
+from reduction import check_summation, tree_sum
+
+
+class AsyncIntegrator:
+    """
+    Bounded asyncio wrapper over a persistent `IntegrationPool`.
+
+    >>> import asyncio, math
+    >>> async def main():
+    ...     async with AsyncIntegrator("thread", max_workers=2) as ai:
+    ...         return await asyncio.gather(
+    ...             ai.integrate(math.sin, 0.0, math.pi, n_iter=100_000),
+    ...             ai.integrate(math.cos, 0.0, math.pi / 2, n_iter=100_000, n_jobs=2),
+    ...         )
+    >>> [round(v, 4) for v in asyncio.run(main())]
+    [2.0, 1.0]
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int | None = None,
+        *,
+        max_pending: int | None = None,
+        pool: IntegrationPool | None = None,
+    ):
+        """
+        Args:
+            kind: "thread" or "process", kind of the pool created for this integrator
+            max_workers: number of workers of that pool, defaults to os.cpu_count()
+            max_pending: how many integrals may occupy the executor at once,
+                defaults to the number of workers
+            pool: existing pool to use instead (it is not shut down by `close()`)
+        """
+        # validated before a pool (and its worker processes) is created
+        if max_pending is not None and max_pending <= 0:
+            raise ValueError("max_pending must be positive")
+        if pool is None:
+            pool = IntegrationPool(kind, max_workers=max_workers)
+            self._owns_pool = True
+        else:
+            self._owns_pool = False
+        if max_pending is None:
+            max_pending = pool.max_workers
+        self.pool = pool
+        self.max_pending = max_pending
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._running = 0
+
+    @property
+    def running(self) -> int:
+        """Number of integrals currently submitted to the executor."""
+        return self._running
+
+    async def _run(self, calls: list[functools.partial], timeout: float | None) -> list:
+        return await asyncio.wait_for(self._submit(calls), timeout)
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # asyncio primitives belong to one loop; a new loop (e.g. another
+        # asyncio.run) gets its own `max_pending` slots
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def _submit(self, calls: list[functools.partial]) -> list:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            executor = self.pool.executor
+            self._running += 1
+            fs = [loop.run_in_executor(executor, call) for call in calls]
+            try:
+                return await asyncio.gather(*fs)
+            except BaseException:
+                # a failed job, a timeout or a cancelled request: drop the jobs
+                # that are still queued, running ones finish in the background
+                for fut in fs:
+                    fut.cancel()
+                raise
+            finally:
+                self._running -= 1
+
+    async def integrate(
+        self,
+        f: Callable[[float], float],
+        a: float,
+        b: float,
+        *,
+        n_iter: int = 100_000,
+        n_jobs: int = 1,
+        chunk_size: int | None = None,
+        summation: str = "naive",
+        vectorized: bool = False,
+        timeout: float | None = None,
+    ) -> float:
+        """
+        Awaitable `integrate_py.integrate(f, a, b, ...)` computed on the pool.
+
+        Args:
+            f: integrand (must be pickleable for a process pool)
+            a, b: integration interval boundaries
+            n_iter: total number of rectangles
+            n_jobs: number of jobs the grid is split into
+            chunk_size: points per job instead of `n_jobs` equal jobs; smaller
+                jobs make cancellation and timeouts more responsive
+            summation: summation mode inside each job, jobs are combined by `tree_sum`
+            vectorized: call `f` on NumPy arrays (see `integrate(..., vectorized=True)`)
+            timeout: seconds to wait, including the time spent waiting for a slot
+        Returns:
+            Approximate integral value
+        Raises:
+            TimeoutError: if `timeout` expires (asyncio.TimeoutError before Python 3.11)
+        """
+        if n_jobs <= 0:
+            raise ValueError("n_jobs must be positive")
+        if n_iter <= 0:
+            raise ValueError("n_iter must be positive")
+        check_summation(summation)
+        calls = [
+            functools.partial(integrate, f, lo, hi, n_iter=n, summation=summation, vectorized=vectorized)
+            for lo, hi, n in split_interval(a, b, n_iter, n_jobs, chunk_size)
+        ]
+        return tree_sum(await self._run(calls, timeout))
+
+    async def integrate_nogil(
+        self,
+        name: str,
+        a: float,
+        b: float,
+        *,
+        params: Sequence[float] | None = None,
+        n_iter: int = 1_000_000,
+        n_jobs: int = 1,
+        chunk_size: int | None = None,
+        summation: str = "naive",
+        timeout: float | None = None,
+    ) -> float:
+        """
+        Awaitable `cyintegrate_nogil.integrate_nogil` for a registered C integrand.
+
+        Same arguments as `integrate` with the integrand given by name; on a
+        thread pool the jobs run without the GIL and scale across cores.
+        """
+        import cyintegrate_nogil
+
+        if n_jobs <= 0:
+            raise ValueError("n_jobs must be positive")
+        if n_iter <= 0:
+            raise ValueError("n_iter must be positive")
+        check_summation(summation)
+        cyintegrate_nogil.get_integrand(name)
+        calls = [
+            functools.partial(cyintegrate_nogil.integrate_nogil, name, lo, hi, n, params, summation)
+            for lo, hi, n in split_interval(a, b, n_iter, n_jobs, chunk_size)
+        ]
+        return tree_sum(await self._run(calls, timeout))
+
+    def close(self) -> None:
+        """Shut down the pool if it was created by this integrator."""
+        if self._owns_pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncIntegrator:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"AsyncIntegrator({self.pool!r}, max_pending={self.max_pending}, running={self._running})"
+
+
+_default: AsyncIntegrator | None = None
+
+
+def default_integrator() -> AsyncIntegrator:
+    """Process-wide thread integrator used by `integrate_async`, created on first use."""
+    global _default
+    if _default is None or _default.pool.closed:
+        _default = AsyncIntegrator("thread")
+    return _default
+
+
+@atexit.register
+def _close_default() -> None:
+    if _default is not None:
+        _default.close()
+
+
+async def integrate_async(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    *,
+    integrator: AsyncIntegrator | None = None,
+    **kwargs,
+) -> float:
+    """
+    `await integrate_async(f, a, b, n_iter=..., timeout=...)` without blocking the event loop.
+
+    Runs on `integrator` or on the shared `default_integrator()`; keyword
+    arguments are those of `AsyncIntegrator.integrate`.
+
+    >>> import asyncio, math
+    >>> round(asyncio.run(integrate_async(math.sin, 0.0, math.pi, n_iter=100_000)), 6)
+    2.0
+    """
+    return await (integrator or default_integrator()).integrate(f, a, b, **kwargs)
+
+
+async def integrate_nogil_async(
+    name: str,
+    a: float,
+    b: float,
+    *,
+    integrator: AsyncIntegrator | None = None,
+    **kwargs,
+) -> float:
+    """Same as `integrate_async` for a registered C integrand (`AsyncIntegrator.integrate_nogil`)."""
+    return await (integrator or default_integrator()).integrate_nogil(name, a, b, **kwargs)
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import pickle
+import timeit
+from pathlib import Path
+from typing import Callable, NamedTuple, Sequence, Union
+
+from integrate_expr import CompiledIntegrand
+from integrate_pool import IntegrationPool
+from integrate_processes import integrate_processed
+from integrate_py import integrate as integrate_py
+from integrate_threads import integrate_threaded
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional for the dispatcher
+    np = None
+
+try:
+    import cyintegrate
+    import cyintegrate_nogil
+    from integrate_threads_nogil import integrate_threaded_nogil
+except ImportError:  # Cython extensions are not built
+    cyintegrate = cyintegrate_nogil = integrate_threaded_nogil = None
+
+# Profile written by `python integrate_auto.py` (see `calibrate`).
+DEFAULT_PROFILE_PATH = Path(__file__).with_name("calibration.json")
+
+# Rough numbers taken from the bench_iter*.py screenshots (sin on [0, pi]).
+# rate - points per second of one worker, overhead - fixed cost of one call,
+# worker_overhead - extra cost per worker (thread/process start, task submit).
+_DEFAULT_BACKENDS = {
+    "python": {"rate": 1.0e7, "overhead": 0.0, "worker_overhead": 0.0, "parallel": False},
+    "threads": {"rate": 1.0e7, "overhead": 5e-4, "worker_overhead": 2e-4, "parallel": False},
+    "processes": {"rate": 1.0e7, "overhead": 0.05, "worker_overhead": 0.05, "parallel": True},
+    "numpy": {"rate": 5.0e7, "overhead": 1e-5, "worker_overhead": 0.0, "parallel": False},
+    "cython": {"rate": 1.6e8, "overhead": 1e-6, "worker_overhead": 0.0, "parallel": False},
+    "nogil": {"rate": 1.6e8, "overhead": 1e-6, "worker_overhead": 0.0, "parallel": False},
+    "nogil_threads": {"rate": 1.6e8, "overhead": 5e-4, "worker_overhead": 2e-4, "parallel": True},
+}
+
+Integrand = Union[Callable[[float], float], str, CompiledIntegrand]
+
+
+class CalibrationProfile:
+    """
+    Speed of each backend on this machine, used to estimate run time.
+
+    estimate = overhead + worker_overhead * n_jobs + n_iter / (rate * effective_jobs)
+    where effective_jobs = min(n_jobs, cpu_count) for parallel backends and 1 otherwise.
+    """
+
+    def __init__(self, backends: dict | None = None, cpu_count: int | None = None):
+        self.backends = {name: dict(values) for name, values in _DEFAULT_BACKENDS.items()}
+        for name, values in (backends or {}).items():
+            self.backends.setdefault(name, {}).update(values)
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+
+    def estimate(self, backend: str, n_iter: int, n_jobs: int = 1) -> float:
+        """Estimated wall time in seconds."""
+        p = self.backends[backend]
+        effective = min(n_jobs, self.cpu_count) if p["parallel"] else 1
+        workers = n_jobs if backend in ("threads", "processes", "nogil_threads") else 0
+        return p["overhead"] + p["worker_overhead"] * workers + n_iter / (p["rate"] * effective)
+
+    def to_dict(self) -> dict:
+        return {"cpu_count": self.cpu_count, "backends": self.backends}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CalibrationProfile:
+        return cls(data.get("backends"), data.get("cpu_count"))
+
+    def save(self, path: str | os.PathLike = DEFAULT_PROFILE_PATH) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike = DEFAULT_PROFILE_PATH) -> CalibrationProfile:
+        """Load a saved profile; falls back to the built-in defaults if there is none."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls.from_dict(json.load(fh))
+        except FileNotFoundError:
+            return cls()
+
+
+class Plan(NamedTuple):
+    """Backend chosen by `choose_backend`."""
+
+    backend: str
+    n_jobs: int
+    estimate: float
+
+
+_profile: CalibrationProfile | None = None
+
+
+def _default_profile() -> CalibrationProfile:
+    global _profile
+    if _profile is None:
+        _profile = CalibrationProfile.load()
+    return _profile
+
+
+def _c_name(f: Integrand) -> tuple[str, Sequence[float] | None] | None:
+    """Registry name and params if `f` has a C implementation, else None."""
+    if cyintegrate_nogil is None:
+        return None
+    if isinstance(f, str):
+        return f, None
+    if isinstance(f, CompiledIntegrand):
+        return f.NOGIL_NAME, f.program
+    known = {math.sin: "sin", math.cos: "cos", math.exp: "exp"}
+    if np is not None:
+        known.update({np.sin: "sin", np.cos: "cos", np.exp: "exp"})
+    try:
+        name = known.get(f)
+    except TypeError:  # unhashable callable
+        return None
+    return (name, None) if name else None
+
+
+def _is_vectorized(f: Integrand) -> bool:
+    return isinstance(f, CompiledIntegrand) or (np is not None and isinstance(f, np.ufunc))
+
+
+def _is_picklable(f: Integrand) -> bool:
+    try:
+        pickle.dumps(f)
+    except Exception:
+        return False
+    return True
+
+
+def _candidates(f: Integrand) -> list[str]:
+    c = _c_name(f)
+    if isinstance(f, str):
+        if c is None:
+            raise ImportError("registered C integrands require the cyintegrate_nogil extension")
+        return ["nogil", "nogil_threads"]
+    out = ["python", "threads"]
+    if _is_picklable(f):
+        out.append("processes")
+    if _is_vectorized(f):
+        out.append("numpy")
+    if c is not None:
+        out += ["nogil", "nogil_threads"]
+        if c[0] in ("sin", "cos"):
+            out.append("cython")
+    return out
+
+
+def choose_backend(
+    f: Integrand,
+    n_iter: int,
+    *,
+    n_jobs: int | None = None,
+    profile: CalibrationProfile | None = None,
+) -> Plan:
+    """
+    Pick the backend and job count with the smallest estimated run time.
+
+    Args:
+        f: Python callable, NumPy ufunc, CompiledIntegrand or name of a
+            registered C integrand
+        n_iter: number of rectangles
+        n_jobs: fixed number of workers for parallel backends; by default
+            every value from 2 to cpu_count is considered
+        profile: calibration profile, defaults to `calibration.json` or the
+            built-in numbers
+    Returns:
+        Plan(backend, n_jobs, estimate)
+    """
+    profile = profile or _default_profile()
+    jobs = [n_jobs] if n_jobs else range(2, profile.cpu_count + 1)
+    best = None
+    for backend in _candidates(f):
+        options = jobs if backend in ("threads", "processes", "nogil_threads") else [1]
+        for j in options:
+            plan = Plan(backend, j, profile.estimate(backend, n_iter, j))
+            if best is None or plan.estimate < best.estimate:
+                best = plan
+    return best
+
+
+def integrate(
+    f: Integrand,
+    a: float,
+    b: float,
+    *,
+    n_iter: int = 100_000,
+    params: Sequence[float] | None = None,
+    n_jobs: int | None = None,
+    backend: str | None = None,
+    profile: CalibrationProfile | None = None,
+    pool: IntegrationPool | None = None,
+) -> float:
+    """
+    Single entry point for integration: chooses the fastest available backend.
+
+    Backends: "python", "threads", "processes", "numpy", "cython", "nogil",
+    "nogil_threads". The choice depends on the integrand type (Python callable,
+    NumPy ufunc, `CompiledIntegrand`, name of a registered C integrand or a
+    known math function such as `math.sin`), `n_iter`, the number of cores
+    and the calibration profile.
+
+    Parameters
+    ----------
+    f : Integrand
+        Integrand.
+    a, b : float
+        Integration interval boundaries.
+    n_iter : int
+        Total number of rectangles.
+    params : Sequence[float], optional
+        Parameters of a registered C integrand given by name (e.g. "poly").
+    n_jobs : int, optional
+        Number of workers for parallel backends; chosen automatically if omitted.
+    backend : str, optional
+        Force a backend instead of choosing one.
+    profile : CalibrationProfile, optional
+        Calibration profile used to estimate run times.
+    pool : IntegrationPool, optional
+        Persistent pool used by the "threads", "processes" and "nogil_threads"
+        backends if its kind matches.
+
+    Returns
+    -------
+    float
+        Approximate integral value.
+
+    Examples
+    --------
+    >>> round(integrate(math.sin, 0.0, math.pi, n_iter=200_000), 6)
+    2.0
+    >>> choose_backend(lambda x: x * x, 1000).backend
+    'python'
+    """
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    if n_jobs is not None and n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
+
+    if backend is None:
+        backend, n_jobs, _ = choose_backend(f, n_iter, n_jobs=n_jobs, profile=profile)
+    elif backend not in _DEFAULT_BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {sorted(_DEFAULT_BACKENDS)}")
+    elif backend not in _candidates(f):
+        raise ValueError(f"backend {backend!r} cannot run this integrand")
+    n_jobs = n_jobs or (profile or _default_profile()).cpu_count
+
+    def _pool(kind: str) -> IntegrationPool | None:
+        return pool if pool is not None and pool.kind == kind else None
+
+    if backend in ("nogil", "nogil_threads", "cython"):
+        name, program = _c_name(f)
+        if program is not None:
+            params = program
+        if backend == "cython":
+            kernel = cyintegrate.integrate_cy_sin if name == "sin" else cyintegrate.integrate_cy_cos
+            return kernel(a, b, n_iter)
+        if backend == "nogil":
+            return cyintegrate_nogil.integrate_nogil(name, a, b, n_iter, params)
+        return integrate_threaded_nogil(
+            name, a, b, params=params, n_jobs=n_jobs, n_iter=n_iter, pool=_pool("thread")
+        )
+    if backend == "numpy":
+        func = f.vectorized if isinstance(f, CompiledIntegrand) else f
+        return integrate_py(func, a, b, n_iter=n_iter, vectorized=True)
+    if backend == "threads":
+        return integrate_threaded(f, a, b, n_jobs=n_jobs, n_iter=n_iter, pool=_pool("thread"))
+    if backend == "processes":
+        return integrate_processed(f, a, b, n_jobs=n_jobs, n_iter=n_iter, pool=_pool("process"))
+    return integrate_py(f, a, b, n_iter=n_iter)
+
+
+def calibrate(n_iter: int = 2_000_000, n_jobs: int = 2, number: int = 3) -> CalibrationProfile:
+    """
+    Measure backend speeds the same way bench_iter*.py do (sin on [0, pi]).
+
+    Args:
+        n_iter: number of rectangles for the throughput runs
+        n_jobs: number of workers used to measure startup overhead
+        number: timeit repetitions per measurement
+    Returns:
+        CalibrationProfile for this machine
+    """
+
+    def measure(func: Callable[[], object]) -> float:
+        func()  # warm up
+        return timeit.timeit(func, number=number) / number
+
+    backends: dict[str, dict] = {}
+    t = measure(lambda: integrate_py(math.sin, 0.0, math.pi, n_iter=n_iter))
+    py_rate = n_iter / t
+    backends["python"] = {"rate": py_rate}
+
+    # overhead = time of a tiny problem, the work itself is negligible
+    for name, run in (("threads", integrate_threaded), ("processes", integrate_processed)):
+        t = measure(lambda: run(math.sin, 0.0, math.pi, n_jobs=n_jobs, n_iter=n_jobs))
+        backends[name] = {"rate": py_rate, "overhead": 0.0, "worker_overhead": t / n_jobs}
+
+    if np is not None:
+        t = measure(lambda: integrate_py(np.sin, 0.0, math.pi, n_iter=n_iter, vectorized=True))
+        backends["numpy"] = {"rate": n_iter / t}
+
+    if cyintegrate is not None:
+        c_iter = n_iter * 10
+        t = measure(lambda: cyintegrate.integrate_cy_sin(0.0, math.pi, c_iter))
+        backends["cython"] = {"rate": c_iter / t}
+        t = measure(lambda: cyintegrate_nogil.integrate_nogil("sin", 0.0, math.pi, c_iter))
+        backends["nogil"] = {"rate": c_iter / t}
+        t = measure(lambda: integrate_threaded_nogil("sin", 0.0, math.pi, n_jobs=n_jobs, n_iter=n_jobs))
+        backends["nogil_threads"] = {
+            "rate": backends["nogil"]["rate"], "overhead": 0.0, "worker_overhead": t / n_jobs
+        }
+
+    return CalibrationProfile(backends)
+
+
+if __name__ == "__main__":
+    prof = calibrate()
+    prof.save()
+    print(json.dumps(prof.to_dict(), indent=2))
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+from typing import Callable, Sequence, Union
+
+import numpy as np
+
+from integrate_expr import CompiledIntegrand
+from integrate_pool import BACKEND_KINDS, IntegrationPool, run_tasks, split_range
+from integrate_py import integrate
+from reduction import check_summation
+
+try:
+    import cyintegrate_nogil
+except ImportError:  # Cython extension is not built
+    cyintegrate_nogil = None
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _py_block(f: Callable, a: np.ndarray, b: np.ndarray, params: np.ndarray | None,
+              n_iter: int, summation: str) -> np.ndarray:
+    """Integrate f(x, *params[i]) over [a[i], b[i]] for every i of one block."""
+    out = np.empty(len(a))
+    for i in range(len(a)):
+        g = f if params is None else (lambda x, p=tuple(params[i]): f(x, *p))
+        out[i] = integrate(g, a[i], b[i], n_iter=n_iter, summation=summation)
+    return out
+
+
+def _c_block(name: str, a: np.ndarray, b: np.ndarray, params: np.ndarray | None,
+             n_iter: int, summation: str) -> np.ndarray:
+    """Same as `_py_block` for a registered C integrand, in a single noGIL call."""
+    res = cyintegrate_nogil.integrate_nogil_batch(name, a, b, n_iter, params, summation)
+    return np.frombuffer(res, dtype=np.float64)
+
+
+def integrate_batch(
+    f: Union[Callable[..., float], str, CompiledIntegrand],
+    a: ArrayLike,
+    b: ArrayLike,
+    params: ArrayLike | None = None,
+    *,
+    n_iter: int = 100_000,
+    backend: str | None = None,
+    n_jobs: int | None = None,
+    pool: IntegrationPool | None = None,
+    summation: str = "naive",
+    shared_memory: bool = False,
+) -> np.ndarray:
+    """
+    Compute many small integrals ∫[a_i, b_i] f(x, *params_i) dx in one dispatch.
+
+    Calling `integrate_processed` once per integral pays for task submission,
+    pickling and result collection every time. Here the batch is split into
+    one contiguous block per worker, each worker integrates its whole block
+    in a loop, and the results come back as a single NumPy array.
+
+    Parameters
+    ----------
+    f : Callable, str or CompiledIntegrand
+        - Python callable `f(x, *params_i)` (must be pickleable for "processes");
+        - name of a registered C integrand (see `cyintegrate_nogil`), the block
+          is integrated by `integrate_nogil_batch` without the GIL;
+        - `CompiledIntegrand`, integrated by the C "expr" integrand
+          (`params` must be omitted, the program is the parameter vector).
+    a, b : float or array_like
+        Interval boundaries; scalars are broadcast against arrays.
+    params : array_like, optional
+        2-D array with one row of parameters per integral, or a 1-D array
+        shared by all integrals.
+    n_iter : int
+        Number of rectangles per integral.
+    backend : str, optional
+        "serial", "threads" or "processes". Defaults to "threads" for C
+        integrands (they release the GIL) and "processes" for Python callables.
+        Registered names are looked up in each worker process, so integrands
+        registered at run time only work with "serial" and "threads".
+    n_jobs : int, optional
+        Number of blocks (and workers of a temporary executor).
+        Defaults to `pool.max_workers` or `os.cpu_count()`.
+    pool : IntegrationPool, optional
+        Persistent pool of the matching kind to run on.
+    summation : str
+        Summation mode inside each integral: "naive", "kahan" or "pairwise".
+    shared_memory : bool
+        With the "processes" backend, pass bounds, parameters and results
+        through a shared memory block instead of pickling array slices
+        (see `integrate_shm.run_batch_shm`).
+
+    Returns
+    -------
+    np.ndarray
+        Array of integral values, one per interval, in input order.
+
+    Raises
+    ------
+    ValueError
+        On mismatched shapes, non-positive `n_iter`/`n_jobs` or unknown `backend`.
+
+    Examples
+    --------
+    >>> import math
+    >>> res = integrate_batch(math.pow, 0.0, 1.0, [[1.0], [2.0], [3.0]], n_iter=10_000, backend="serial")
+    >>> np.round(res, 3)
+    array([0.5  , 0.333, 0.25 ])
+    """
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    check_summation(summation)
+
+    if isinstance(f, CompiledIntegrand):
+        if params is not None:
+            raise ValueError("params cannot be used with a CompiledIntegrand")
+        f, params = f.NOGIL_NAME, f.program
+
+    p = None if params is None else np.asarray(params, dtype=np.float64)
+    if p is not None and p.ndim not in (1, 2):
+        raise ValueError(f"params must be a 1-D or 2-D array, got shape {p.shape}")
+    # a, b and the rows of a 2-D params are broadcast against each other
+    rows = [np.empty(p.shape[0])] if p is not None and p.ndim == 2 else []
+    try:
+        a_arr, b_arr, *_ = np.broadcast_arrays(
+            np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64), *rows
+        )
+    except ValueError:
+        raise ValueError("a, b and params rows must have the same length") from None
+    if a_arr.ndim > 1:
+        raise ValueError("a and b must be scalars or 1-D arrays")
+    a_arr = np.ascontiguousarray(a_arr.reshape(-1))
+    b_arr = np.ascontiguousarray(b_arr.reshape(-1))
+    count = len(a_arr)
+    if p is not None and p.ndim == 1:
+        p = np.broadcast_to(p, (count, len(p)))
+
+    if isinstance(f, str):
+        if cyintegrate_nogil is None:
+            raise ImportError("registered C integrands require the cyintegrate_nogil extension")
+        cyintegrate_nogil.get_integrand(f)  # fail fast on unknown names
+        task = _c_block
+        if p is not None:
+            # rows of a broadcast array are contiguous; anything else is copied once
+            if p.strides[1] != p.itemsize:
+                p = np.ascontiguousarray(p)
+        default_backend = "threads"
+    else:
+        task = _py_block
+        default_backend = "processes"
+    if backend is None:
+        backend = default_backend
+    if backend != "serial" and backend not in BACKEND_KINDS:
+        raise ValueError(f"backend must be 'serial', 'threads' or 'processes', got {backend!r}")
+
+    if n_jobs is None:
+        n_jobs = pool.max_workers if pool is not None else (os.cpu_count() or 1)
+    if n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
+    if count == 0:
+        return np.empty(0)
+
+    blocks = split_range(count, n_jobs)
+    tasks = [
+        (task, f, a_arr[lo:hi], b_arr[lo:hi], None if p is None else p[lo:hi], n_iter, summation)
+        for lo, hi in blocks
+    ]
+    if len(tasks) == 1 and pool is None:
+        backend = "serial"  # nothing to parallelise, skip the executor start-up
+    if shared_memory and backend == "processes":
+        from integrate_shm import run_batch_shm
+
+        return run_batch_shm(task, f, a_arr, b_arr, p, blocks, n_iter, summation, len(tasks), pool)
+    return np.concatenate(run_tasks(tasks, backend, len(tasks), pool))
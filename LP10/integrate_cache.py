@@ -0,0 +1,333 @@
+"""
+Memoization of integral values.
+
+Dashboards ask for the same integrals (same integrand, bounds and `n_iter`)
+over and over. `IntegralCache` keys every result on a stable fingerprint of
+the integrand plus `(a, b, n_iter, method)`, keeps the most recently used
+results in memory (LRU) and, optionally, all of them in an SQLite file that
+survives restarts:
+
+    cache = IntegralCache(maxsize=1024, path="integrals.sqlite")
+    cache.integrate(math.sin, 0.0, math.pi, n_iter=1_000_000)   # computed
+    cache.integrate(math.sin, 0.0, math.pi, n_iter=1_000_000)   # from memory
+
+A left Riemann sum over [a, b'] with the same step as a cached [a, b] is the
+cached value plus the sum over the new points [b, b'], so a request that only
+extends `b` evaluates just the extension.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+import threading
+import types
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Callable, NamedTuple, Sequence, Union
+
+from integrate_expr import CompiledIntegrand
+from integrate_py import integrate
+from reduction import check_summation
+
+Integrand = Union[Callable[[float], float], str, CompiledIntegrand]
+
+# relative tolerance for "same step" when reusing a cached prefix
+STEP_RTOL = 1e-12
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    extended: int  # misses served from a cached prefix
+    disk_hits: int
+    currsize: int
+    maxsize: int
+
+
+def _global_names(code: types.CodeType) -> set[str]:
+    """Names a code object (and the functions defined in it) looks up at run time."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _describe(obj, depth: int = 0, stack: tuple = ()) -> tuple:
+    """Structure of an integrand that fingerprint() hashes (see there)."""
+    if depth > 8:
+        raise TypeError("integrand is nested too deeply to fingerprint")
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        return ("value", type(obj).__name__, repr(obj))
+    if isinstance(obj, (tuple, list)):
+        return (type(obj).__name__, tuple(_describe(o, depth + 1, stack) for o in obj))
+    if isinstance(obj, CompiledIntegrand):
+        return ("expr", obj.source)
+    if isinstance(obj, partial):
+        return (
+            "partial", _describe(obj.func, depth + 1, stack), _describe(obj.args, depth + 1, stack),
+            tuple((k, _describe(v, depth + 1, stack)) for k, v in sorted(obj.keywords.items())),
+        )
+    if isinstance(obj, types.CodeType):
+        consts = tuple(_describe(c, depth + 1, stack) for c in obj.co_consts)
+        return ("code", obj.co_code, consts, obj.co_names, obj.co_varnames)
+    if isinstance(obj, types.FunctionType):
+        if id(obj) in stack:
+            # (mutually) recursive functions: the body is already part of the description
+            return ("recursion", obj.__module__, obj.__qualname__)
+        stack = stack + (id(obj),)
+        # the code itself, not its name: an edited lambda gets a new fingerprint
+        cells = tuple(_describe(c.cell_contents, depth + 1, stack) for c in obj.__closure__ or ())
+        # so do the module constants and helper functions it reads
+        used = []
+        for name in sorted(_global_names(obj.__code__)):
+            if name in obj.__globals__:
+                try:
+                    used.append((name, _describe(obj.__globals__[name], depth + 1, stack)))
+                except TypeError as e:
+                    raise TypeError(f"global {name!r} of {obj.__qualname__!r}: {e}") from e
+        return (
+            "function", obj.__module__, obj.__qualname__, _describe(obj.__code__, depth + 1, stack),
+            _describe(obj.__defaults__, depth + 1, stack), cells, tuple(used),
+        )
+    if isinstance(obj, types.MethodType):
+        return ("method", _describe(obj.__func__, depth + 1, stack), _describe(obj.__self__, depth + 1, stack))
+    # builtins (math.sin) and NumPy ufuncs (np.sin) are identified by their name
+    if isinstance(obj, types.BuiltinFunctionType) or type(obj).__name__ == "ufunc":
+        module = getattr(obj, "__module__", None) or getattr(obj.__self__, "__name__", None)
+        return ("builtin", module, obj.__qualname__ if hasattr(obj, "__qualname__") else obj.__name__)
+    if isinstance(obj, types.ModuleType):
+        return ("module", obj.__name__)
+    raise TypeError(f"cannot fingerprint {type(obj).__name__!r} object, pass key= explicitly")
+
+
+def fingerprint(f: Integrand, params: Sequence[float] | None = None) -> str:
+    """
+    Stable hex digest identifying the integrand `f` (and its `params`).
+
+    The digest is the same in every interpreter run, so it can key an on-disk
+    store. Python functions are identified by their byte code, constants,
+    defaults, closure values and the module globals they read (constants and
+    helper functions, recursively), builtins and ufuncs by their qualified name,
+    a `CompiledIntegrand` by its source and a registered C integrand by its
+    name. Other objects, also as globals of a function, raise TypeError.
+
+    >>> fingerprint(lambda x: x * x) == fingerprint(lambda x: x * x)
+    True
+    >>> fingerprint(lambda x: x * x) == fingerprint(lambda x: x * x * x)
+    False
+    >>> fingerprint("poly", [1.0, 0.0]) == fingerprint("poly", [1.0, 1.0])
+    False
+    """
+    if isinstance(f, str):
+        desc = ("nogil", f)
+    else:
+        desc = _describe(f)
+    params = None if params is None else tuple(float(p) for p in params)
+    data = repr((desc, params)).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _compute(f: Integrand, a: float, b: float, n_iter: int, method: str,
+             params: Sequence[float] | None) -> float:
+    """Default computation: noGIL kernel for names, `integrate_py.integrate` otherwise."""
+    if isinstance(f, str):
+        import cyintegrate_nogil
+
+        return cyintegrate_nogil.integrate_nogil(f, a, b, n_iter, params, method)
+    if isinstance(f, CompiledIntegrand):
+        try:
+            import cyintegrate_nogil
+        except ImportError:  # Cython extension is not built
+            pass
+        else:
+            return cyintegrate_nogil.integrate_nogil(f.NOGIL_NAME, a, b, n_iter, f.program, method)
+    return integrate(f, a, b, n_iter=n_iter, summation=method)
+
+
+class IntegralCache:
+    """
+    LRU cache of integral values with an optional SQLite store.
+
+    >>> cache = IntegralCache(maxsize=16)
+    >>> v1 = cache.integrate(math.sin, 0.0, 1.0, n_iter=10_000)
+    >>> v2 = cache.integrate(math.sin, 0.0, 1.0, n_iter=10_000)
+    >>> v1 == v2, cache.info().hits, cache.info().misses
+    (True, 1, 1)
+
+    Extending `b` with the same step evaluates only the new points:
+
+    >>> v3 = cache.integrate(math.sin, 0.0, 2.0, n_iter=20_000)
+    >>> cache.info().extended, round(v3, 4)
+    (1, 1.4161)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        path: str | Path | None = None,
+        *,
+        compute: Callable[..., float] = _compute,
+    ):
+        """
+        Args:
+            maxsize: number of results kept in memory
+            path: SQLite file for a persistent store; `None` keeps results in memory only
+            compute: `compute(f, a, b, n_iter, method, params)` for a missing value,
+                defaults to the noGIL kernel for names and `integrate_py.integrate` otherwise
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.compute = compute
+        self._memory: OrderedDict[tuple, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._extended = self._disk_hits = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS integrals ("
+                "fp TEXT, a REAL, b REAL, n_iter INTEGER, method TEXT, value REAL, "
+                "PRIMARY KEY (fp, a, b, n_iter, method))"
+            )
+            self._db.commit()
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._extended, self._disk_hits,
+                             len(self._memory), self.maxsize)
+
+    def clear(self, *, disk: bool = False) -> None:
+        """Forget the in-memory results (and the stored ones with `disk=True`)."""
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._misses = self._extended = self._disk_hits = 0
+            if disk and self._db is not None:
+                self._db.execute("DELETE FROM integrals")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self) -> IntegralCache:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _remember(self, key: tuple, value: float, *, store: bool) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+        if store and self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO integrals VALUES (?, ?, ?, ?, ?, ?)", (*key, value))
+            self._db.commit()
+
+    def _lookup(self, key: tuple) -> float | None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._hits += 1
+            return self._memory[key]
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT value FROM integrals WHERE fp=? AND a=? AND b=? AND n_iter=? AND method=?", key
+            ).fetchone()
+            if row is not None:
+                self._hits += 1
+                self._disk_hits += 1
+                self._remember(key, row[0], store=False)
+                return row[0]
+        return None
+
+    def _prefix(self, fp: str, a: float, b: float, n_iter: int, method: str) -> tuple[float, int, float] | None:
+        """Cached (b0, n0, value) on the same grid as [a, b] with n0 < n_iter points, the longest one."""
+        step = (b - a) / n_iter
+        candidates = [
+            (kb, kn, v) for (kfp, ka, kb, kn, km), v in self._memory.items()
+            if kfp == fp and ka == a and km == method and kn < n_iter
+        ]
+        if self._db is not None:
+            candidates += self._db.execute(
+                "SELECT b, n_iter, value FROM integrals WHERE fp=? AND a=? AND method=? AND n_iter<?",
+                (fp, a, method, n_iter),
+            ).fetchall()
+        best = None
+        for kb, kn, v in candidates:
+            if math.isclose((kb - a) / kn, step, rel_tol=STEP_RTOL, abs_tol=0.0):
+                if best is None or kn > best[1]:
+                    best = (kb, kn, v)
+        return best
+
+    def integrate(
+        self,
+        f: Integrand,
+        a: float,
+        b: float,
+        *,
+        n_iter: int = 100_000,
+        method: str = "naive",
+        params: Sequence[float] | None = None,
+        key: str | None = None,
+    ) -> float:
+        """
+        Integral of `f` over [a, b], from the cache if it was computed before.
+
+        Args:
+            f: Python callable, `CompiledIntegrand` or name of a registered C integrand
+            a, b: integration interval boundaries
+            n_iter: number of rectangles
+            method: summation mode (see `reduction.SUMMATION_MODES`), part of the key
+            params: parameters of a registered C integrand given by name
+            key: explicit integrand fingerprint, for objects `fingerprint()` rejects
+        Returns:
+            Approximate integral value
+        """
+        if n_iter <= 0:
+            raise ValueError("n_iter must be positive")
+        check_summation(method)
+        fp = key if key is not None else fingerprint(f, params)
+        a, b = float(a), float(b)
+        cache_key = (fp, a, b, int(n_iter), method)
+
+        with self._lock:
+            value = self._lookup(cache_key)
+            if value is not None:
+                return value
+            self._misses += 1
+            prefix = self._prefix(fp, a, b, n_iter, method)
+
+        # computed outside the lock, concurrent misses of different keys run in parallel
+        if prefix is not None:
+            b0, n0, head = prefix
+            value = head + self.compute(f, b0, b, n_iter - n0, method, params)
+        else:
+            value = self.compute(f, a, b, n_iter, method, params)
+
+        with self._lock:
+            if prefix is not None:
+                self._extended += 1
+            self._remember(cache_key, value, store=True)
+        return value
+
+
+_default: IntegralCache | None = None
+
+
+def cached_integrate(f: Integrand, a: float, b: float, **kwargs) -> float:
+    """
+    `IntegralCache.integrate` on a process-wide in-memory cache.
+
+    >>> cached_integrate(math.cos, 0.0, 1.0, n_iter=1000) == cached_integrate(math.cos, 0.0, 1.0, n_iter=1000)
+    True
+    """
+    global _default
+    if _default is None:
+        _default = IntegralCache()
+    return _default.integrate(f, a, b, **kwargs)
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import ast
+import math
+from typing import Union
+
+# Opcodes of the stack machine evaluated by the "expr" integrand in
+# cyintegrate_nogil.pyx. Every instruction takes two slots: (opcode, operand).
+# Keep in sync with the enum in cyintegrate_nogil.pyx.
+OP_X = 0
+OP_CONST = 1
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+OP_POW = 6
+OP_NEG = 7
+OP_SQUARE = 8
+OP_SIN = 9
+OP_COS = 10
+OP_TAN = 11
+OP_EXP = 12
+OP_LOG = 13
+OP_SQRT = 14
+OP_ABS = 15
+OP_ATAN = 16
+OP_SINH = 17
+OP_COSH = 18
+OP_TANH = 19
+OP_ASIN = 20
+OP_ACOS = 21
+
+# Maximum stack depth supported by the C interpreter.
+MAX_STACK = 32
+
+# name -> (opcode, scalar implementation, numpy function name)
+FUNCTIONS = {
+    "sin": (OP_SIN, math.sin, "sin"),
+    "cos": (OP_COS, math.cos, "cos"),
+    "tan": (OP_TAN, math.tan, "tan"),
+    "exp": (OP_EXP, math.exp, "exp"),
+    "log": (OP_LOG, math.log, "log"),
+    "sqrt": (OP_SQRT, math.sqrt, "sqrt"),
+    "abs": (OP_ABS, math.fabs, "abs"),
+    "atan": (OP_ATAN, math.atan, "arctan"),
+    "sinh": (OP_SINH, math.sinh, "sinh"),
+    "cosh": (OP_COSH, math.cosh, "cosh"),
+    "tanh": (OP_TANH, math.tanh, "tanh"),
+    "asin": (OP_ASIN, math.asin, "arcsin"),
+    "acos": (OP_ACOS, math.acos, "arccos"),
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+_BINOPS = {
+    ast.Add: OP_ADD,
+    ast.Sub: OP_SUB,
+    ast.Mult: OP_MUL,
+    ast.Div: OP_DIV,
+    ast.Pow: OP_POW,
+}
+
+VARIABLE = "x"
+
+
+def _check(node: ast.AST) -> None:
+    """Reject everything outside the restricted math grammar."""
+    if isinstance(node, ast.BinOp):
+        if type(node.op) not in _BINOPS:
+            raise ValueError(f"unsupported operator: {type(node.op).__name__}")
+        _check(node.left)
+        _check(node.right)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, (ast.UAdd, ast.USub)):
+            raise ValueError(f"unsupported operator: {type(node.op).__name__}")
+        _check(node.operand)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError(f"unsupported function: {ast.unparse(node.func)}")
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError(f"{node.func.id}() takes exactly one argument")
+        _check(node.args[0])
+    elif isinstance(node, ast.Name):
+        if node.id != VARIABLE and node.id not in CONSTANTS:
+            raise ValueError(f"unknown name: {node.id}")
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"unsupported constant: {node.value!r}")
+    else:
+        raise ValueError(f"unsupported syntax: {type(node).__name__}")
+
+
+def _fold(node: ast.expr) -> ast.expr:
+    """
+    Constant folding: replace subtrees that do not depend on x by their value.
+    Literals are turned into float64 first, so 9**9**9 overflows to inf
+    instead of building a huge Python integer.
+    """
+    if isinstance(node, ast.Constant):
+        return ast.Constant(_float(node.value))
+    if isinstance(node, ast.Name) and node.id in CONSTANTS:
+        return ast.Constant(CONSTANTS[node.id])
+    if isinstance(node, ast.BinOp):
+        left, right = _fold(node.left), _fold(node.right)
+        node = ast.BinOp(left, node.op, right)
+        if isinstance(left, ast.Constant) and isinstance(right, ast.Constant):
+            op = _SCALAR_BINOPS[type(node.op)]
+            return _constant(op, op, left.value, right.value)
+        return node
+    if isinstance(node, ast.UnaryOp):
+        operand = _fold(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(operand, ast.Constant):
+            return ast.Constant(-operand.value)
+        return ast.UnaryOp(node.op, operand)
+    if isinstance(node, ast.Call):
+        arg = _fold(node.args[0])
+        node = ast.Call(node.func, [arg], [])
+        if isinstance(arg, ast.Constant):
+            _, scalar, np_name = FUNCTIONS[node.func.id]
+            return _constant(scalar, np_name, arg.value)
+        return node
+    return node
+
+
+def _float(value: Union[int, float]) -> float:
+    """float64 value of a literal; integers out of its range become inf."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def _constant(func, ieee_func, *args) -> ast.Constant:
+    """
+    Value of a constant subtree. Where Python fails (1/0, log(0)) or goes
+    complex ((-8) ** (1/3)) it is evaluated in NumPy float64, so the folded
+    constant is the inf/nan the C and NumPy paths compute.
+    `ieee_func` is a NumPy function name or a callable applied to float64 values.
+    """
+    try:
+        value = func(*args)
+    except (ArithmeticError, ValueError):
+        value = None
+    if not isinstance(value, (int, float)):
+        import numpy as np
+
+        if isinstance(ieee_func, str):
+            ieee_func = getattr(np, ieee_func)
+        with np.errstate(all="ignore"):
+            value = float(ieee_func(*(np.float64(a) for a in args)))
+    return ast.Constant(value)
+
+
+_SCALAR_BINOPS = {
+    ast.Add: lambda u, v: u + v,
+    ast.Sub: lambda u, v: u - v,
+    ast.Mult: lambda u, v: u * v,
+    ast.Div: lambda u, v: u / v,
+    ast.Pow: lambda u, v: u ** v,
+}
+
+
+def _emit(node: ast.expr, program: list[float]) -> int:
+    """Append stack machine code for `node`, return the stack depth it needs."""
+    if isinstance(node, ast.Constant):
+        program += (OP_CONST, float(node.value))
+        return 1
+    if isinstance(node, ast.Name):
+        program += (OP_X, 0.0)
+        return 1
+    if isinstance(node, ast.UnaryOp):
+        depth = _emit(node.operand, program)
+        program += (OP_NEG, 0.0)
+        return depth
+    if isinstance(node, ast.Call):
+        depth = _emit(node.args[0], program)
+        program += (FUNCTIONS[node.func.id][0], 0.0)
+        return depth
+    # BinOp; x**2 gets a dedicated opcode since pow() is much slower than x*x
+    if isinstance(node.op, ast.Pow) and isinstance(node.right, ast.Constant) and node.right.value == 2:
+        depth = _emit(node.left, program)
+        program += (OP_SQUARE, 0.0)
+        return depth
+    left = _emit(node.left, program)
+    right = _emit(node.right, program)
+    program += (_BINOPS[type(node.op)], 0.0)
+    return max(left, right + 1)
+
+
+class CompiledIntegrand:
+    """
+    Integrand compiled from a restricted math expression in `x`.
+
+    The same formula is available in three forms:
+    - `f(x)` - scalar Python evaluation (math module), usable by every backend;
+      points where Python raises or goes complex give inf/nan as in C;
+    - `f.vectorized(x)` - NumPy ufunc chain for `integrate(..., vectorized=True)`;
+    - `f.program` - stack machine code for the "expr" C integrand of
+      `cyintegrate_nogil`, passed as `params=f.program` (see `NOGIL_NAME`).
+
+    Instances are pickled by their source, so they can be sent to processes.
+    """
+
+    NOGIL_NAME = "expr"
+
+    def __init__(self, source: str, tree: ast.expr):
+        self.source = source
+        self._tree = tree
+        expression = ast.fix_missing_locations(ast.Expression(tree))
+        self._code = compile(expression, f"<integrand {source!r}>", "eval")
+
+        program: list[float] = []
+        depth = _emit(tree, program)
+        if depth > MAX_STACK:
+            raise ValueError(f"expression is too deeply nested (stack depth {depth} > {MAX_STACK})")
+        self.program = tuple(program)
+
+        self._scalar_ns = {"__builtins__": {}}
+        self._scalar_ns.update({name: impl for name, (_, impl, _) in FUNCTIONS.items()})
+        self._numpy_ns = None
+
+    def __call__(self, x: float) -> float:
+        try:
+            value = eval(self._code, self._scalar_ns, {VARIABLE: x})
+        except (ArithmeticError, ValueError):
+            # 1/0, log(0), sqrt(-1), exp(1000): inf or nan as in C
+            return self._ieee(x)
+        if type(value) is complex:
+            # (-1) ** 0.5 is complex in Python, nan in C
+            return self._ieee(x)
+        return value
+
+    def _ieee(self, x: float) -> float:
+        """Scalar evaluation with IEEE 754 semantics (through NumPy), for the rare failing points."""
+        import numpy as np
+
+        with np.errstate(all="ignore"):
+            return float(self.vectorized(np.float64(x)))
+
+    def vectorized(self, x):
+        """Evaluate over a NumPy array; returns an array of the same shape."""
+        if self._numpy_ns is None:
+            import numpy as np
+
+            ns = {"__builtins__": {}}
+            ns.update({name: getattr(np, np_name) for name, (_, _, np_name) in FUNCTIONS.items()})
+            self._numpy_ns = ns
+        return eval(self._code, self._numpy_ns, {VARIABLE: x})
+
+    def __reduce__(self):
+        return compile_integrand, (self.source,)
+
+    def __repr__(self) -> str:
+        return f"CompiledIntegrand({self.source!r})"
+
+
+def compile_integrand(expr: Union[str, ast.AST]) -> CompiledIntegrand:
+    """
+    Compile a math expression of `x` into a `CompiledIntegrand`.
+
+    Supported: numbers, `x`, `pi`, `e`, operators + - * / ** and unary minus,
+    and the functions listed in `FUNCTIONS` (sin, cos, exp, log, sqrt, ...).
+    Anything else (attribute access, other names, comparisons, ...) is rejected.
+
+    Args:
+        expr: expression string such as "x*x + 2*x + 1", a "lambda x: ..." string,
+            or an already parsed `ast` node.
+    Returns:
+        CompiledIntegrand
+    Raises:
+        ValueError: if the expression is not valid in the restricted grammar.
+
+    >>> f = compile_integrand("x*x + 2*x + 1")
+    >>> f(2.0)
+    9.0
+    >>> compile_integrand("lambda x: sin(pi * x)").source
+    'sin(pi * x)'
+    >>> compile_integrand("__import__('os')")
+    Traceback (most recent call last):
+    ...
+    ValueError: unsupported function: __import__
+    """
+    if isinstance(expr, str):
+        try:
+            tree = ast.parse(expr.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"invalid expression {expr!r}: {exc.msg}") from None
+    else:
+        tree = expr
+
+    if isinstance(tree, ast.Expression):
+        tree = tree.body
+    if isinstance(tree, ast.Lambda):
+        args = tree.args
+        if len(args.args) != 1 or args.posonlyargs or args.kwonlyargs or args.vararg or args.kwarg:
+            raise ValueError("lambda must take exactly one argument")
+        tree = _rename(tree.body, args.args[0].arg)
+    if not isinstance(tree, ast.expr):
+        raise ValueError(f"unsupported syntax: {type(tree).__name__}")
+
+    _check(tree)
+    source = ast.unparse(tree)
+    return CompiledIntegrand(source, _fold(tree))
+
+
+def _rename(node: ast.expr, name: str) -> ast.expr:
+    """Rename the lambda argument to `x`."""
+    if name == VARIABLE:
+        return node
+
+    class _Renamer(ast.NodeTransformer):
+        def visit_Name(self, n: ast.Name) -> ast.AST:
+            if n.id == name:
+                return ast.Name(VARIABLE, ast.Load())
+            if n.id == VARIABLE:
+                raise ValueError(f"name {VARIABLE!r} is reserved")
+            return n
+
+    return _Renamer().visit(node)
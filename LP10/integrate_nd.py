@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import itertools
+import math
+import numbers
+import operator
+from typing import Callable, Sequence
+
+import numpy as np
+
+from integrate_adaptive import IntegrationResult
+from integrate_np import DEFAULT_CHUNK_SIZE
+from integrate_pool import IntegrationPool, run_tasks, split_range
+
+Bounds = Sequence[tuple[float, float]]
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)
+
+
+def _check_bounds(bounds: Bounds) -> list[tuple[float, float]]:
+    bounds = [(float(lo), float(hi)) for lo, hi in bounds]
+    if not bounds:
+        raise ValueError("bounds must contain at least one (a, b) pair")
+    return bounds
+
+
+def _axis_points(a: float, b: float, n: int, rule: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+    step = (b - a) / n
+    shift = 0.5 if rule == "midpoint" else 0.0
+    idx = np.arange(start, n if stop is None else stop, dtype=np.float64)
+    return a + (idx + shift) * step
+
+
+def _rect_slab(
+    f: Callable,
+    bounds: list[tuple[float, float]],
+    counts: list[int],
+    rule: str,
+    first: tuple[int, int],
+    vectorized: bool,
+    chunk_size: int,
+) -> float:
+    """Sum of f over the grid rows first[0]..first[1] of axis 0 (without cell volume)."""
+    axes = [_axis_points(*bounds[0], counts[0], rule, *first)]
+    axes += [_axis_points(lo, hi, n, rule) for (lo, hi), n in zip(bounds[1:], counts[1:])]
+
+    if not vectorized:
+        return math.fsum(f(*point) for point in itertools.product(*(ax.tolist() for ax in axes)))
+
+    # broadcasting: axis k has shape (1, ..., n_k, ..., 1), no full mesh is materialized
+    # except for the value block itself, bounded by chunk_size
+    dim = len(axes)
+    inner = math.prod(counts[1:])
+    rows = max(1, chunk_size // max(inner, 1))
+    others = [ax.reshape((1,) * (k + 1) + (-1,) + (1,) * (dim - k - 2)) for k, ax in enumerate(axes[1:])]
+    acc = 0.0
+    for start in range(0, len(axes[0]), rows):
+        x0 = axes[0][start:start + rows].reshape((-1,) + (1,) * (dim - 1))
+        values = f(x0, *others)
+        shape = np.broadcast_shapes(x0.shape, *(o.shape for o in others))
+        acc += float(np.broadcast_to(values, shape).sum())
+    return acc
+
+
+def integrate_rect_nd(
+    f: Callable[..., float],
+    bounds: Bounds,
+    *,
+    n_iter: int | Sequence[int] = 1000,
+    rule: str = "left",
+    vectorized: bool = False,
+    n_jobs: int = 1,
+    backend: str = "threads",
+    pool: IntegrationPool | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> float:
+    """
+    Integrate f(x, y, ...) over a box with a tensor-product rectangle rule.
+
+    The first axis is split into `n_jobs` slabs that are integrated in
+    parallel, as `integrate_threaded` / `integrate_processed` split [a, b].
+    With `vectorized=True` the integrand receives broadcastable NumPy arrays
+    (axis k varies along dimension k), so a 1000x1000 grid costs a few
+    ufunc calls instead of a million Python calls; NumPy ufuncs release the
+    GIL, so the "threads" backend scales in that mode.
+
+    Parameters
+    ----------
+    f : Callable[..., float]
+        Integrand taking one argument per dimension.
+    bounds : Sequence[tuple[float, float]]
+        (a, b) for every dimension.
+    n_iter : int or Sequence[int]
+        Number of rectangles per axis (one value for all axes or one per axis).
+    rule : str
+        "left" (left Riemann sum, as `integrate`) or "midpoint".
+    vectorized : bool
+        Whether `f` accepts NumPy arrays.
+    n_jobs : int
+        Number of slabs / workers.
+    backend : str
+        "serial", "threads" or "processes".
+    pool : IntegrationPool, optional
+        Persistent pool of the kind matching `backend`.
+    chunk_size : int
+        Maximum number of values evaluated per call of a vectorized `f`.
+
+    Returns
+    -------
+    float
+        Approximate value of the integral.
+
+    Examples
+    --------
+    >>> integrate_rect_nd(lambda x, y: x * y, [(0, 1), (0, 2)], n_iter=100, rule="midpoint")
+    1.0
+    >>> round(integrate_rect_nd(lambda x, y: np.sin(x) * np.sin(y), [(0, np.pi)] * 2,
+    ...                         n_iter=1000, vectorized=True, n_jobs=2), 4)
+    4.0
+    """
+    bounds = _check_bounds(bounds)
+    counts = [n_iter] * len(bounds) if isinstance(n_iter, numbers.Integral) else list(n_iter)
+    counts = [operator.index(n) for n in counts]
+    if len(counts) != len(bounds):
+        raise ValueError("n_iter must have one value per dimension")
+    if any(n <= 0 for n in counts):
+        raise ValueError("n_iter must be positive")
+    if n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
+    if rule not in ("left", "midpoint"):
+        raise ValueError(f"rule must be 'left' or 'midpoint', got {rule!r}")
+
+    tasks = [
+        (_rect_slab, f, bounds, counts, rule, block, vectorized, chunk_size)
+        for block in split_range(counts[0], n_jobs)
+    ]
+    partial_sums = run_tasks(tasks, backend if n_jobs > 1 or pool else "serial", n_jobs, pool)
+    cell = math.prod((hi - lo) / n for (lo, hi), n in zip(bounds, counts))
+    return math.fsum(partial_sums) * cell
+
+
+# ---------------------------------------------------------------------------
+# Monte Carlo and quasi-Monte Carlo
+# ---------------------------------------------------------------------------
+
+
+def _halton(indices: np.ndarray, dim: int) -> np.ndarray:
+    """Halton points for the given 1-based indices, shape (len(indices), dim)."""
+    out = np.zeros((len(indices), dim))
+    for d in range(dim):
+        base = _PRIMES[d]
+        idx = indices.copy()
+        frac = 1.0 / base
+        while np.any(idx > 0):
+            out[:, d] += frac * (idx % base)
+            idx //= base
+            frac /= base
+    return out
+
+
+def _evaluate(f: Callable, points: np.ndarray, vectorized: bool) -> np.ndarray:
+    if vectorized:
+        return np.broadcast_to(f(*points.T), (len(points),)).astype(np.float64)
+    return np.fromiter((f(*p) for p in points.tolist()), dtype=np.float64, count=len(points))
+
+
+def _mc_block(f, lo, width, n_points, seed_seq, vectorized, chunk_size) -> tuple[float, float]:
+    """Sum and sum of squares of f over n_points uniform random points."""
+    rng = np.random.default_rng(seed_seq)
+    s = ss = 0.0
+    for start in range(0, n_points, chunk_size):
+        count = min(chunk_size, n_points - start)
+        points = lo + rng.random((count, len(lo))) * width
+        values = _evaluate(f, points, vectorized)
+        s += float(values.sum())
+        ss += float(np.dot(values, values))
+    return s, ss
+
+
+def _qmc_block(f, lo, width, block, shifts, vectorized, chunk_size) -> np.ndarray:
+    """Per-shift sums of f over the Halton points with indices in block."""
+    sums = np.zeros(len(shifts))
+    for start in range(block[0], block[1], chunk_size):
+        stop = min(start + chunk_size, block[1])
+        base = _halton(np.arange(start + 1, stop + 1, dtype=np.int64), len(lo))
+        for k, shift in enumerate(shifts):
+            points = lo + ((base + shift) % 1.0) * width
+            sums[k] += float(_evaluate(f, points, vectorized).sum())
+    return sums
+
+
+def integrate_mc_nd(
+    f: Callable[..., float],
+    bounds: Bounds,
+    *,
+    n_points: int = 100_000,
+    method: str = "qmc",
+    vectorized: bool = False,
+    seed: int | None = None,
+    n_shifts: int = 8,
+    n_jobs: int = 1,
+    backend: str = "threads",
+    pool: IntegrationPool | None = None,
+    chunk_size: int = 100_000,
+) -> IntegrationResult:
+    """
+    Integrate f(x, y, ...) over a box with Monte Carlo or quasi-Monte Carlo.
+
+    "mc" uses independent random streams per worker and reports the standard
+    error. "qmc" uses a Halton sequence with `n_shifts` random shifts
+    (randomized QMC); the error is the standard error over shifts. Each worker
+    gets a contiguous block of points, like the slabs of `integrate_threaded`.
+
+    Parameters
+    ----------
+    f : Callable[..., float]
+        Integrand taking one argument per dimension.
+    bounds : Sequence[tuple[float, float]]
+        (a, b) for every dimension (at most 10 dimensions for "qmc").
+    n_points : int
+        Total number of points ("qmc": per shift).
+    method : str
+        "mc" or "qmc".
+    vectorized : bool
+        Whether `f` accepts NumPy arrays (one array per coordinate).
+    seed : int, optional
+        Seed for reproducible results.
+    n_shifts : int
+        Number of random shifts for "qmc" (at least 2).
+    n_jobs : int
+        Number of blocks / workers.
+    backend : str
+        "serial", "threads" or "processes".
+    pool : IntegrationPool, optional
+        Persistent pool of the kind matching `backend`.
+    chunk_size : int
+        Number of points generated at once per worker.
+
+    Returns
+    -------
+    IntegrationResult
+        `(value, error, n_evals)`.
+
+    Examples
+    --------
+    >>> res = integrate_mc_nd(lambda x, y: x + y, [(0, 1), (0, 1)], n_points=4096, seed=1)
+    >>> abs(res.value - 1.0) < 1e-3, res.n_evals
+    (True, 32768)
+    """
+    bounds = _check_bounds(bounds)
+    if n_points <= 1:
+        raise ValueError("n_points must be greater than 1")
+    if n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
+    if method not in ("mc", "qmc"):
+        raise ValueError(f"method must be 'mc' or 'qmc', got {method!r}")
+
+    dim = len(bounds)
+    lo = np.array([b[0] for b in bounds])
+    width = np.array([b[1] - b[0] for b in bounds])
+    volume = float(np.prod(width))
+    seed_seq = np.random.SeedSequence(seed)
+    run_backend = backend if n_jobs > 1 or pool else "serial"
+    blocks = split_range(n_points, n_jobs)
+
+    if method == "mc":
+        seeds = seed_seq.spawn(len(blocks))
+        tasks = [
+            (_mc_block, f, lo, width, stop - start, s, vectorized, chunk_size)
+            for (start, stop), s in zip(blocks, seeds)
+        ]
+        results = run_tasks(tasks, run_backend, n_jobs, pool)
+        total = math.fsum(r[0] for r in results)
+        total_sq = math.fsum(r[1] for r in results)
+        mean = total / n_points
+        var = max(total_sq / n_points - mean * mean, 0.0) * n_points / (n_points - 1)
+        return IntegrationResult(volume * mean, volume * math.sqrt(var / n_points), n_points)
+
+    if dim > len(_PRIMES):
+        raise ValueError(f"qmc supports at most {len(_PRIMES)} dimensions")
+    if n_shifts < 2:
+        raise ValueError("n_shifts must be at least 2")
+    shifts = np.random.default_rng(seed_seq).random((n_shifts, dim))
+    tasks = [(_qmc_block, f, lo, width, block, shifts, vectorized, chunk_size) for block in blocks]
+    sums = np.sum(run_tasks(tasks, run_backend, n_jobs, pool), axis=0)
+    estimates = volume * sums / n_points
+    error = float(np.std(estimates, ddof=1) / math.sqrt(n_shifts))
+    return IntegrationResult(float(estimates.mean()), error, n_points * n_shifts)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import concurrent.futures as futures
+import os
+from contextlib import nullcontext
+from multiprocessing import resource_tracker
+from typing import Callable, Iterable
+
+from integrate_py import integrate
+
+_EXECUTORS = {
+    "thread": futures.ThreadPoolExecutor,
+    "process": futures.ProcessPoolExecutor,
+}
+
+# backend name used by the front-ends -> IntegrationPool kind
+BACKEND_KINDS = {"threads": "thread", "processes": "process"}
+
+
+class IntegrationPool:
+    """
+    Long-lived worker pool shared by the parallel integration front-ends.
+
+    Creating a ProcessPoolExecutor spawns interpreters, which costs much more
+    than integrating a few million points. The pool is created once and passed
+    as `pool=` to `integrate_threaded`, `integrate_processed` and
+    `integrate_sin_threaded_nogil`, so repeated calls reuse the same workers.
+
+    Use it as a context manager or call `shutdown()` explicitly:
+
+    >>> with IntegrationPool("thread", max_workers=2) as pool:
+    ...     res = pool.integrate_many(abs, [(0.0, 1.0), (-1.0, 1.0)], n_iter=1000)
+    >>> [round(r, 2) for r in res]
+    [0.5, 1.0]
+    """
+
+    def __init__(self, kind: str = "process", max_workers: int | None = None):
+        """
+        Args:
+            kind: "thread" (ThreadPoolExecutor) or "process" (ProcessPoolExecutor)
+            max_workers: number of workers, defaults to os.cpu_count()
+        """
+        if kind not in _EXECUTORS:
+            raise ValueError(f"kind must be one of {sorted(_EXECUTORS)}, got {kind!r}")
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+
+        if kind == "process" and os.name == "posix":
+            # workers forked later inherit the parent's resource tracker, so shared
+            # memory blocks they attach (integrate_shm) are not reported as leaked
+            resource_tracker.ensure_running()
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor = _EXECUTORS[kind](max_workers=max_workers)
+        self._closed = False
+
+    @property
+    def executor(self) -> futures.Executor:
+        """Underlying executor; raises RuntimeError after `shutdown()`."""
+        if self._closed:
+            raise RuntimeError("IntegrationPool is shut down")
+        return self._executor
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> futures.Future:
+        """Schedule `fn(*args, **kwargs)` on the pool."""
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def integrate_many(
+        self,
+        f: Callable[[float], float],
+        intervals: Iterable[tuple[float, float]],
+        *,
+        n_iter: int = 100_000,
+    ) -> list[float]:
+        """
+        Integrate `f` over many intervals at once, one task per interval.
+
+        All tasks are submitted before waiting on any of them, so the
+        workers stay busy for the whole batch.
+
+        Args:
+            f: integrand (must be pickleable for a process pool)
+            intervals: iterable of (a, b) pairs
+            n_iter: number of rectangles per integral
+        Returns:
+            Integral values in the order of `intervals`
+        """
+        if n_iter <= 0:
+            raise ValueError("n_iter must be positive")
+        fs = [self.submit(integrate, f, a, b, n_iter=n_iter) for a, b in intervals]
+        return [fut.result() for fut in fs]
+
+    def require(self, kind: str) -> futures.Executor:
+        """Return the executor, checking that the pool is of the given kind."""
+        if self.kind != kind:
+            raise ValueError(f"expected a {kind!r} pool, got a {self.kind!r} pool")
+        return self.executor
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop the workers. Safe to call more than once."""
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self) -> IntegrationPool:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else "open"
+        return f"IntegrationPool(kind={self.kind!r}, max_workers={self.max_workers}, {state})"
+
+
+def run_tasks(tasks: list[tuple], backend: str, n_jobs: int, pool: IntegrationPool | None = None) -> list:
+    """
+    Run `task(*args)` for every `(task, *args)` tuple and return the results in order.
+
+    Args:
+        tasks: list of (callable, *args) tuples
+        backend: "serial" (in the caller thread), "threads" or "processes"
+        n_jobs: number of workers of a temporary executor (ignored with `pool`)
+        pool: persistent pool of the matching kind to run on
+    """
+    if backend == "serial":
+        return [task(*args) for task, *args in tasks]
+    if backend not in BACKEND_KINDS:
+        raise ValueError(f"backend must be 'serial', 'threads' or 'processes', got {backend!r}")
+
+    kind = BACKEND_KINDS[backend]
+    if pool is None:
+        ctx = _EXECUTORS[kind](max_workers=n_jobs)
+    else:
+        ctx = nullcontext(pool.require(kind))
+    with ctx as executor:
+        fs = [executor.submit(task, *args) for task, *args in tasks]
+        return [fut.result() for fut in fs]
+
+
+def split_range(count: int, parts: int) -> list[tuple[int, int]]:
+    """
+    Split range(count) into `parts` contiguous blocks, sizes differ by at most 1.
+
+    Empty blocks are dropped, so no point is lost and none is counted twice:
+
+    >>> split_range(10, 3)
+    [(0, 4), (4, 7), (7, 10)]
+    >>> split_range(2, 4)
+    [(0, 1), (1, 2)]
+    """
+    base, rem = divmod(count, parts)
+    blocks, start = [], 0
+    for i in range(parts):
+        stop = start + base + (i < rem)
+        if stop > start:
+            blocks.append((start, stop))
+        start = stop
+    return blocks
+
+
+def split_grid(n_iter: int, parts: int, chunk_size: int | None = None) -> list[tuple[int, int]]:
+    """
+    Index blocks [lo, hi) of a grid of `n_iter` points: `parts` nearly equal
+    blocks, or blocks of `chunk_size` points if it is given.
+
+    >>> split_grid(10, 2, chunk_size=4)
+    [(0, 4), (4, 8), (8, 10)]
+    """
+    if chunk_size is None:
+        return split_range(n_iter, parts)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    return [(lo, min(lo + chunk_size, n_iter)) for lo in range(0, n_iter, chunk_size)]
+
+
+def split_interval(
+    a: float, b: float, n_iter: int, parts: int, chunk_size: int | None = None
+) -> list[tuple[float, float, int]]:
+    """
+    Split the grid of `n_iter` rectangles on [a, b] into jobs `(a_i, b_i, n_iter_i)`.
+
+    Without `chunk_size` the grid is cut into `parts` jobs whose sizes differ by
+    at most one point; with `chunk_size` into jobs of `chunk_size` points (the
+    last one may be shorter), so an executor with `parts` workers hands them
+    out dynamically: a worker that finishes early simply takes the next chunk.
+    Job bounds are taken from the global grid, so the jobs together evaluate
+    exactly the `n_iter` points of `integrate(f, a, b, n_iter=n_iter)`.
+
+    >>> split_interval(0.0, 10.0, 10, 3)
+    [(0.0, 4.0, 4), (4.0, 7.0, 3), (7.0, 10.0, 3)]
+    >>> [n for _, _, n in split_interval(0.0, 1.0, 10, 2, chunk_size=4)]
+    [4, 4, 2]
+    """
+    blocks = split_grid(n_iter, parts, chunk_size)
+    step = (b - a) / n_iter
+    # the last bound is b itself, not a + n_iter * step with its rounding error
+    return [(a + lo * step, b if hi == n_iter else a + hi * step, hi - lo) for lo, hi in blocks]
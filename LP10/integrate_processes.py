@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import concurrent.futures as futures
+from contextlib import nullcontext
 from functools import partial
 from typing import Callable
 
+from integrate_pool import IntegrationPool, split_interval
 from integrate_py import integrate
+from profiling import IntegrationProfile, executor_scope, phase, run_profiled
+from reduction import check_summation, tree_sum
 
 
 def integrate_processed(
@@ -14,6 +18,11 @@ def integrate_processed(
     *,
     n_jobs: int = 2,
     n_iter: int = 100_000,
+    pool: IntegrationPool | None = None,
+    summation: str = "naive",
+    chunk_size: int | None = None,
+    shared_memory: bool = False,
+    profile: IntegrationProfile | None = None,
 ) -> float:
     """
     Parallel integration using processes (ProcessPoolExecutor).
@@ -29,7 +38,28 @@ def integrate_processed(
     n_jobs : int
         Number of worker processes.
     n_iter : int
-        Total number of rectangles.
+        Total number of rectangles; all of them are evaluated even when
+        `n_iter` is not divisible by `n_jobs`.
+    pool : IntegrationPool, optional
+        Persistent process pool to run on. If omitted, a ProcessPoolExecutor with
+        `n_jobs` workers is created and shut down for this call only.
+    summation : str
+        Summation mode inside each job: "naive", "kahan" or "pairwise".
+        Job results are always combined by `reduction.tree_sum` in submission
+        order, so the result does not depend on which job finishes first.
+    chunk_size : int, optional
+        If given, the grid is cut into jobs of `chunk_size` points instead of
+        `n_jobs` equal slices. Idle workers take the next pending chunk, which
+        balances integrands whose cost varies along [a, b]. Smaller chunks
+        balance better but pay more per-task overhead.
+    shared_memory : bool
+        Exchange grid parameters and partial results through a shared memory
+        block instead of pickled arguments and futures
+        (see `integrate_shm.integrate_processed_shm`).
+    profile : IntegrationProfile, optional
+        Collects phase timings and per-job counters of this call
+        (see `profiling`). Not collected by default. With `shared_memory=True`
+        only the whole call is timed, as the `compute` phase.
 
     Returns
     -------
@@ -40,14 +70,37 @@ def integrate_processed(
         raise ValueError("n_jobs must be positive")
     if n_iter <= 0:
         raise ValueError("n_iter must be positive")
+    check_summation(summation)
+    if shared_memory:
+        from integrate_shm import integrate_processed_shm
 
-    step_job = (b - a) / n_jobs
-    iters_per_job = n_iter // n_jobs
+        with phase(profile, "compute"):
+            value = integrate_processed_shm(
+                f, a, b, n_jobs=n_jobs, n_iter=n_iter, pool=pool, summation=summation, chunk_size=chunk_size
+            )
+        if profile is not None:
+            profile.calls += 1
+        return value
 
-    with futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
-        spawn = partial(executor.submit, integrate, f, n_iter=iters_per_job)
-        fs = [
-            spawn(a + i * step_job, a + (i + 1) * step_job)
-            for i in range(n_jobs)
-        ]
-        return sum(fut.result() for fut in futures.as_completed(fs))
+    with phase(profile, "split"):
+        jobs = split_interval(a, b, n_iter, n_jobs, chunk_size)
+
+    with phase(profile, "startup"):
+        if pool is None:
+            ctx = futures.ProcessPoolExecutor(max_workers=n_jobs)
+        else:
+            ctx = nullcontext(pool.require("process"))
+
+    with executor_scope(profile, ctx) as executor:
+        if profile is None:
+            spawn = partial(executor.submit, integrate, f, summation=summation)
+            fs = [spawn(lo, hi, n_iter=n) for lo, hi, n in jobs]
+            parts = [fut.result() for fut in fs]
+        else:
+            parts = run_profiled(profile, executor, integrate, f, jobs, summation=summation)
+
+    with phase(profile, "reduce"):
+        value = tree_sum(parts)
+    if profile is not None:
+        profile.calls += 1
+    return value
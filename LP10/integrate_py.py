@@ -3,13 +3,18 @@ from __future__ import annotations
 import math
 from typing import Callable
 
+from reduction import check_summation, kahan_sum, pairwise_sum
+
 
 def integrate(
     f: Callable[[float], float],
     a: float,
     b: float,
     *,
-    n_iter: int = 100_000
+    n_iter: int = 100_000,
+    vectorized: bool = False,
+    chunk_size: int | None = None,
+    summation: str = "naive",
 ) -> float:
     """
     Compute a definite integral using the left Riemann sum (rectangle method).
@@ -29,6 +34,17 @@ def integrate(
     n_iter:
         Number of rectangles (iterations). Must be a positive integer.
         Larger values generally improve accuracy but increase runtime.
+    vectorized:
+        If True, `f` is treated as array-aware (e.g. `numpy.sin`) and is
+        evaluated over chunks of the grid at once (see `integrate_np`).
+        Requires NumPy.
+    chunk_size:
+        Maximum number of points per call of `f` in vectorized mode.
+        Bounds memory usage; defaults to `integrate_np.DEFAULT_CHUNK_SIZE`.
+    summation:
+        How the rectangle areas are accumulated (see `reduction.SUMMATION_MODES`):
+        "naive" (acc += f(x) * step), "kahan" (compensated) or "pairwise".
+        Compensated modes reach the same accuracy with a smaller `n_iter`.
 
     Returns
     float
@@ -36,7 +52,7 @@ def integrate(
 
     Raises
     ValueError
-        If `n_iter <= 0`.
+        If `n_iter <= 0` or `summation` is unknown.
 
     Examples
     --------
@@ -51,15 +67,44 @@ def integrate(
     >>> f = lambda x: x*x + 2*x + 1
     >>> abs(integrate(f, 0.0, 1.0, n_iter=200_000) - (7/3)) < 1e-4
     True
+
+    Vectorized example (NumPy integrand evaluated chunk by chunk):
+
+    >>> import numpy as np
+    >>> round(integrate(np.sin, 0.0, math.pi, n_iter=200_000, vectorized=True), 6)
+    2.0
+
+    Compensated summation:
+
+    >>> round(integrate(math.sin, 0.0, math.pi, n_iter=200_000, summation="kahan"), 6)
+    2.0
     """
     if n_iter <= 0:
         raise ValueError("n_iter must be a positive integer")
+    check_summation(summation)
+
+    if vectorized:
+        from integrate_np import DEFAULT_CHUNK_SIZE, integrate_vectorized
+
+        return integrate_vectorized(
+            f, a, b,
+            n_iter=n_iter,
+            chunk_size=DEFAULT_CHUNK_SIZE if chunk_size is None else chunk_size,
+            summation=summation,
+        )
 
-    acc = 0.0
     step = (b - a) / n_iter
-    for i in range(n_iter):
-        acc += f(a + i * step) * step
-    return acc
+    if summation == "naive":
+        acc = 0.0
+        for i in range(n_iter):
+            acc += f(a + i * step) * step
+        return acc
+
+    # compensated modes sum the heights and multiply by step once
+    heights = (f(a + i * step) for i in range(n_iter))
+    if summation == "kahan":
+        return kahan_sum(heights) * step
+    return pairwise_sum(heights) * step
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import atexit
+import concurrent.futures as futures
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+from typing import Callable
+
+from integrate_pool import IntegrationPool, split_grid
+from integrate_py import integrate
+from reduction import check_summation, tree_sum
+
+# Layout of the shared block, float64 slots:
+#   [a, b, n_iter, n_tasks] + n_tasks * [lo, hi, result]
+# lo/hi are indices into the global grid a + i * step (exact up to 2**53).
+HEADER = 4
+SLOT = 3
+ITEMSIZE = 8
+
+# Creating and mapping a block costs more than pickling a few floats, so
+# blocks are reused: the parent keeps released blocks in `_free_blocks`
+# (unlinked at exit), workers keep the last few mapped blocks in `_attached`.
+_free_blocks: list[shared_memory.SharedMemory] = []
+_blocks_lock = threading.Lock()
+_attached: OrderedDict[str, tuple[shared_memory.SharedMemory, memoryview]] = OrderedDict()
+MAX_ATTACHED = 4
+
+
+def _acquire_block(n_doubles: int) -> shared_memory.SharedMemory:
+    size = max(n_doubles, 1) * ITEMSIZE
+    with _blocks_lock:
+        for i, shm in enumerate(_free_blocks):
+            if shm.size >= size:
+                return _free_blocks.pop(i)
+    return shared_memory.SharedMemory(create=True, size=size)
+
+
+def _release_block(shm: shared_memory.SharedMemory) -> None:
+    with _blocks_lock:
+        _free_blocks.append(shm)
+
+
+@atexit.register
+def _unlink_blocks() -> None:
+    with _blocks_lock:
+        while _free_blocks:
+            shm = _free_blocks.pop()
+            shm.close()
+            shm.unlink()
+
+
+def _view(name: str) -> memoryview:
+    """Worker side: float64 view of the parent's block, mapped once per worker."""
+    if name in _attached:
+        _attached.move_to_end(name)
+        return _attached[name][1]
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers the block again, but with the resource tracker
+        # shared with the parent, so the parent's unlink() clears it
+        shm = shared_memory.SharedMemory(name=name)
+    buf = shm.buf.cast("d")
+    _attached[name] = (shm, buf)
+    if len(_attached) > MAX_ATTACHED:
+        _, (old, old_buf) = _attached.popitem(last=False)
+        old_buf.release()
+        old.close()
+    return buf
+
+
+def _shm_task(name: str, task: int, f: Callable, vectorized: bool, summation: str) -> None:
+    """Worker: read the job `task` from the block, write its partial sum back."""
+    buf = _view(name)
+    a, b, n_iter = buf[0], buf[1], int(buf[2])
+    base = HEADER + task * SLOT
+    lo, hi = int(buf[base]), int(buf[base + 1])
+    step = (b - a) / n_iter
+    upper = b if hi == n_iter else a + hi * step
+    buf[base + 2] = integrate(f, a + lo * step, upper, n_iter=hi - lo,
+                              vectorized=vectorized, summation=summation)
+
+
+def integrate_processed_shm(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    *,
+    n_jobs: int = 2,
+    n_iter: int = 100_000,
+    pool: IntegrationPool | None = None,
+    summation: str = "naive",
+    chunk_size: int | None = None,
+    vectorized: bool = False,
+) -> float:
+    """
+    Parallel integration using processes that exchange data through shared memory.
+
+    The grid parameters and one result slot per job live in a single
+    `multiprocessing.shared_memory` block. A task carries only the block
+    name, its job index and the integrand; the worker reads its part of the
+    grid from the block and writes the partial sum back, so nothing but
+    `None` travels through the futures. With `vectorized=True` every worker
+    builds its NumPy grid locally, no arrays are pickled either. Blocks are
+    reused between calls, so on a persistent `pool` a call costs no more
+    than the task round-trips.
+
+    Parameters
+    ----------
+    f : Callable[[float], float]
+        Integrand (MUST be pickleable).
+    a, b : float
+        Integration interval boundaries.
+    n_jobs : int
+        Number of worker processes.
+    n_iter : int
+        Total number of rectangles.
+    pool : IntegrationPool, optional
+        Persistent process pool to run on. If omitted, a ProcessPoolExecutor with
+        `n_jobs` workers is created and shut down for this call only.
+    summation : str
+        Summation mode inside each job; job results are combined by
+        `reduction.tree_sum` in job order.
+    chunk_size : int, optional
+        Points per dynamically scheduled job instead of `n_jobs` equal jobs.
+    vectorized : bool
+        Workers call `f` on NumPy arrays (see `integrate(..., vectorized=True)`).
+
+    Returns
+    -------
+    float
+        Approximate integral value.
+    """
+    if n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
+    if n_iter <= 0:
+        raise ValueError("n_iter must be positive")
+    check_summation(summation)
+    blocks = split_grid(n_iter, n_jobs, chunk_size)
+
+    shm = _acquire_block(HEADER + SLOT * len(blocks))
+    buf = shm.buf.cast("d")
+    try:
+        buf[0], buf[1], buf[2], buf[3] = a, b, float(n_iter), float(len(blocks))
+        for i, (lo, hi) in enumerate(blocks):
+            base = HEADER + i * SLOT
+            buf[base], buf[base + 1], buf[base + 2] = float(lo), float(hi), 0.0
+
+        if pool is None:
+            ctx = futures.ProcessPoolExecutor(max_workers=n_jobs)
+        else:
+            ctx = nullcontext(pool.require("process"))
+        with ctx as executor:
+            fs = [
+                executor.submit(_shm_task, shm.name, i, f, vectorized, summation)
+                for i in range(len(blocks))
+            ]
+            for fut in fs:
+                fut.result()  # re-raises worker errors
+        return tree_sum([buf[HEADER + i * SLOT + 2] for i in range(len(blocks))])
+    finally:
+        buf.release()
+        _release_block(shm)
+
+
+def _shm_batch_task(name: str, count: int, n_params: int, lo: int, hi: int,
+                    task: Callable, f, n_iter: int, summation: str) -> None:
+    """Worker: integrate rows [lo, hi) of a batch stored in the block."""
+    import numpy as np
+
+    data = np.asarray(_view(name))
+    a, b, out = data[:count], data[count:2 * count], data[2 * count:3 * count]
+    params = None
+    if n_params:
+        params = data[3 * count:3 * count + count * n_params].reshape(count, n_params)[lo:hi]
+    out[lo:hi] = task(f, a[lo:hi], b[lo:hi], params, n_iter, summation)
+
+
+def run_batch_shm(task: Callable, f, a, b, params, blocks: list[tuple[int, int]],
+                  n_iter: int, summation: str, n_jobs: int, pool: IntegrationPool | None):
+    """
+    Process backend of `integrate_batch(..., shared_memory=True)`.
+
+    a, b, params and the results are placed in one block, laid out as
+    [a (n), b (n), out (n), params (n * k)]; tasks carry only row ranges.
+    """
+    import numpy as np
+
+    count = len(a)
+    n_params = 0 if params is None else params.shape[1]
+    shm = _acquire_block(count * (3 + n_params))
+    buf = shm.buf.cast("d")
+    try:
+        data = np.asarray(buf)
+        data[:count], data[count:2 * count] = a, b
+        if n_params:
+            data[3 * count:3 * count + count * n_params].reshape(count, n_params)[:] = params
+        if pool is None:
+            ctx = futures.ProcessPoolExecutor(max_workers=n_jobs)
+        else:
+            ctx = nullcontext(pool.require("process"))
+        with ctx as executor:
+            fs = [
+                executor.submit(_shm_batch_task, shm.name, count, n_params, lo, hi, task, f, n_iter, summation)
+                for lo, hi in blocks
+            ]
+            for fut in fs:
+                fut.result()
+        result = data[2 * count:3 * count].copy()
+        del data
+        return result
+    finally:
+        buf.release()
+        _release_block(shm)
@@ -0,0 +1,248 @@
+"""
+Integration of sampled data: y_0, y_1, ... taken at x_i = x_0 + i * dx.
+
+The samples may come from an iterator or generator (read once, chunk by
+chunk), a NumPy array or a memory-mapped file (`load_samples`); only one
+chunk of `chunk_size` values is in memory at a time. Trapezoid and composite
+Simpson weights depend only on the global index of a sample, so every chunk
+contributes one weighted sum and the first/last samples are corrected at the
+end:
+
+    trapezoid: dx * (sum(y) - (y_0 + y_n) / 2)
+    simpson:   dx / 3 * (y_0 + 4 y_1 + 2 y_2 + ... + 4 y_{n-1} + y_n)
+
+With an odd number of intervals Simpson's rule covers all but the last three
+intervals, which are integrated by Simpson's 3/8 rule. A file can also be cut
+into blocks integrated in parallel (`integrate_samples_parallel`).
+"""
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from integrate_pool import IntegrationPool, run_tasks, split_range
+from reduction import check_summation, kahan_sum, pairwise_sum, tree_sum
+
+RULES = ("trapezoid", "simpson")
+
+# Samples per chunk: 1_000_000 float64 values -> ~8 MB.
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+Samples = Union[Iterable[float], np.ndarray, str, Path]
+
+
+def load_samples(path: str | Path, dtype: str | np.dtype = np.float64) -> np.ndarray:
+    """
+    Read-only memory map of a sample file: `.npy` files by their header,
+    anything else as raw values of `dtype`.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _check(rule: str, chunk_size: int, summation: str) -> None:
+    if rule not in RULES:
+        raise ValueError(f"rule must be one of {RULES}, got {rule!r}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    check_summation(summation)
+
+
+def _chunks(samples: Samples, chunk_size: int) -> Iterator[np.ndarray]:
+    """Consecutive 1-D float chunks of at most `chunk_size` samples."""
+    if isinstance(samples, (str, Path)):
+        samples = load_samples(samples)
+    if isinstance(samples, np.ndarray):
+        if samples.ndim != 1:
+            raise ValueError("samples must be one-dimensional")
+        for start in range(0, len(samples), chunk_size):
+            yield samples[start:start + chunk_size]
+        return
+    it = iter(samples)
+    while True:
+        chunk = np.fromiter(itertools.islice(it, chunk_size), dtype=np.float64)
+        if not len(chunk):
+            return
+        yield chunk
+
+
+def _weighted_sum(chunk: np.ndarray, start: int, rule: str) -> float:
+    """Interior weights of the samples `start .. start + len(chunk)`: 1 (trapezoid), 2/4 (Simpson)."""
+    if rule == "trapezoid":
+        return float(chunk.sum(dtype=np.float64))
+    first_odd = 1 - start % 2
+    even = chunk[start % 2::2].sum(dtype=np.float64)
+    odd = chunk[first_odd::2].sum(dtype=np.float64)
+    return float(2.0 * even + 4.0 * odd)
+
+
+def _combine(parts: Iterable[float], summation: str) -> float:
+    if summation == "kahan":
+        return kahan_sum(parts)
+    if summation == "pairwise":
+        return pairwise_sum(parts, block=1)
+    acc = 0.0
+    for part in parts:
+        acc += part
+    return acc
+
+
+def _finish(total: float, dx: float, rule: str, count: int, first: float, tail: list[float]) -> float:
+    """Apply the end corrections to the sum of interior weights `total`."""
+    if count < 2:
+        raise ValueError("at least two samples are needed")
+    last = tail[-1]
+    if rule == "trapezoid":
+        return dx * (total - 0.5 * (first + last))
+    if count == 2:
+        # a single interval: Simpson's rule needs three points, fall back to the trapezoid
+        return 0.5 * dx * (first + last)
+    if count % 2 == 1:
+        # even number of intervals, the last sample has an even index
+        return dx / 3.0 * (total - first - last)
+    # odd number of intervals: Simpson up to sample n - 4, 3/8 rule on the last three intervals
+    t0, t1, t2, t3 = tail[-4:]
+    head = dx / 3.0 * (total - 4.0 * (t1 + t3) - 2.0 * t2 - first - t0)
+    return head + 3.0 * dx / 8.0 * (t0 + 3.0 * t1 + 3.0 * t2 + t3)
+
+
+def integrate_samples(
+    samples: Samples,
+    dx: float = 1.0,
+    *,
+    rule: str = "trapezoid",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    summation: str = "naive",
+) -> float:
+    """
+    Integrate equally spaced samples in constant memory.
+
+    Parameters
+    ----------
+    samples : iterable of float, np.ndarray or path
+        Sample values y_i = y(x_0 + i * dx). Iterators and generators are
+        consumed once; a path is opened with `load_samples`.
+    dx : float
+        Spacing between samples.
+    rule : str
+        "trapezoid" or "simpson".
+    chunk_size : int
+        Number of samples processed at once.
+    summation : str
+        How chunk sums are combined: "naive", "kahan" or "pairwise".
+
+    Returns
+    -------
+    float
+        Approximate integral over [x_0, x_0 + (n - 1) * dx].
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than two samples or an argument is invalid.
+
+    Examples
+    --------
+    >>> integrate_samples([0.0, 1.0, 4.0, 9.0, 16.0], rule="simpson")  # x**2 on [0, 4]
+    21.333333333333332
+    >>> integrate_samples((x * x for x in range(5)), chunk_size=2)
+    22.0
+    """
+    _check(rule, chunk_size, summation)
+    state = {"count": 0, "first": 0.0, "tail": []}
+
+    def parts() -> Iterator[float]:
+        for chunk in _chunks(samples, chunk_size):
+            if not state["count"]:
+                state["first"] = float(chunk[0])
+            yield _weighted_sum(chunk, state["count"], rule)
+            state["tail"] = (state["tail"] + chunk[-4:].tolist())[-4:]
+            state["count"] += len(chunk)
+
+    total = _combine(parts(), summation)
+    return _finish(total, dx, rule, state["count"], state["first"], state["tail"])
+
+
+def _block_sum(block: np.ndarray, start: int, rule: str, chunk_size: int, summation: str) -> float:
+    """Interior-weighted sum of a block whose first sample has the global index `start`."""
+    return _combine(
+        (_weighted_sum(block[i:i + chunk_size], start + i, rule) for i in range(0, len(block), chunk_size)),
+        summation,
+    )
+
+
+def _file_block_sum(path: str, dtype: str, lo: int, hi: int, rule: str, chunk_size: int, summation: str) -> float:
+    """Worker side of `_block_sum` for a file: every process maps the file itself."""
+    return _block_sum(load_samples(path, dtype)[lo:hi], lo, rule, chunk_size, summation)
+
+
+def integrate_samples_parallel(
+    samples: np.ndarray | str | Path,
+    dx: float = 1.0,
+    *,
+    rule: str = "trapezoid",
+    n_jobs: int = 2,
+    backend: str = "threads",
+    pool: IntegrationPool | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    summation: str = "naive",
+    dtype: str | np.dtype = np.float64,
+) -> float:
+    """
+    `integrate_samples` for a memory-mapped file or an array, split into
+    `n_jobs` contiguous blocks integrated in parallel.
+
+    NumPy releases the GIL while summing, so "threads" scale on a mapped
+    file without copying anything. With "processes" pass a path: workers map
+    the file themselves and only block bounds are sent (an array would be
+    pickled). Block sums are combined by `reduction.tree_sum` in block order.
+
+    Parameters
+    ----------
+    samples : np.ndarray or path
+        One-dimensional array (e.g. `load_samples(path)`) or path of a sample file.
+    dx, rule, chunk_size, summation
+        As in `integrate_samples`; `chunk_size` bounds the memory of every worker.
+    n_jobs : int
+        Number of blocks and workers.
+    backend : str
+        "serial", "threads" or "processes".
+    pool : IntegrationPool, optional
+        Persistent pool of the matching kind.
+    dtype : str or np.dtype
+        Value type of a raw (non-.npy) file.
+
+    >>> import tempfile, os
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     path = os.path.join(tmp, "samples.npy")
+    ...     np.save(path, np.linspace(0.0, 1.0, 1001) ** 2)
+    ...     round(integrate_samples_parallel(path, 0.001, rule="simpson", n_jobs=3), 12)
+    0.333333333333
+    """
+    _check(rule, chunk_size, summation)
+    if n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
+
+    data = load_samples(samples, dtype) if isinstance(samples, (str, Path)) else np.asarray(samples)
+    if data.ndim != 1:
+        raise ValueError("samples must be one-dimensional")
+    count = len(data)
+    if count < 2:
+        raise ValueError("at least two samples are needed")
+
+    blocks = split_range(count, n_jobs)
+    if backend == "processes" and isinstance(samples, (str, Path)):
+        tasks = [
+            (_file_block_sum, str(samples), np.dtype(dtype).str, lo, hi, rule, chunk_size, summation)
+            for lo, hi in blocks
+        ]
+    else:
+        tasks = [(_block_sum, data[lo:hi], lo, rule, chunk_size, summation) for lo, hi in blocks]
+    total = tree_sum(run_tasks(tasks, backend, n_jobs, pool))
+    tail = data[-4:].tolist()
+    return _finish(total, dx, rule, count, float(data[0]), tail)
@@ -1,63 +1,157 @@
+from __future__ import annotations
+
 import concurrent.futures as futures
+from contextlib import nullcontext
+from typing import Sequence
 
 import cyintegrate_nogil
+from integrate_pool import IntegrationPool, split_interval
+from reduction import check_summation, tree_sum
 
 
-def integrate_sin_threaded_nogil(
+def integrate_threaded_nogil(
+    name: str,
     a: float,
     b: float,
     *,
+    params: Sequence[float] | None = None,
     n_jobs: int = 2,
-    n_iter: int = 1_000_000
+    n_iter: int = 1_000_000,
+    pool: IntegrationPool | None = None,
+    summation: str = "naive",
+    chunk_size: int | None = None,
+    fast: bool = False,
 ) -> float:
     """
-    Compute the integral of sin(x) on [a, b] in parallel using threads and a noGIL Cython kernel.
+    Compute the integral of a registered C integrand on [a, b] in parallel using
+    threads and the generic noGIL Cython kernel.
 
-    Demonstrates true multithreaded speed-up for a CPU-bound task in CPython.
-    The key idea is that each thread calls a Cython function (`integrate_sin_nogil`) which
-    releases the Global Interpreter Lock (GIL) and performs the heavy computation entirely
-    in C while running under `nogil`.
+    Any integrand from the `cyintegrate_nogil` registry can be used: the built-in
+    "sin", "cos", "exp", "poly" (coefficients in `params`) or a `cdef` function
+    registered with `cyintegrate_nogil.register_integrand`. The integrand is
+    looked up once per thread and then called through a C function pointer
+    without the GIL, so threads scale across cores.
 
     Parameters
     ----------
+    name : str
+        Name of a registered integrand.
     a : float
         Left boundary of integration interval.
     b : float
         Right boundary of integration interval.
+    params : Sequence[float], optional
+        Parameters passed to the integrand (e.g. polynomial coefficients
+        from the highest degree for "poly").
     n_jobs : int, optional
         Number of worker threads to use. Must be a positive integer.
-        Typical values are 2, 4, 6, 8 depending on CPU core count.
     n_iter : int, optional
         Total number of rectangles for the whole interval.
-        This value will be divided between threads (`n_iter // n_jobs` per thread).
+        This value will be divided between threads; when it is not divisible
+        by `n_jobs`, the first `n_iter % n_jobs` threads get one extra point.
         Must be a positive integer.
+    pool : IntegrationPool, optional
+        Persistent thread pool to run on. If omitted, a ThreadPoolExecutor
+        with `n_jobs` workers is created and shut down for this call only.
+    summation : str, optional
+        Summation mode inside each thread: "naive", "kahan" or "pairwise".
+        Per-thread results are combined by `reduction.tree_sum` in submission
+        order, so the result is reproducible run to run.
+    chunk_size : int, optional
+        If given, the grid is cut into jobs of `chunk_size` points that idle
+        threads pick up dynamically, instead of `n_jobs` equal slices.
+    fast : bool, optional
+        Use the unrolled kernel of `integrate_nogil(..., fast=True)` in every
+        thread. Only with `summation="naive"`.
 
     Returns
     -------
     float
-        Approximate value of the definite integral of sin(x) over [a, b].
+        Approximate value of the definite integral of the integrand over [a, b].
 
     Raises
     ------
     ValueError
-        If `n_jobs <= 0` or `n_iter <= 0`.
+        If `n_jobs <= 0`, `n_iter <= 0`, `summation` is unknown or `fast`
+        is combined with a compensated summation.
+    KeyError
+        If `name` is not registered.
     """
     if n_jobs <= 0:
         raise ValueError("n_jobs must be positive")
     if n_iter <= 0:
         raise ValueError("n_iter must be positive")
+    check_summation(summation)
+    if fast and summation != "naive":
+        raise ValueError("fast=True has its own multi-accumulator summation, use summation='naive'")
+    # fail fast in the caller thread instead of inside every worker
+    cyintegrate_nogil.get_integrand(name)
+
+    jobs = split_interval(a, b, n_iter, n_jobs, chunk_size)
 
-    step_job = (b - a) / n_jobs
-    iters_per_job = n_iter // n_jobs
+    if pool is None:
+        ctx = futures.ThreadPoolExecutor(max_workers=n_jobs)
+    else:
+        ctx = nullcontext(pool.require("thread"))
 
-    with futures.ThreadPoolExecutor(max_workers=n_jobs) as ex:
+    with ctx as ex:
         fs = [
-            ex.submit(
-                cyintegrate_nogil.integrate_sin_nogil,
-                a + i * step_job,
-                a + (i + 1) * step_job,
-                iters_per_job,
-            )
-            for i in range(n_jobs)
+            ex.submit(cyintegrate_nogil.integrate_nogil, name, lo, hi, n, params, summation, fast)
+            for lo, hi, n in jobs
         ]
-        return sum(f.result() for f in futures.as_completed(fs))
\ No newline at end of file
+        return tree_sum([f.result() for f in fs])
+
+
+def integrate_sin_threaded_nogil(
+    a: float,
+    b: float,
+    *,
+    n_jobs: int = 2,
+    n_iter: int = 1_000_000,
+    pool: IntegrationPool | None = None,
+    chunk_size: int | None = None,
+    fast: bool = False,
+) -> float:
+    """
+    Compute the integral of sin(x) on [a, b] in parallel using threads and a noGIL Cython kernel.
+
+    Demonstrates true multithreaded speed-up for a CPU-bound task in CPython.
+    The key idea is that each thread calls a Cython function (`integrate_nogil`) which
+    releases the Global Interpreter Lock (GIL) and performs the heavy computation entirely
+    in C while running under `nogil`. This is `integrate_threaded_nogil` for the
+    registered "sin" integrand.
+
+    Parameters
+    ----------
+    a : float
+        Left boundary of integration interval.
+    b : float
+        Right boundary of integration interval.
+    n_jobs : int, optional
+        Number of worker threads to use. Must be a positive integer.
+        Typical values are 2, 4, 6, 8 depending on CPU core count.
+    n_iter : int, optional
+        Total number of rectangles for the whole interval.
+        This value will be divided between threads (see `integrate_threaded_nogil`).
+        Must be a positive integer.
+    pool : IntegrationPool, optional
+        Persistent thread pool to run on. If omitted, a ThreadPoolExecutor
+        with `n_jobs` workers is created and shut down for this call only.
+    chunk_size : int, optional
+        Points per dynamically scheduled job (see `integrate_threaded_nogil`).
+    fast : bool, optional
+        Use the rotation-based sin kernel (see `integrate_nogil(..., fast=True)`).
+
+    Returns
+    -------
+    float
+        Approximate value of the definite integral of sin(x) over [a, b].
+
+    Raises
+    ------
+    ValueError
+        If `n_jobs <= 0` or `n_iter <= 0`.
+    """
+    return integrate_threaded_nogil(
+        "sin", a, b, n_jobs=n_jobs, n_iter=n_iter, pool=pool, chunk_size=chunk_size, fast=fast
+    )
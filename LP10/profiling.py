@@ -0,0 +1,207 @@
+"""
+Opt-in instrumentation of the parallel front-ends.
+
+Pass an `IntegrationProfile` as `profile=` to `integrate_threaded` or
+`integrate_processed` to see where the time goes:
+
+    prof = IntegrationProfile()
+    integrate_processed(math.sin, 0.0, math.pi, n_jobs=4, n_iter=4_000_000, profile=prof)
+    print(prof.format())
+
+Phases measured in the caller (seconds, summed over calls):
+    split     - cutting the grid into jobs
+    startup   - creating a temporary executor (0 with a persistent pool);
+                process workers are spawned lazily, on the first submit
+    pickle    - serialising the tasks once more to measure their size
+                (processes only; the executor pickles in a background thread,
+                so this is an estimate that is not part of the other phases)
+    submit    - handing the jobs to the executor
+    compute   - waiting for the results
+    reduce    - combining the partial sums
+    shutdown  - stopping a temporary executor
+
+Every job also reports where and how long it ran (`JobStats`): the worker
+(pid and thread), the number of points and the time spent in the kernel;
+`turnaround - kernel_time` is the queueing and transfer overhead of the job.
+Without a profile the front-ends skip all of this: one `is None` check per
+phase.
+"""
+from __future__ import annotations
+
+import concurrent.futures as futures
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator, NamedTuple
+
+PHASES = ("split", "startup", "pickle", "submit", "compute", "reduce", "shutdown")
+
+_NO_PHASE = nullcontext()
+
+
+class JobStats(NamedTuple):
+    worker: str  # "<pid>/<thread name>"
+    n_points: int
+    kernel_time: float  # seconds inside the integration kernel, measured by the worker
+    turnaround: float  # seconds from submit to result, measured by the caller
+
+
+class WorkerStats(NamedTuple):
+    jobs: int
+    n_points: int
+    kernel_time: float
+
+
+class IntegrationProfile:
+    """
+    Phase timings and per-job counters of one or more integration calls.
+
+    >>> import math
+    >>> from integrate_threads import integrate_threaded
+    >>> prof = IntegrationProfile()
+    >>> _ = integrate_threaded(math.sin, 0.0, math.pi, n_jobs=2, n_iter=10_000, profile=prof)
+    >>> prof.calls, len(prof.jobs), sum(job.n_points for job in prof.jobs)
+    (1, 2, 10000)
+    >>> sorted(prof.phases) == sorted(set(PHASES) - {"pickle"})
+    True
+    """
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.jobs: list[JobStats] = []
+        self.calls = 0
+        self.pickled_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    @property
+    def total(self) -> float:
+        """Sum of the caller-side phases (without the `pickle` estimate)."""
+        return sum(t for name, t in self.phases.items() if name != "pickle")
+
+    @property
+    def kernel_time(self) -> float:
+        return sum(job.kernel_time for job in self.jobs)
+
+    def workers(self) -> dict[str, WorkerStats]:
+        """Jobs, points and kernel time aggregated per worker."""
+        stats: dict[str, WorkerStats] = {}
+        for job in self.jobs:
+            jobs, points, kernel = stats.get(job.worker, (0, 0, 0.0))
+            stats[job.worker] = WorkerStats(jobs + 1, points + job.n_points, kernel + job.kernel_time)
+        return stats
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable summary."""
+        return {
+            "calls": self.calls,
+            "phases": dict(self.phases),
+            "total": self.total,
+            "pickled_bytes": self.pickled_bytes,
+            "jobs": [job._asdict() for job in self.jobs],
+            "workers": {name: w._asdict() for name, w in self.workers().items()},
+        }
+
+    def format(self) -> str:
+        lines = [f"calls={self.calls} total={self.total:.6f} sec"]
+        for name in PHASES:
+            if name in self.phases:
+                share = self.phases[name] / self.total if self.total and name != "pickle" else 0.0
+                note = f"{share:6.1%}" if name != "pickle" else f"{self.pickled_bytes} bytes"
+                lines.append(f"  {name:<9}{self.phases[name]:.6f} sec  {note}")
+        for name, w in sorted(self.workers().items()):
+            lines.append(f"  worker {name}: jobs={w.jobs} points={w.n_points} kernel={w.kernel_time:.6f} sec")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"IntegrationProfile(calls={self.calls}, jobs={len(self.jobs)}, total={self.total:.6f})"
+
+    def _record(self, job: JobStats) -> None:
+        with self._lock:
+            self.jobs.append(job)
+
+
+def phase(profile: IntegrationProfile | None, name: str) -> ContextManager:
+    """`profile.phase(name)`, or a shared no-op context without a profile."""
+    return _NO_PHASE if profile is None else profile.phase(name)
+
+
+@contextmanager
+def _timed_scope(profile: IntegrationProfile, ctx: ContextManager) -> Iterator:
+    with ctx as executor:
+        yield executor
+        t0 = time.perf_counter()
+    profile.add("shutdown", time.perf_counter() - t0)
+
+
+def executor_scope(profile: IntegrationProfile | None, ctx: ContextManager) -> ContextManager:
+    """`ctx` itself, or `ctx` with its exit timed as the `shutdown` phase."""
+    return ctx if profile is None else _timed_scope(profile, ctx)
+
+
+def worker_id() -> str:
+    return f"{os.getpid()}/{threading.current_thread().name}"
+
+
+def profiled_call(fn: Callable, /, *args, **kwargs) -> tuple[object, str, float]:
+    """Worker side: run `fn(*args, **kwargs)` and report the worker and the kernel time."""
+    t0 = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, worker_id(), time.perf_counter() - t0
+
+
+def _mark_done(fut: futures.Future) -> None:
+    fut.done_at = time.perf_counter()
+
+
+def run_profiled(
+    profile: IntegrationProfile,
+    executor: futures.Executor,
+    fn: Callable,
+    f: Callable,
+    jobs: list[tuple[float, float, int]],
+    **kwargs,
+) -> list:
+    """
+    Run `fn(f, lo, hi, n_iter=n, **kwargs)` for every job `(lo, hi, n)` on
+    `executor`, timing the pickle/submit/compute phases and recording one
+    `JobStats` per job. Returns the job results in order.
+    """
+    if isinstance(executor, futures.ProcessPoolExecutor):
+        with profile.phase("pickle"):
+            for lo, hi, n in jobs:
+                task = (profiled_call, (fn, f, lo, hi), dict(kwargs, n_iter=n))
+                profile.pickled_bytes += len(pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL))
+
+    with profile.phase("submit"):
+        fs, submitted = [], []
+        for lo, hi, n in jobs:
+            submitted.append(time.perf_counter())
+            fut = executor.submit(profiled_call, fn, f, lo, hi, n_iter=n, **kwargs)
+            fut.add_done_callback(_mark_done)
+            fs.append(fut)
+
+    with profile.phase("compute"):
+        values = []
+        for fut, (_, _, n), t_submit in zip(fs, jobs, submitted):
+            value, worker, kernel = fut.result()
+            # result() may return before the done callback has run
+            done_at = getattr(fut, "done_at", None) or time.perf_counter()
+            profile._record(JobStats(worker, n, kernel, done_at - t_submit))
+            values.append(value)
+    return values
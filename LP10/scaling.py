@@ -0,0 +1,275 @@
+"""
+Scaling analysis of the parallel integration backends.
+
+For every backend and problem size the integration is timed on a warm pool
+with n_jobs = 1, 2, 4, ... workers. From the timings we get speedup
+S(p) = T(1) / T(p), parallel efficiency E(p) = S(p) / p, the Karp-Flatt
+serial fraction and least-squares fits of
+
+    Amdahl (strong scaling, fixed n_iter):      S(p) = 1 / (s + (1 - s) / p)
+    Gustafson (weak scaling, n_iter = n0 * p):  S(p) = p - alpha * (p - 1)
+
+Pool start-up (spawning threads/processes) is measured separately and is not
+part of the compute times, so the numbers describe the steady state of a
+long-lived IntegrationPool; add `startup` once per pool.
+
+    python scaling.py --jobs 1 2 4 8 --sizes 1000000 4000000 --weak --json scaling.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple, Sequence
+
+from benchmark import BACKENDS, machine_info, measure, summarize
+from integrate_pool import IntegrationPool
+
+# backends measured by default: parallel front-ends on a warm pool
+DEFAULT_BACKENDS = tuple(
+    name for name in ("threads_pool", "processes_pool", "nogil_threads_pool") if name in BACKENDS
+)
+
+
+class ScalingPoint(NamedTuple):
+    backend: str
+    n_iter: int
+    n_jobs: int
+    time: float
+    speedup: float
+    efficiency: float
+    karp_flatt: float | None  # experimentally determined serial fraction, None for p = 1
+
+
+class AmdahlFit(NamedTuple):
+    backend: str
+    n_iter: int
+    serial_fraction: float
+
+    @property
+    def max_speedup(self) -> float:
+        """Speedup limit for p -> infinity."""
+        return float("inf") if self.serial_fraction == 0 else 1.0 / self.serial_fraction
+
+    def speedup(self, n_jobs: int) -> float:
+        return 1.0 / (self.serial_fraction + (1.0 - self.serial_fraction) / n_jobs)
+
+
+class GustafsonFit(NamedTuple):
+    backend: str
+    base_n_iter: int
+    alpha: float
+
+    def speedup(self, n_jobs: int) -> float:
+        return n_jobs - self.alpha * (n_jobs - 1)
+
+
+class Startup(NamedTuple):
+    kind: str
+    n_jobs: int
+    time: float
+
+
+def karp_flatt(speedup: float, n_jobs: int) -> float | None:
+    """
+    Serial fraction e = (1/S - 1/p) / (1 - 1/p) implied by one measurement.
+
+    >>> karp_flatt(4.0, 4)
+    0.0
+    >>> round(karp_flatt(2.0, 4), 4)
+    0.3333
+    """
+    if n_jobs <= 1:
+        return None
+    return (1.0 / speedup - 1.0 / n_jobs) / (1.0 - 1.0 / n_jobs)
+
+
+def fit_amdahl(jobs: Sequence[int], speedups: Sequence[float]) -> float:
+    """
+    Least-squares serial fraction s of Amdahl's law, clamped to [0, 1].
+
+    1/S = s + (1 - s)/p is linear in s: 1/S - 1/p = s * (1 - 1/p).
+
+    >>> round(fit_amdahl([1, 2, 4, 8], [1.0, 1.6, 2.2857, 2.9091]), 3)
+    0.25
+    """
+    num = den = 0.0
+    for p, sp in zip(jobs, speedups):
+        x = 1.0 - 1.0 / p
+        num += x * (1.0 / sp - 1.0 / p)
+        den += x * x
+    if den == 0:
+        raise ValueError("need at least one measurement with n_jobs > 1")
+    return min(max(num / den, 0.0), 1.0)
+
+
+def fit_gustafson(jobs: Sequence[int], scaled_speedups: Sequence[float]) -> float:
+    """
+    Least-squares serial fraction alpha of Gustafson's law S = p - alpha * (p - 1).
+
+    >>> round(fit_gustafson([1, 2, 4], [1.0, 1.9, 3.7]), 3)
+    0.1
+    """
+    num = den = 0.0
+    for p, sp in zip(jobs, scaled_speedups):
+        num += (p - sp) * (p - 1)
+        den += (p - 1) ** 2
+    if den == 0:
+        raise ValueError("need at least one measurement with n_jobs > 1")
+    return min(max(num / den, 0.0), 1.0)
+
+
+def measure_startup(kind: str, n_jobs: int, *, repeat: int = 3) -> Startup:
+    """
+    Median time to create a pool of `n_jobs` workers and get every worker running.
+
+    Each worker gets one trivial task, which forces a process pool to spawn
+    all of its interpreters; the shutdown is not included.
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        pool = IntegrationPool(kind, max_workers=n_jobs)
+        try:
+            for fut in [pool.submit(abs, -1) for _ in range(n_jobs)]:
+                fut.result()
+            times.append(time.perf_counter() - t0)
+        finally:
+            pool.shutdown()
+    return Startup(kind, n_jobs, summarize(times).median)
+
+
+def _time_on_pool(backend: str, n_iter: int, n_jobs: int, repeat: int, warmup: int) -> float:
+    spec = BACKENDS[backend]
+    if spec.pool_kind is None:
+        return measure(lambda: spec.run(n_iter, n_jobs, None), repeat=repeat, warmup=warmup).median
+    with IntegrationPool(spec.pool_kind, max_workers=n_jobs) as pool:
+        return measure(lambda: spec.run(n_iter, n_jobs, pool), repeat=repeat, warmup=max(warmup, 1)).median
+
+
+def _with_one(jobs: Iterable[int]) -> list[int]:
+    jobs = sorted(set(jobs) | {1})
+    if jobs[0] <= 0:
+        raise ValueError("n_jobs values must be positive")
+    return jobs
+
+
+def strong_scaling(
+    backend: str, n_iter: int, jobs: Sequence[int], *, repeat: int = 3, warmup: int = 1
+) -> tuple[list[ScalingPoint], AmdahlFit | None]:
+    """Fixed problem size, growing number of workers."""
+    jobs = _with_one(jobs)
+    times = {p: _time_on_pool(backend, n_iter, p, repeat, warmup) for p in jobs}
+    points = []
+    for p in jobs:
+        sp = times[1] / times[p]
+        points.append(ScalingPoint(backend, n_iter, p, times[p], sp, sp / p, karp_flatt(sp, p)))
+    fit = AmdahlFit(backend, n_iter, fit_amdahl(jobs, [pt.speedup for pt in points])) if len(jobs) > 1 else None
+    return points, fit
+
+
+def weak_scaling(
+    backend: str, base_n_iter: int, jobs: Sequence[int], *, repeat: int = 3, warmup: int = 1
+) -> tuple[list[ScalingPoint], GustafsonFit | None]:
+    """Problem size grows with the workers: n_iter = base_n_iter * p."""
+    jobs = _with_one(jobs)
+    times = {p: _time_on_pool(backend, base_n_iter * p, p, repeat, warmup) for p in jobs}
+    points = []
+    for p in jobs:
+        # p times more work in T(p) instead of T(1)
+        sp = p * times[1] / times[p]
+        points.append(ScalingPoint(backend, base_n_iter * p, p, times[p], sp, sp / p, karp_flatt(sp, p)))
+    fit = (
+        GustafsonFit(backend, base_n_iter, fit_gustafson(jobs, [pt.speedup for pt in points]))
+        if len(jobs) > 1 else None
+    )
+    return points, fit
+
+
+def recommend_jobs(points: Iterable[ScalingPoint], min_efficiency: float = 0.75) -> int:
+    """
+    Largest measured n_jobs whose parallel efficiency is at least `min_efficiency`.
+
+    >>> pts = [ScalingPoint("b", 10, p, 1.0, s, s / p, None) for p, s in [(1, 1.0), (2, 1.9), (4, 3.2), (8, 4.0)]]
+    >>> recommend_jobs(pts)
+    4
+    """
+    ok = [pt.n_jobs for pt in points if pt.efficiency >= min_efficiency]
+    return max(ok, default=1)
+
+
+def _format_point(pt: ScalingPoint) -> str:
+    kf = "-" if pt.karp_flatt is None else f"{pt.karp_flatt:.3f}"
+    return (
+        f"  n_jobs={pt.n_jobs:<3} n_iter={pt.n_iter:>10} time={pt.time:.6f} "
+        f"speedup={pt.speedup:.2f} efficiency={pt.efficiency:.0%} karp_flatt={kf}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Speedup, efficiency and Amdahl/Gustafson fits per backend.")
+    parser.add_argument("--backends", nargs="+", default=list(DEFAULT_BACKENDS),
+                        help=f"parallel backends, default: {' '.join(DEFAULT_BACKENDS)}")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[2_000_000], help="n_iter values (strong scaling)")
+    parser.add_argument("--jobs", nargs="+", type=int,
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help="n_jobs values (1 is always added)")
+    parser.add_argument("--weak", action="store_true", help="also run weak scaling with n_iter = size * n_jobs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--min-efficiency", type=float, default=0.75,
+                        help="efficiency threshold for the recommended worker count")
+    parser.add_argument("--json", help="write all points, fits and start-up times to this JSON file")
+    args = parser.parse_args(argv)
+
+    for name in args.backends:
+        if name not in BACKENDS:
+            parser.error(f"unknown backend {name!r}, available: {', '.join(BACKENDS)}")
+        if not BACKENDS[name].parallel:
+            parser.error(f"backend {name!r} does not use n_jobs")
+    jobs = _with_one(args.jobs)
+    report: dict = {"machine": machine_info(), "startup": [], "strong": [], "weak": []}
+
+    print("Pool start-up (median, not included in the times below):")
+    for kind in sorted({BACKENDS[name].pool_kind for name in args.backends} - {None}):
+        for p in jobs:
+            st = measure_startup(kind, p, repeat=args.repeat)
+            report["startup"].append(st._asdict())
+            print(f"  {kind:<8} n_jobs={p:<3} {st.time:.6f} sec")
+
+    for name in args.backends:
+        for n_iter in args.sizes:
+            points, fit = strong_scaling(name, n_iter, jobs, repeat=args.repeat, warmup=args.warmup)
+            print(f"\n{name}, strong scaling, n_iter={n_iter}")
+            for pt in points:
+                print(_format_point(pt))
+            rec = recommend_jobs(points, args.min_efficiency)
+            if fit is not None:
+                print(f"  Amdahl: serial fraction={fit.serial_fraction:.3f}, max speedup={fit.max_speedup:.2f}")
+            print(f"  recommended n_jobs (efficiency >= {args.min_efficiency:.0%}): {rec}")
+            report["strong"].append({
+                "backend": name, "n_iter": n_iter, "points": [pt._asdict() for pt in points],
+                "serial_fraction": None if fit is None else fit.serial_fraction, "recommended_jobs": rec,
+            })
+
+            if args.weak:
+                points, gfit = weak_scaling(name, n_iter, jobs, repeat=args.repeat, warmup=args.warmup)
+                print(f"\n{name}, weak scaling, n_iter={n_iter} per worker")
+                for pt in points:
+                    print(_format_point(pt))
+                if gfit is not None:
+                    print(f"  Gustafson: alpha={gfit.alpha:.3f}")
+                report["weak"].append({
+                    "backend": name, "base_n_iter": n_iter, "points": [pt._asdict() for pt in points],
+                    "alpha": None if gfit is None else gfit.alpha,
+                })
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
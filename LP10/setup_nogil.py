@@ -1,11 +1,28 @@
-from setuptools import setup
+import os
+import sys
+
+from setuptools import Extension, setup
 from Cython.Build import cythonize
 
+# OpenMP for the prange kernel (integrate_nogil_parallel). Set CYINTEGRATE_OPENMP=0
+# to build without it (e.g. Apple clang); the kernel then runs on one thread.
+if os.environ.get("CYINTEGRATE_OPENMP", "1") == "0":
+    openmp_args = []
+elif sys.platform == "win32":
+    openmp_args = ["/openmp"]
+else:
+    openmp_args = ["-fopenmp"]
+
 setup(
     name="cyintegrate_nogil",
     ext_modules=cythonize(
-        "cyintegrate_nogil.pyx",
+        Extension(
+            "cyintegrate_nogil",
+            ["cyintegrate_nogil.pyx"],
+            extra_compile_args=openmp_args,
+            extra_link_args=[] if sys.platform == "win32" else openmp_args,
+        ),
         annotate=True,
         compiler_directives={"language_level": "3"},
     ),
-)
\ No newline at end of file
+)
@@ -0,0 +1,78 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import benchmark
+from benchmark import BenchResult, Suite, compare, load_json, run_suite, save_csv, save_json, summarize
+
+
+def _result(backend, median, n_jobs=1):
+    return BenchResult("s", backend, 1000, n_jobs, 3, median, median, median, median, 0.0)
+
+
+class TestStats(unittest.TestCase):
+    def test_summarize(self):
+        s = summarize([3.0, 1.0, 2.0, 4.0, 5.0])
+        self.assertEqual((s.min, s.median, s.mean), (1.0, 3.0, 3.0))
+        self.assertAlmostEqual(s.p95, 4.8)
+        self.assertAlmostEqual(s.stdev, 1.5811388, places=6)
+        self.assertEqual(summarize([2.0]).stdev, 0.0)
+
+    def test_measure_validates_arguments(self):
+        with self.assertRaises(ValueError):
+            benchmark.measure(lambda: None, repeat=0)
+
+
+class TestCompare(unittest.TestCase):
+    def test_regressions_over_tolerance(self):
+        baseline = [_result("python", 1.0), _result("nogil", 1.0), _result("threads", 1.0, n_jobs=2)]
+        current = [_result("python", 1.05), _result("nogil", 1.5), _result("numpy", 9.0)]
+        regs = compare(current, baseline, tolerance=0.10)
+        self.assertEqual([r.key[1] for r in regs], ["nogil"])
+        self.assertAlmostEqual(regs[0].ratio, 1.5)
+        self.assertEqual(compare(current, baseline, tolerance=1.0), [])
+
+
+class TestSuites(unittest.TestCase):
+    def test_run_suite_and_round_trip(self):
+        suite = Suite(("python", "threads", "no_such_backend"), (2000,), (1, 2), repeat=2)
+        results = run_suite("tiny", suite, warmup=0)
+        self.assertEqual([(r.backend, r.n_jobs) for r in results], [("python", 1), ("threads", 1), ("threads", 2)])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "res.json")
+            save_json(results, path)
+            self.assertEqual(load_json(path), results)
+            self.assertIn("machine", json.loads(open(path, encoding="utf-8").read()))
+
+            csv_path = os.path.join(tmp, "res.csv")
+            save_csv(results, csv_path)
+            with open(csv_path, encoding="utf-8") as fh:
+                lines = fh.read().splitlines()
+            self.assertEqual(lines[0].split(","), list(BenchResult._fields))
+            self.assertEqual(len(lines), 1 + len(results))
+
+    def test_cli_gates_on_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "base.json")
+            argv = ["quick", "--backends", "python", "--sizes", "1000", "--repeat", "2", "--warmup", "0"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(benchmark.main(argv + ["--json", path]), 0)
+
+            # make the stored baseline impossibly fast -> regression, exit code 1
+            data = json.loads(open(path, encoding="utf-8").read())
+            for row in data["results"]:
+                row["median"] = 1e-12
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(benchmark.main(argv + ["--baseline", path]), 1)
+            self.assertIn("REGRESSION quick/python", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import math
+import unittest
+
+import numpy as np
+
+from integrate_adaptive import IntegrationResult, integrate_adaptive, integrate_romberg, refine
+from integrate_py import integrate
+
+
+class TestIntegrateAdaptive(unittest.TestCase):
+    def test_known_integrals(self):
+        cases = [
+            (math.sin, 0.0, math.pi, 2.0),
+            (math.sqrt, 0.0, 1.0, 2.0 / 3.0),
+            (lambda x: 1.0 / (1.0 + 25.0 * x * x), -1.0, 1.0, 0.4 * math.atan(5.0)),
+        ]
+        for rule in ("gk15", "simpson"):
+            for f, a, b, exact in cases:
+                res = integrate_adaptive(f, a, b, tol=1e-10, rule=rule)
+                self.assertIsInstance(res, IntegrationResult)
+                self.assertLess(abs(res.value - exact), 1e-9)
+                self.assertLessEqual(res.error, 1e-10)
+
+    def test_few_evaluations_for_smooth_integrand(self):
+        # a fixed left Riemann sum needs millions of points for this accuracy
+        res = integrate_adaptive(math.exp, 0.0, 1.0, tol=1e-10)
+        self.assertAlmostEqual(res.value, math.e - 1.0, places=12)
+        self.assertLess(res.n_evals, 100)
+
+    def test_reversed_and_empty_interval(self):
+        res = integrate_adaptive(math.cos, math.pi / 2, 0.0)
+        self.assertAlmostEqual(res.value, -1.0, places=10)
+        self.assertEqual(integrate_adaptive(math.cos, 1.0, 1.0), (0.0, 0.0, 0))
+
+    def test_max_intervals_limits_work(self):
+        res = integrate_adaptive(math.sqrt, 0.0, 1.0, tol=0.0, rule="simpson", max_intervals=10)
+        self.assertLessEqual(res.n_evals, 3 + 2 * 19)
+        self.assertGreater(res.error, 0.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.sin, 0.0, 1.0, tol=-1.0)
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.sin, 0.0, 1.0, rule="trapezoid")
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.sin, 0.0, 1.0, max_intervals=0)
+
+
+class _Counted:
+    def __init__(self, f):
+        self.f = f
+        self.points = set()
+
+    def __call__(self, x):
+        self.points.add(x)
+        return self.f(x)
+
+
+class TestRefinement(unittest.TestCase):
+    def test_riemann_matches_integrate(self):
+        for level in refine(math.cos, 0.0, 2.0, n_iter=3, max_level=6):
+            self.assertAlmostEqual(level.riemann, integrate(math.cos, 0.0, 2.0, n_iter=level.n_iter), places=13)
+
+    def test_points_are_evaluated_once(self):
+        f = _Counted(math.exp)
+        levels = list(refine(f, 0.0, 1.0, n_iter=5, max_level=4))
+        self.assertEqual(levels[-1].n_iter, 80)
+        # 80 grid points plus f(b) (f(a) is evaluated twice)
+        self.assertEqual(levels[-1].n_evals, 82)
+        self.assertEqual(len(f.points), 81)
+
+    def test_error_estimates_shrink_and_bound_the_error(self):
+        levels = list(refine(math.exp, 0.0, 2.0, max_level=8))
+        self.assertEqual(levels[0].error, math.inf)
+        exact = math.exp(2.0) - 1.0
+        for prev, level in zip(levels[2:], levels[3:]):
+            self.assertLessEqual(abs(level.value - exact), prev.error)
+
+    def test_vectorized_and_summation(self):
+        ref = [lv.value for lv in refine(math.sin, 0.0, 3.0, n_iter=2, max_level=5)]
+        vec = [lv.value for lv in refine(np.sin, 0.0, 3.0, n_iter=2, max_level=5, vectorized=True)]
+        kah = [lv.value for lv in refine(math.sin, 0.0, 3.0, n_iter=2, max_level=5, summation="kahan")]
+        for r, v, k in zip(ref, vec, kah):
+            self.assertAlmostEqual(r, v, places=13)
+            self.assertAlmostEqual(r, k, places=13)
+
+    def test_integrate_romberg(self):
+        res = integrate_romberg(math.exp, 0.0, 1.0, tol=1e-12)
+        self.assertIsInstance(res, IntegrationResult)
+        self.assertAlmostEqual(res.value, math.e - 1.0, places=12)
+        self.assertLess(res.n_evals, 100)
+        # reversed interval
+        self.assertAlmostEqual(integrate_romberg(math.exp, 1.0, 0.0).value, 1.0 - math.e, places=10)
+        # max_level reached: the error estimate is returned as is
+        res = integrate_romberg(math.sqrt, 0.0, 1.0, tol=0.0, max_level=4)
+        self.assertEqual(res.n_evals, (1 + 2) + 1 + 2 + 4 + 8)
+        self.assertGreater(res.error, 0.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            next(refine(math.sin, 0.0, 1.0, n_iter=0))
+        with self.assertRaises(ValueError):
+            next(refine(math.sin, 0.0, 1.0, max_level=-1))
+        with self.assertRaises(ValueError):
+            next(refine(math.sin, 0.0, 1.0, summation="unknown"))
+        with self.assertRaises(ValueError):
+            integrate_romberg(math.sin, 0.0, 1.0, tol=-1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
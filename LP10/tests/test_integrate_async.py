@@ -0,0 +1,121 @@
+import asyncio
+import math
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from integrate_async import AsyncIntegrator, integrate_async, integrate_nogil_async
+from integrate_py import integrate
+
+
+class _Slow:
+    """Integrand that sleeps on every call and counts the calls."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, x):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return 1.0
+
+
+class TestAsyncIntegrator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ai = AsyncIntegrator("thread", max_workers=2)
+
+    async def asyncTearDown(self):
+        self.ai.close()
+
+    async def test_matches_blocking_version(self):
+        ref = integrate(math.sin, 0.0, math.pi, n_iter=50_001)
+        self.assertEqual(await self.ai.integrate(math.sin, 0.0, math.pi, n_iter=50_001), ref)
+        val = await self.ai.integrate(math.sin, 0.0, math.pi, n_iter=50_001, n_jobs=3, summation="kahan")
+        self.assertAlmostEqual(val, ref, places=12)
+        self.assertAlmostEqual(await integrate_async(math.sin, 0.0, math.pi, n_iter=50_001), ref, places=12)
+
+    async def test_nogil(self):
+        val = await self.ai.integrate_nogil("poly", 0.0, 1.0, params=[1.0, 0.0], n_iter=100_000, n_jobs=2)
+        self.assertAlmostEqual(val, 0.5, places=4)
+        self.assertAlmostEqual(await integrate_nogil_async("sin", 0.0, math.pi, n_iter=100_000), 2.0, places=6)
+        with self.assertRaises(KeyError):
+            await self.ai.integrate_nogil("no_such_integrand", 0.0, 1.0)
+
+    async def test_event_loop_is_not_blocked(self):
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        hb = asyncio.create_task(heartbeat())
+        await self.ai.integrate(_Slow(0.01), 0.0, 1.0, n_iter=10)
+        hb.cancel()
+        self.assertGreater(ticks, 5)
+
+    async def test_pending_integrals_are_bounded(self):
+        f = _Slow(0.005)
+        async with AsyncIntegrator("thread", max_workers=4, max_pending=1) as ai:
+            vals = await asyncio.gather(*(ai.integrate(f, 0.0, 1.0, n_iter=4) for _ in range(4)))
+            self.assertEqual(ai.running, 0)
+        self.assertEqual(vals, [1.0] * 4)
+        # one integral (n_jobs=1) at a time although four workers are free
+        self.assertEqual(f.max_active, 1)
+
+    async def test_timeout_cancels_queued_jobs(self):
+        f = _Slow(0.01)
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.ai.integrate(f, 0.0, 1.0, n_iter=200, chunk_size=1, timeout=0.05)
+        await asyncio.sleep(0.05)
+        self.assertLess(f.calls, 200)
+
+    async def test_cancellation(self):
+        f = _Slow(0.01)
+        task = asyncio.create_task(self.ai.integrate(f, 0.0, 1.0, n_iter=200, chunk_size=1))
+        await asyncio.sleep(0.03)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.05)
+        self.assertLess(f.calls, 200)
+        self.assertEqual(self.ai.running, 0)
+        # the integrator is still usable afterwards
+        self.assertEqual(await self.ai.integrate(abs, 1.0, 2.0, n_iter=1), 1.0)
+
+    async def test_errors(self):
+        with self.assertRaises(ValueError):
+            await self.ai.integrate(math.sin, 0.0, 1.0, n_iter=0)
+        with self.assertRaises(ValueError):
+            await self.ai.integrate(math.sin, 0.0, 1.0, summation="unknown")
+        with self.assertRaises(ZeroDivisionError):
+            await self.ai.integrate(lambda x: 1 / 0, 0.0, 1.0, n_iter=10, n_jobs=2)
+        # no pool (and no worker processes) is left behind by invalid arguments
+        with patch("integrate_async.IntegrationPool") as pool_cls:
+            with self.assertRaises(ValueError):
+                AsyncIntegrator("process", max_workers=1, max_pending=0)
+            pool_cls.assert_not_called()
+
+
+class TestProcessPool(unittest.TestCase):
+    def test_process_pool(self):
+        async def main():
+            async with AsyncIntegrator("process", max_workers=2) as ai:
+                return await ai.integrate(math.sin, 0.0, math.pi, n_iter=20_000, n_jobs=2)
+
+        self.assertAlmostEqual(asyncio.run(main()), integrate(math.sin, 0.0, math.pi, n_iter=20_000), places=12)
+
+
+if __name__ == "__main__":
+    unittest.main()
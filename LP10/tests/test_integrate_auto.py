@@ -0,0 +1,96 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from integrate_auto import CalibrationProfile, choose_backend, integrate
+from integrate_expr import compile_integrand
+from integrate_pool import IntegrationPool
+
+
+class TestChooseBackend(unittest.TestCase):
+    def setUp(self):
+        self.profile = CalibrationProfile(cpu_count=8)
+
+    def test_backend_depends_on_integrand_type(self):
+        self.assertEqual(choose_backend(lambda x: x * x, 10_000, profile=self.profile).backend, "python")
+        self.assertEqual(choose_backend(np.sqrt, 1_000_000, profile=self.profile).backend, "numpy")
+        self.assertIn(choose_backend("poly", 1000, profile=self.profile).backend, ("nogil", "cython"))
+        self.assertIn(
+            choose_backend(compile_integrand("x*x"), 1000, profile=self.profile).backend, ("nogil",)
+        )
+
+    def test_large_problems_go_parallel(self):
+        plan = choose_backend(math.sin, 100_000_000, profile=self.profile)
+        self.assertEqual(plan.backend, "nogil_threads")
+        self.assertGreater(plan.n_jobs, 1)
+        # pickleable pure Python integrand: processes win once spawn cost is amortised
+        self.assertEqual(choose_backend(abs, 100_000_000, profile=self.profile).backend, "processes")
+        self.assertEqual(choose_backend(abs, 10_000, profile=self.profile).backend, "python")
+
+    def test_unpicklable_integrand_never_uses_processes(self):
+        plan = choose_backend(lambda x: x, 10**9, profile=self.profile)
+        self.assertNotEqual(plan.backend, "processes")
+
+    def test_fixed_n_jobs(self):
+        plan = choose_backend(math.sin, 100_000_000, n_jobs=3, profile=self.profile)
+        self.assertEqual(plan.n_jobs, 3)
+
+
+class TestIntegrateFrontDoor(unittest.TestCase):
+    def test_every_backend_gives_same_answer(self):
+        for backend in ("python", "threads", "processes", "cython", "nogil", "nogil_threads"):
+            val = integrate(math.sin, 0.0, math.pi, n_iter=100_000, n_jobs=2, backend=backend)
+            self.assertAlmostEqual(val, 2.0, places=4, msg=backend)
+        val = integrate(np.sin, 0.0, math.pi, n_iter=100_000, backend="numpy")
+        self.assertAlmostEqual(val, 2.0, places=4)
+
+    def test_automatic_choice(self):
+        self.assertAlmostEqual(integrate(math.cos, 0.0, math.pi / 2, n_iter=100_000), 1.0, places=4)
+        self.assertAlmostEqual(integrate("poly", 0.0, 1.0, params=[1.0, 2.0, 1.0]), 7.0 / 3.0, places=4)
+        self.assertAlmostEqual(integrate(compile_integrand("x*x + 2*x + 1"), 0.0, 1.0), 7.0 / 3.0, places=4)
+        self.assertAlmostEqual(integrate(lambda x: x * x, 0.0, 1.0), 1.0 / 3.0, places=4)
+
+    def test_shared_pool(self):
+        with IntegrationPool("thread", max_workers=2) as pool:
+            val = integrate("exp", 0.0, 1.0, n_iter=100_000, backend="nogil_threads", pool=pool)
+        self.assertAlmostEqual(val, math.e - 1.0, places=4)
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            integrate(math.sin, 0.0, 1.0, backend="gpu")
+        with self.assertRaises(ValueError):
+            integrate(lambda x: x, 0.0, 1.0, backend="nogil")
+        with self.assertRaises(ValueError):
+            integrate(math.sin, 0.0, 1.0, n_iter=0)
+
+
+class TestCalibrationProfile(unittest.TestCase):
+    def test_save_and_load(self):
+        profile = CalibrationProfile({"python": {"rate": 123.0}}, cpu_count=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.json")
+            profile.save(path)
+            loaded = CalibrationProfile.load(path)
+        self.assertEqual(loaded.cpu_count, 3)
+        self.assertEqual(loaded.backends["python"]["rate"], 123.0)
+        # missing entries keep the built-in defaults
+        self.assertIn("nogil", loaded.backends)
+
+    def test_missing_file_gives_defaults(self):
+        profile = CalibrationProfile.load("/nonexistent/calibration.json")
+        self.assertIn("processes", profile.backends)
+
+    def test_estimate_scales_with_jobs(self):
+        profile = CalibrationProfile(cpu_count=4)
+        t1 = profile.estimate("nogil_threads", 10**9, 1)
+        t4 = profile.estimate("nogil_threads", 10**9, 4)
+        t8 = profile.estimate("nogil_threads", 10**9, 8)
+        self.assertLess(t4, t1)
+        self.assertGreater(t8, t4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import math
+import unittest
+
+import numpy as np
+
+from integrate_batch import integrate_batch
+from integrate_expr import compile_integrand
+from integrate_pool import IntegrationPool, split_range
+from integrate_py import integrate
+
+
+class TestSplitRange(unittest.TestCase):
+    def test_covers_range_without_gaps(self):
+        for count, parts in [(10, 3), (7, 7), (3, 8), (1_000_003, 4)]:
+            blocks = split_range(count, parts)
+            self.assertEqual(blocks[0][0], 0)
+            self.assertEqual(blocks[-1][1], count)
+            for (_, stop), (start, _) in zip(blocks, blocks[1:]):
+                self.assertEqual(stop, start)
+            sizes = [hi - lo for lo, hi in blocks]
+            self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+
+class TestIntegrateBatch(unittest.TestCase):
+    N = 2_000
+
+    def test_python_callable_matches_loop(self):
+        a = np.linspace(0.0, 1.0, 9)
+        b = a + 1.0
+        expected = [integrate(math.sin, lo, hi, n_iter=self.N) for lo, hi in zip(a, b)]
+        for backend in ("serial", "threads", "processes"):
+            with self.subTest(backend=backend):
+                res = integrate_batch(math.sin, a, b, n_iter=self.N, backend=backend, n_jobs=2)
+                self.assertIsInstance(res, np.ndarray)
+                np.testing.assert_allclose(res, expected, rtol=0, atol=1e-15)
+
+    def test_per_integral_params(self):
+        powers = np.arange(1.0, 6.0)
+        res = integrate_batch(math.pow, 0.0, 1.0, powers[:, None], n_iter=20_000, backend="serial")
+        np.testing.assert_allclose(res, 1.0 / (powers + 1.0), atol=1e-4)
+
+    def test_registered_c_integrand(self):
+        coeffs = np.array([[1.0, 0.0], [2.0, 1.0], [0.0, 3.0]])  # x, 2x + 1, 3
+        res = integrate_batch("poly", 0.0, 1.0, coeffs, n_iter=100_000, n_jobs=2)
+        np.testing.assert_allclose(res, [0.5, 2.0, 3.0], atol=1e-4)
+
+        shared = integrate_batch("poly", [0.0, 0.0], [1.0, 2.0], [1.0, 0.0], n_iter=100_000)
+        np.testing.assert_allclose(shared, [0.5, 2.0], atol=1e-4)
+
+    def test_compiled_integrand_uses_c_kernel(self):
+        f = compile_integrand("x*x + 2*x + 1")
+        res = integrate_batch(f, 0.0, [1.0, 2.0], n_iter=100_000, backend="serial")
+        np.testing.assert_allclose(res, [7 / 3, 26 / 3], atol=1e-3)
+
+    def test_runs_on_persistent_pool(self):
+        with IntegrationPool("thread", max_workers=2) as pool:
+            res = integrate_batch("sin", np.zeros(5), math.pi, n_iter=100_000, pool=pool)
+        np.testing.assert_allclose(res, 2.0, atol=1e-6)
+
+    def test_empty_batch(self):
+        self.assertEqual(integrate_batch(math.sin, [], [], backend="serial").shape, (0,))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            integrate_batch(math.sin, [0.0, 1.0], [1.0, 2.0, 3.0])
+        with self.assertRaises(ValueError):
+            integrate_batch("poly", [0.0, 1.0], 2.0, np.ones((3, 2)))
+        with self.assertRaises(ValueError):
+            integrate_batch(math.sin, 0.0, 1.0, backend="gpu")
+        with self.assertRaises(ValueError):
+            integrate_batch(compile_integrand("x"), 0.0, 1.0, [1.0])
+        with self.assertRaises(KeyError):
+            integrate_batch("no_such_integrand", 0.0, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import math
+import tempfile
+import unittest
+from functools import partial
+from pathlib import Path
+
+from integrate_cache import IntegralCache, cached_integrate, fingerprint
+from integrate_expr import compile_integrand
+from integrate_py import integrate
+
+
+class _Counter:
+    """compute= hook that counts the evaluated points."""
+
+    def __init__(self):
+        self.points = 0
+
+    def __call__(self, f, a, b, n_iter, method, params):
+        self.points += n_iter
+        return integrate(f, a, b, n_iter=n_iter, summation=method)
+
+
+def _scaled(x, k):
+    return k * x
+
+
+class _Callable:
+    def __call__(self, x):
+        return x
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_stable_and_distinct(self):
+        self.assertEqual(fingerprint(math.sin), fingerprint(math.sin))
+        self.assertNotEqual(fingerprint(math.sin), fingerprint(math.cos))
+        self.assertEqual(fingerprint(compile_integrand("x*x")), fingerprint(compile_integrand("x*x")))
+        self.assertNotEqual(fingerprint(partial(_scaled, k=2)), fingerprint(partial(_scaled, k=3)))
+        # closures are identified by the captured values
+        make = lambda k: (lambda x: k * x)  # noqa: E731
+        self.assertEqual(fingerprint(make(2)), fingerprint(make(2)))
+        self.assertNotEqual(fingerprint(make(2)), fingerprint(make(3)))
+
+    def test_unsupported_object(self):
+        with self.assertRaises(TypeError):
+            fingerprint(_Callable())
+
+    def test_globals_and_helpers(self):
+        ns = {"math": math}
+        exec("K = 2.0\ndef g(x): return math.sin(x)\ndef f(x): return K * g(x)", ns)
+        before = fingerprint(ns["f"])
+        ns["K"] = 3.0
+        after_constant = fingerprint(ns["f"])
+        exec("def g(x): return math.cos(x)", ns)
+        self.assertEqual(len({before, after_constant, fingerprint(ns["f"])}), 3)
+
+    def test_recursive_function_and_unsupported_global(self):
+        ns = {}
+        exec("def f(x, n=2): return x if n == 0 else f(x, n - 1)", ns)
+        self.assertEqual(fingerprint(ns["f"]), fingerprint(ns["f"]))
+        ns["TABLE"] = _Callable()
+        exec("def t(x): return TABLE(x)", ns)
+        with self.assertRaisesRegex(TypeError, "TABLE"):
+            fingerprint(ns["t"])
+
+
+class TestIntegralCache(unittest.TestCase):
+    def test_hits_and_keys(self):
+        counter = _Counter()
+        cache = IntegralCache(compute=counter)
+        v = cache.integrate(math.sin, 0.0, 1.0, n_iter=1000)
+        self.assertEqual(cache.integrate(math.sin, 0.0, 1.0, n_iter=1000), v)
+        self.assertEqual(counter.points, 1000)
+        # every part of the key matters
+        cache.integrate(math.sin, 0.0, 1.0, n_iter=1000, method="kahan")
+        cache.integrate(math.cos, 0.0, 1.0, n_iter=1000)
+        cache.integrate(math.sin, 0.5, 1.0, n_iter=1000)
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 4, 4))
+
+    def test_lru_eviction(self):
+        counter = _Counter()
+        cache = IntegralCache(maxsize=2, compute=counter)
+        cache.integrate(math.sin, 0.0, 1.0, n_iter=10)
+        cache.integrate(math.sin, 0.0, 3.0, n_iter=10)
+        cache.integrate(math.sin, 0.0, 1.0, n_iter=10)  # refreshes [0, 1]
+        cache.integrate(math.sin, 0.0, 5.0, n_iter=10)  # evicts [0, 3]
+        self.assertEqual(cache.info().currsize, 2)
+        cache.integrate(math.sin, 0.0, 1.0, n_iter=10)
+        self.assertEqual(counter.points, 30)
+        cache.integrate(math.sin, 0.0, 3.0, n_iter=10)
+        self.assertEqual(counter.points, 40)
+
+    def test_extension_of_b(self):
+        counter = _Counter()
+        cache = IntegralCache(compute=counter)
+        cache.integrate(math.sin, 0.0, 1.0, n_iter=1000)
+        cache.integrate(math.sin, 0.0, 1.5, n_iter=1500)
+        val = cache.integrate(math.sin, 0.0, 2.0, n_iter=2000)
+        self.assertEqual(counter.points, 2000)
+        self.assertEqual(cache.info().extended, 2)
+        self.assertAlmostEqual(val, integrate(math.sin, 0.0, 2.0, n_iter=2000), places=12)
+        # a different step is computed from scratch
+        cache.integrate(math.sin, 0.0, 2.0, n_iter=3000)
+        self.assertEqual(counter.points, 5000)
+
+    def test_disk_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "integrals.sqlite"
+            with IntegralCache(path=path) as cache:
+                v = cache.integrate(math.sin, 0.0, 1.0, n_iter=1000)
+            counter = _Counter()
+            with IntegralCache(path=path, compute=counter) as cache:
+                self.assertEqual(cache.integrate(math.sin, 0.0, 1.0, n_iter=1000), v)
+                cache.integrate(math.sin, 0.0, 2.0, n_iter=2000)
+                self.assertEqual(cache.info().disk_hits, 1)
+                self.assertEqual(cache.info().extended, 1)
+                self.assertEqual(counter.points, 1000)
+                cache.clear(disk=True)
+                cache.integrate(math.sin, 0.0, 1.0, n_iter=1000)
+                self.assertEqual(counter.points, 2000)
+
+    def test_registered_and_compiled_integrands(self):
+        cache = IntegralCache()
+        self.assertAlmostEqual(cache.integrate("poly", 0.0, 1.0, n_iter=10_000, params=[1.0, 0.0]), 0.5, places=3)
+        self.assertAlmostEqual(cache.integrate("poly", 0.0, 1.0, n_iter=10_000, params=[2.0, 0.0]), 1.0, places=3)
+        f = compile_integrand("x * x")
+        self.assertAlmostEqual(cache.integrate(f, 0.0, 1.0, n_iter=10_000), 1 / 3, places=3)
+        self.assertEqual(cache.info().misses, 3)
+
+    def test_explicit_key_and_errors(self):
+        cache = IntegralCache()
+        self.assertAlmostEqual(cache.integrate(_Callable(), 0.0, 1.0, n_iter=10, key="identity"), 0.45)
+        with self.assertRaises(TypeError):
+            cache.integrate(_Callable(), 0.0, 1.0)
+        with self.assertRaises(ValueError):
+            cache.integrate(math.sin, 0.0, 1.0, n_iter=0)
+        with self.assertRaises(ValueError):
+            cache.integrate(math.sin, 0.0, 1.0, method="unknown")
+        with self.assertRaises(ValueError):
+            IntegralCache(maxsize=0)
+
+    def test_changed_global_misses_on_disk(self):
+        ns = {"K": 2.0}
+        exec("def f(x): return K * x", ns)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "integrals.sqlite"
+            with IntegralCache(path=path) as cache:
+                first = cache.integrate(ns["f"], 0.0, 1.0, n_iter=1000)
+            ns["K"] = 3.0
+            with IntegralCache(path=path) as cache:
+                second = cache.integrate(ns["f"], 0.0, 1.0, n_iter=1000)
+                self.assertEqual(cache.info().disk_hits, 0)
+        self.assertAlmostEqual(second, 1.5 * first)
+
+    def test_default_cache(self):
+        self.assertEqual(cached_integrate(math.sin, 0.0, 0.5, n_iter=100),
+                         cached_integrate(math.sin, 0.0, 0.5, n_iter=100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import math
+import pickle
+import unittest
+
+import numpy as np
+
+import cyintegrate_nogil
+from integrate_expr import CompiledIntegrand, compile_integrand
+from integrate_py import integrate
+from integrate_threads_nogil import integrate_threaded_nogil
+
+
+class TestCompileIntegrand(unittest.TestCase):
+    def test_scalar_and_vectorized_agree(self):
+        xs = np.linspace(0.1, 2.0, 7)
+        for expr in ("x*x + 2*x + 1", "sin(pi*x) * exp(-x**2)", "sqrt(x) - 1/(1+x)", "abs(x - 1) ** 1.5"):
+            f = compile_integrand(expr)
+            expected = [f(float(x)) for x in xs]
+            np.testing.assert_allclose(f.vectorized(xs), expected, rtol=1e-14)
+
+    def test_lambda_source(self):
+        f = compile_integrand("lambda t: t*t + 2*t + 1")
+        self.assertEqual(f.source, "x * x + 2 * x + 1")
+        self.assertEqual(f(2.0), 9.0)
+
+    def test_constant_folding(self):
+        # 2*pi is a single constant, x**2 a single opcode
+        f = compile_integrand("sin(2*pi*x) + x**2")
+        self.assertEqual(len(f.program), 2 * 7)
+        self.assertAlmostEqual(f(0.25), 1.0 + 0.0625)
+
+    def test_pickle_by_source(self):
+        f = compile_integrand("exp(-x) * cos(x)")
+        g = pickle.loads(pickle.dumps(f))
+        self.assertIsInstance(g, CompiledIntegrand)
+        self.assertEqual(g.source, f.source)
+        self.assertEqual(g(0.7), f(0.7))
+
+    def test_rejects_unsafe_or_unknown_syntax(self):
+        for expr in ("__import__('os')", "x.real", "y + 1", "x if x else 1", "x < 1",
+                     "sin(x, 2)", "lambda a, b: a", "True", "'text'", "[x]", ""):
+            with self.assertRaises(ValueError, msg=expr):
+                compile_integrand(expr)
+
+
+class TestCompiledBackends(unittest.TestCase):
+    def test_all_backends_give_same_integral(self):
+        f = compile_integrand("x*x + 2*x + 1")
+        n_iter = 200_000
+        py = integrate(f, 0.0, 1.0, n_iter=n_iter)
+        vec = integrate(f.vectorized, 0.0, 1.0, n_iter=n_iter, vectorized=True)
+        c = cyintegrate_nogil.integrate_nogil(f.NOGIL_NAME, 0.0, 1.0, n_iter, f.program)
+        thr = integrate_threaded_nogil(f.NOGIL_NAME, 0.0, 1.0, params=f.program, n_jobs=2, n_iter=n_iter)
+        self.assertAlmostEqual(py, 7.0 / 3.0, places=4)
+        self.assertAlmostEqual(vec, py, places=10)
+        self.assertAlmostEqual(c, py, places=10)
+        self.assertAlmostEqual(thr, py, places=10)
+
+    def test_c_interpreter_matches_python(self):
+        for expr in ("tan(x) + atan(x) - sinh(x) * cosh(x) / tanh(x + 1)", "asin(x/3) + acos(x/3) + log(x)", "-x + +x * 3"):
+            f = compile_integrand(expr)
+            for x in (0.3, 1.1, 2.5):
+                self.assertAlmostEqual(cyintegrate_nogil.call_integrand("expr", x, f.program), f(x), places=12)
+
+    def test_ieee_semantics_agree(self):
+        # points where Python raises or goes complex give the C/NumPy inf or nan
+        cases = [("x**0.5", -1.0), ("1/x", 0.0), ("log(x)", 0.0), ("sqrt(x)", -2.0), ("exp(x)", 1000.0),
+                 ("asin(x)", 2.0), ("x**x", -0.5), ("(-8)**(1/3) + x", 1.0), ("1/0 - x", 1.0)]
+        for expr, x in cases:
+            f = compile_integrand(expr)
+            with np.errstate(all="ignore"):
+                vec = float(f.vectorized(np.array([x]))[0])
+            c = cyintegrate_nogil.call_integrand("expr", x, f.program)
+            scalar = f(x)
+            self.assertIsInstance(scalar, float, msg=expr)
+            np.testing.assert_array_equal([scalar, vec], [c, c], err_msg=expr)
+
+    def test_huge_constants_overflow_to_inf(self):
+        # folded in float64: no huge Python integer, no OverflowError
+        for expr in ("x + 9**9**9", "x + 10**400", "x - " + "9" * 400):
+            f = compile_integrand(expr)
+            expected = -math.inf if "-" in expr else math.inf
+            self.assertEqual(f(1.0), expected, msg=expr)
+            self.assertEqual(float(f.vectorized(np.array([1.0]))[0]), expected, msg=expr)
+            self.assertEqual(cyintegrate_nogil.call_integrand("expr", 1.0, f.program), expected, msg=expr)
+
+    def test_malformed_program_gives_nan(self):
+        self.assertTrue(math.isnan(cyintegrate_nogil.call_integrand("expr", 1.0, [99.0, 0.0])))
+        # binary operator with an empty stack
+        self.assertTrue(math.isnan(cyintegrate_nogil.call_integrand("expr", 1.0, [2.0, 0.0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
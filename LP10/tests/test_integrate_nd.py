@@ -0,0 +1,96 @@
+import math
+import unittest
+
+import numpy as np
+
+from integrate_nd import integrate_mc_nd, integrate_rect_nd
+from integrate_pool import IntegrationPool
+
+# ∫∫[0,1]^2 exp(-(x^2 + y^2)) dx dy
+GAUSS_2D = (math.sqrt(math.pi) / 2 * math.erf(1.0)) ** 2
+
+
+def gauss_np(x, y):
+    return np.exp(-(x * x + y * y))
+
+
+class TestIntegrateRectND(unittest.TestCase):
+    def test_vectorized_matches_scalar(self):
+        scalar = integrate_rect_nd(lambda x, y: math.exp(-(x * x + y * y)), [(0, 1), (0, 1)], n_iter=200)
+        vec = integrate_rect_nd(gauss_np, [(0, 1), (0, 1)], n_iter=200, vectorized=True)
+        self.assertAlmostEqual(scalar, vec, places=12)
+
+    def test_accuracy_and_partitioning(self):
+        expected = integrate_rect_nd(gauss_np, [(0, 1), (0, 1)], n_iter=1000, rule="midpoint", vectorized=True)
+        self.assertAlmostEqual(expected, GAUSS_2D, places=7)
+        # uneven slabs and tiny chunks must give the same grid
+        for kwargs in ({"n_jobs": 3}, {"n_jobs": 7, "chunk_size": 500}, {"n_jobs": 2, "backend": "serial"}):
+            val = integrate_rect_nd(gauss_np, [(0, 1), (0, 1)], n_iter=1000, rule="midpoint",
+                                    vectorized=True, **kwargs)
+            self.assertAlmostEqual(val, expected, places=12, msg=kwargs)
+
+    def test_three_dimensions_and_per_axis_counts(self):
+        val = integrate_rect_nd(lambda x, y, z: x * y * z, [(0, 1), (0, 2), (0, 3)],
+                                n_iter=(10, 20, 30), rule="midpoint", vectorized=True)
+        self.assertAlmostEqual(val, 0.5 * 2.0 * 4.5, places=12)
+
+    def test_numpy_integer_counts(self):
+        expected = integrate_rect_nd(gauss_np, [(0, 1), (0, 1)], n_iter=100, vectorized=True)
+        for n_iter in (np.int64(100), np.array([100, 100]), (np.int32(100), 100)):
+            val = integrate_rect_nd(gauss_np, [(0, 1), (0, 1)], n_iter=n_iter, vectorized=True)
+            self.assertEqual(val, expected, msg=repr(n_iter))
+
+    def test_process_backend_with_pool(self):
+        with IntegrationPool("process", max_workers=2) as pool:
+            val = integrate_rect_nd(np.hypot, [(0, 1), (0, 1)], n_iter=300, vectorized=True,
+                                    n_jobs=2, backend="processes", pool=pool)
+        serial = integrate_rect_nd(np.hypot, [(0, 1), (0, 1)], n_iter=300, vectorized=True)
+        self.assertAlmostEqual(val, serial, places=12)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            integrate_rect_nd(gauss_np, [], n_iter=10)
+        with self.assertRaises(ValueError):
+            integrate_rect_nd(gauss_np, [(0, 1), (0, 1)], n_iter=(10,))
+        with self.assertRaises(ValueError):
+            integrate_rect_nd(gauss_np, [(0, 1)], n_iter=10, rule="trapezoid")
+        with self.assertRaises(ValueError):
+            integrate_rect_nd(gauss_np, [(0, 1)], n_iter=10, n_jobs=2, backend="gpu")
+        with self.assertRaises(TypeError):
+            integrate_rect_nd(gauss_np, [(0, 1)], n_iter=10.5)
+
+
+class TestIntegrateMonteCarloND(unittest.TestCase):
+    def test_mc_error_estimate(self):
+        res = integrate_mc_nd(gauss_np, [(0, 1), (0, 1)], n_points=100_000, method="mc",
+                              vectorized=True, seed=7, n_jobs=4)
+        self.assertLess(abs(res.value - GAUSS_2D), 5 * res.error)
+        self.assertEqual(res.n_evals, 100_000)
+
+    def test_qmc_is_more_accurate_than_mc(self):
+        mc = integrate_mc_nd(gauss_np, [(0, 1), (0, 1)], n_points=50_000, method="mc", vectorized=True, seed=1)
+        qmc = integrate_mc_nd(gauss_np, [(0, 1), (0, 1)], n_points=50_000, method="qmc", vectorized=True, seed=1)
+        self.assertLess(qmc.error, mc.error)
+        self.assertAlmostEqual(qmc.value, GAUSS_2D, places=5)
+
+    def test_reproducible_and_independent_of_n_jobs_for_qmc(self):
+        kwargs = dict(n_points=10_000, method="qmc", vectorized=True, seed=42)
+        r1 = integrate_mc_nd(gauss_np, [(0, 1), (0, 1)], n_jobs=1, **kwargs)
+        r4 = integrate_mc_nd(gauss_np, [(0, 1), (0, 1)], n_jobs=4, **kwargs)
+        self.assertAlmostEqual(r1.value, r4.value, places=12)
+
+    def test_scalar_integrand(self):
+        res = integrate_mc_nd(lambda x, y: x + y, [(0, 1), (0, 1)], n_points=2000, method="mc", seed=3)
+        self.assertLess(abs(res.value - 1.0), 5 * res.error)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            integrate_mc_nd(gauss_np, [(0, 1)], n_points=1)
+        with self.assertRaises(ValueError):
+            integrate_mc_nd(gauss_np, [(0, 1)], method="sobol")
+        with self.assertRaises(ValueError):
+            integrate_mc_nd(gauss_np, [(0, 1)] * 11, method="qmc")
+
+
+if __name__ == "__main__":
+    unittest.main()
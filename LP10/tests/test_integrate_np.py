@@ -0,0 +1,40 @@
+import math
+import unittest
+
+import numpy as np
+
+from integrate_np import integrate_vectorized
+from integrate_py import integrate
+
+
+class TestIntegrateVectorized(unittest.TestCase):
+    def test_known_integral_sin(self):
+        # ∫[0,π] sin(x) dx = 2
+        val = integrate_vectorized(np.sin, 0.0, math.pi, n_iter=300_000)
+        self.assertAlmostEqual(val, 2.0, places=4)
+
+    def test_matches_scalar_version(self):
+        # chunking must not change the grid: same points as the pure Python loop
+        f = lambda x: x * x + 2 * x + 1
+        expected = integrate(f, 0.0, 1.0, n_iter=10_001)
+        for chunk_size in (1, 7, 1000, 10_001, 50_000):
+            val = integrate_vectorized(f, 0.0, 1.0, n_iter=10_001, chunk_size=chunk_size)
+            self.assertAlmostEqual(val, expected, places=10)
+
+    def test_scalar_result_is_broadcast(self):
+        val = integrate_vectorized(lambda x: 3.0, 1.0, 2.0, n_iter=1000)
+        self.assertAlmostEqual(val, 3.0, places=12)
+
+    def test_integrate_vectorized_flag(self):
+        val = integrate(np.cos, 0.0, math.pi / 2, n_iter=100_000, vectorized=True, chunk_size=4096)
+        self.assertAlmostEqual(val, 1.0, places=4)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            integrate_vectorized(np.sin, 0.0, 1.0, n_iter=0)
+        with self.assertRaises(ValueError):
+            integrate_vectorized(np.sin, 0.0, 1.0, chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
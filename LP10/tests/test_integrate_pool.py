@@ -0,0 +1,87 @@
+import math
+import unittest
+
+from integrate_pool import IntegrationPool, split_interval
+from integrate_processes import integrate_processed
+from integrate_py import integrate
+from integrate_threads import integrate_threaded
+from integrate_threads_nogil import integrate_sin_threaded_nogil, integrate_threaded_nogil
+
+
+class TestIntegrationPool(unittest.TestCase):
+    def test_pool_is_reused_by_front_ends(self):
+        with IntegrationPool("thread", max_workers=2) as pool:
+            v1 = integrate_threaded(math.sin, 0.0, math.pi, n_jobs=4, n_iter=40_000, pool=pool)
+            v2 = integrate_sin_threaded_nogil(0.0, math.pi, n_jobs=4, n_iter=40_000, pool=pool)
+            self.assertFalse(pool.closed)
+        self.assertTrue(pool.closed)
+        self.assertAlmostEqual(v1, 2.0, places=4)
+        self.assertAlmostEqual(v2, 2.0, places=4)
+
+    def test_process_pool(self):
+        with IntegrationPool("process", max_workers=2) as pool:
+            v1 = integrate_processed(math.sin, 0.0, math.pi, n_jobs=2, n_iter=20_000, pool=pool)
+            v2 = integrate_processed(math.cos, 0.0, math.pi / 2, n_jobs=2, n_iter=20_000, pool=pool)
+        self.assertAlmostEqual(v1, 2.0, places=3)
+        self.assertAlmostEqual(v2, 1.0, places=3)
+
+    def test_integrate_many_keeps_order(self):
+        intervals = [(0.0, 1.0), (0.0, 2.0), (1.0, 3.0)]
+        with IntegrationPool("thread", max_workers=3) as pool:
+            res = pool.integrate_many(math.exp, intervals, n_iter=1000)
+        expected = [integrate(math.exp, a, b, n_iter=1000) for a, b in intervals]
+        self.assertEqual(res, expected)
+
+    def test_kind_mismatch_and_shutdown(self):
+        pool = IntegrationPool("thread", max_workers=1)
+        with self.assertRaises(ValueError):
+            integrate_processed(math.sin, 0.0, 1.0, pool=pool)
+        pool.shutdown()
+        pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            integrate_threaded(math.sin, 0.0, 1.0, pool=pool)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            IntegrationPool("fiber")
+        with self.assertRaises(ValueError):
+            IntegrationPool("thread", max_workers=0)
+
+
+class TestChunkedScheduling(unittest.TestCase):
+    def test_split_interval_keeps_every_point(self):
+        for n_iter, parts, chunk in [(10, 3, None), (100_003, 4, None), (1000, 2, 7), (5, 8, None)]:
+            jobs = split_interval(0.0, 1.0, n_iter, parts, chunk)
+            self.assertEqual(sum(n for _, _, n in jobs), n_iter)
+            self.assertEqual(jobs[0][0], 0.0)
+            self.assertEqual(jobs[-1][1], 1.0)
+            for (_, hi, _), (lo, _, _) in zip(jobs, jobs[1:]):
+                self.assertEqual(hi, lo)
+        self.assertEqual(len(split_interval(0.0, 1.0, 1000, 2, chunk_size=7)), 143)
+        with self.assertRaises(ValueError):
+            split_interval(0.0, 1.0, 10, 2, chunk_size=0)
+
+    def test_remainder_is_not_dropped(self):
+        # 7 points over 3 jobs: previously 2 * 3 = 6 points were integrated
+        f = lambda x: 1.0
+        self.assertAlmostEqual(integrate_threaded(f, 0.0, 1.0, n_jobs=3, n_iter=7), 1.0, places=12)
+        self.assertAlmostEqual(integrate_threaded(f, 0.0, 1.0, n_jobs=4, n_iter=2), 1.0, places=12)
+
+    def test_chunked_matches_serial(self):
+        f = lambda x: x * x
+        ref = integrate(f, 0.0, 1.0, n_iter=10_001)
+        for chunk in (None, 1, 97, 5000, 20_000):
+            with self.subTest(chunk_size=chunk):
+                val = integrate_threaded(f, 0.0, 1.0, n_jobs=3, n_iter=10_001, chunk_size=chunk)
+                self.assertAlmostEqual(val, ref, places=12)
+        val = integrate_threaded_nogil("poly", 0.0, 1.0, params=[1.0, 0.0, 0.0], n_jobs=3, n_iter=10_001, chunk_size=64)
+        self.assertAlmostEqual(val, ref, places=12)
+
+    def test_chunked_processes_on_pool(self):
+        with IntegrationPool("process", max_workers=2) as pool:
+            val = integrate_processed(math.sin, 0.0, math.pi, n_jobs=2, n_iter=30_001, chunk_size=4096, pool=pool)
+        self.assertAlmostEqual(val, integrate(math.sin, 0.0, math.pi, n_iter=30_001), places=12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import math
+import unittest
+
+import numpy as np
+
+import integrate_shm
+from integrate_batch import integrate_batch
+from integrate_pool import IntegrationPool
+from integrate_processes import integrate_processed
+from integrate_py import integrate
+
+
+def _fails(x):
+    raise ArithmeticError("boom")
+
+
+class TestSharedMemory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = IntegrationPool("process", max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_matches_pickled_version(self):
+        ref = integrate_processed(math.sin, 0.0, math.pi, n_jobs=3, n_iter=30_001)
+        val = integrate_processed(math.sin, 0.0, math.pi, n_jobs=3, n_iter=30_001, shared_memory=True)
+        self.assertEqual(val, ref)
+
+    def test_chunked_and_vectorized_on_pool(self):
+        ref = integrate(math.sin, 0.0, math.pi, n_iter=50_000)
+        val = integrate_shm.integrate_processed_shm(
+            math.sin, 0.0, math.pi, n_iter=50_000, chunk_size=3000, pool=self.pool
+        )
+        self.assertAlmostEqual(val, ref, places=12)
+        val = integrate_shm.integrate_processed_shm(
+            np.sin, 0.0, math.pi, n_iter=50_000, vectorized=True, pool=self.pool
+        )
+        self.assertAlmostEqual(val, ref, places=12)
+
+    def test_blocks_are_reused(self):
+        integrate_shm.integrate_processed_shm(math.cos, 0.0, 1.0, n_iter=1000, pool=self.pool)
+        free = {shm.name for shm in integrate_shm._free_blocks}
+        self.assertTrue(free)
+        integrate_shm.integrate_processed_shm(math.cos, 0.0, 1.0, n_iter=1000, pool=self.pool)
+        self.assertEqual({shm.name for shm in integrate_shm._free_blocks}, free)
+
+    def test_worker_error_is_raised(self):
+        with self.assertRaises(ArithmeticError):
+            integrate_shm.integrate_processed_shm(_fails, 0.0, 1.0, n_iter=100, pool=self.pool)
+        # the block went back to the free list and is usable
+        val = integrate_shm.integrate_processed_shm(math.cos, 0.0, math.pi / 2, n_iter=100_000, pool=self.pool)
+        self.assertAlmostEqual(val, 1.0, places=4)
+
+    def test_batch_through_shared_memory(self):
+        a = np.linspace(0.0, 1.0, 50)
+        powers = np.arange(50, dtype=float)[:, None] % 4
+        ref = integrate_batch(math.pow, a, a + 1.0, powers, n_iter=500, backend="serial")
+        res = integrate_batch(math.pow, a, a + 1.0, powers, n_iter=500, backend="processes",
+                              pool=self.pool, shared_memory=True)
+        np.testing.assert_array_equal(res, ref)
+        res = integrate_batch("poly", a, 2.0, [1.0, 0.0], n_iter=500, backend="processes",
+                              pool=self.pool, shared_memory=True)
+        np.testing.assert_allclose(res, (4.0 - a * a) / 2, atol=1e-2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from integrate_pool import IntegrationPool
+from integrate_stream import integrate_samples, integrate_samples_parallel, load_samples
+
+
+def _simpson_reference(y, dx):
+    """Composite Simpson, 3/8 rule on the last three intervals for an odd interval count."""
+    n = len(y)
+    if n % 2 == 1:
+        return dx / 3 * (y[0] + y[-1] + 4 * y[1:-1:2].sum() + 2 * y[2:-1:2].sum())
+    head = y[:n - 3]
+    t = y[n - 4:]
+    return _simpson_reference(head, dx) + 3 * dx / 8 * (t[0] + 3 * t[1] + 3 * t[2] + t[3])
+
+
+class TestIntegrateSamples(unittest.TestCase):
+    def setUp(self):
+        self.dx = math.pi / 1000
+
+    def samples(self, n):
+        return np.sin(np.arange(n) * self.dx)
+
+    def test_trapezoid(self):
+        for n in (2, 3, 10, 1001, 5000):
+            y = self.samples(n)
+            ref = self.dx * (y.sum() - 0.5 * (y[0] + y[-1]))
+            for chunk_size in (1, 3, 64, 10_000):
+                with self.subTest(n=n, chunk_size=chunk_size):
+                    self.assertAlmostEqual(integrate_samples(y, self.dx, chunk_size=chunk_size), ref, places=12)
+
+    def test_simpson_any_sample_count(self):
+        for n in (3, 4, 5, 6, 7, 1000, 1001):
+            y = self.samples(n)
+            ref = _simpson_reference(y, self.dx)
+            for chunk_size in (1, 2, 3, 7, 10_000):
+                with self.subTest(n=n, chunk_size=chunk_size):
+                    val = integrate_samples(iter(y.tolist()), self.dx, rule="simpson", chunk_size=chunk_size)
+                    self.assertAlmostEqual(val, ref, places=12)
+        # exact for cubics
+        x = np.arange(8) * 0.5
+        self.assertAlmostEqual(integrate_samples(x ** 3, 0.5, rule="simpson"), 3.5 ** 4 / 4, places=12)
+        # one interval: trapezoid
+        self.assertEqual(integrate_samples([1.0, 3.0], 2.0, rule="simpson"), 4.0)
+
+    def test_generator_is_consumed_once(self):
+        n = 100_001
+        gen = (math.sin(i * math.pi / (n - 1)) for i in range(n))
+        val = integrate_samples(gen, math.pi / (n - 1), rule="simpson", chunk_size=4096, summation="kahan")
+        self.assertAlmostEqual(val, 2.0, places=12)
+        self.assertEqual(list(gen), [])
+
+    def test_summation_modes(self):
+        y = self.samples(1001)
+        ref = integrate_samples(y, self.dx, chunk_size=10)
+        for summation in ("kahan", "pairwise"):
+            self.assertAlmostEqual(integrate_samples(y, self.dx, chunk_size=10, summation=summation), ref, places=13)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            integrate_samples([1.0])
+        with self.assertRaises(ValueError):
+            integrate_samples([1.0, 2.0], rule="midpoint")
+        with self.assertRaises(ValueError):
+            integrate_samples([1.0, 2.0], chunk_size=0)
+        with self.assertRaises(ValueError):
+            integrate_samples(np.ones((2, 2)))
+
+
+class TestMemoryMappedSamples(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.n = 200_001
+        cls.dx = math.pi / (cls.n - 1)
+        y = np.sin(np.arange(cls.n) * cls.dx)
+        cls.npy = os.path.join(cls.tmp.name, "samples.npy")
+        cls.raw = os.path.join(cls.tmp.name, "samples.f32")
+        np.save(cls.npy, y)
+        y.astype(np.float32).tofile(cls.raw)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_load_samples(self):
+        self.assertIsInstance(load_samples(self.npy), np.memmap)
+        self.assertEqual(load_samples(self.raw, np.float32).shape, (self.n,))
+
+    def test_serial_and_parallel_agree(self):
+        ref = integrate_samples(self.npy, self.dx, rule="simpson", chunk_size=10_000)
+        self.assertAlmostEqual(ref, 2.0, places=12)
+        for backend in ("serial", "threads", "processes"):
+            for n_jobs in (1, 3):
+                with self.subTest(backend=backend, n_jobs=n_jobs):
+                    val = integrate_samples_parallel(
+                        self.npy, self.dx, rule="simpson", n_jobs=n_jobs, backend=backend, chunk_size=10_000
+                    )
+                    self.assertAlmostEqual(val, ref, places=12)
+
+    def test_raw_file_and_pool(self):
+        with IntegrationPool("process", max_workers=2) as pool:
+            val = integrate_samples_parallel(self.raw, self.dx, n_jobs=2, backend="processes",
+                                             pool=pool, dtype=np.float32)
+        self.assertAlmostEqual(val, 2.0, places=5)
+        # arrays are accepted as well
+        y = load_samples(self.npy)
+        self.assertAlmostEqual(integrate_samples_parallel(y, self.dx, n_jobs=4), 2.0, places=9)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            integrate_samples_parallel(np.ones(1))
+        with self.assertRaises(ValueError):
+            integrate_samples_parallel(np.ones(10), n_jobs=0)
+        with self.assertRaises(ValueError):
+            integrate_samples_parallel(np.ones(10), backend="gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
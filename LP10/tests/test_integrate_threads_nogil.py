@@ -0,0 +1,121 @@
+import math
+import unittest
+
+import cyintegrate
+import cyintegrate_nogil
+from integrate_threads_nogil import integrate_sin_threaded_nogil, integrate_threaded_nogil
+
+
+class TestIntegrandRegistry(unittest.TestCase):
+    def test_builtin_integrands(self):
+        self.assertTrue({"sin", "cos", "exp", "poly"} <= set(cyintegrate_nogil.registered_integrands()))
+        self.assertAlmostEqual(cyintegrate_nogil.call_integrand("exp", 1.0), math.e)
+        # x^2 + 2x + 1 at x = 2
+        self.assertEqual(cyintegrate_nogil.call_integrand("poly", 2.0, [1.0, 2.0, 1.0]), 9.0)
+
+    def test_register_and_unregister(self):
+        capsule = cyintegrate_nogil.get_integrand("cos")
+        cyintegrate_nogil.register_integrand("my_cos", capsule)
+        try:
+            with self.assertRaises(ValueError):
+                cyintegrate_nogil.register_integrand("my_cos", capsule)
+            val = cyintegrate_nogil.integrate_nogil("my_cos", 0.0, math.pi / 2, 100_000)
+            self.assertAlmostEqual(val, 1.0, places=4)
+        finally:
+            cyintegrate_nogil.unregister_integrand("my_cos")
+        self.assertNotIn("my_cos", cyintegrate_nogil.registered_integrands())
+
+    def test_register_rejects_foreign_objects(self):
+        with self.assertRaises(TypeError):
+            cyintegrate_nogil.register_integrand("bad", object())
+
+    def test_unknown_integrand(self):
+        with self.assertRaises(KeyError):
+            cyintegrate_nogil.integrate_nogil("no_such_function", 0.0, 1.0)
+        with self.assertRaises(KeyError):
+            integrate_threaded_nogil("no_such_function", 0.0, 1.0)
+
+
+class TestIntegrateThreadedNogil(unittest.TestCase):
+    def test_registered_functions(self):
+        cases = [
+            ("sin", None, 0.0, math.pi, 2.0),
+            ("cos", None, 0.0, math.pi / 2, 1.0),
+            ("exp", None, 0.0, 1.0, math.e - 1.0),
+            ("poly", [1.0, 2.0, 1.0], 0.0, 1.0, 7.0 / 3.0),
+        ]
+        for name, params, a, b, exact in cases:
+            val = integrate_threaded_nogil(name, a, b, params=params, n_jobs=4, n_iter=400_000)
+            self.assertAlmostEqual(val, exact, places=4, msg=name)
+
+    def test_sin_front_end_is_unchanged(self):
+        val = integrate_sin_threaded_nogil(0.0, math.pi, n_jobs=3, n_iter=300_000)
+        self.assertAlmostEqual(val, 2.0, places=4)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            integrate_threaded_nogil("sin", 0.0, 1.0, n_jobs=0)
+        with self.assertRaises(ValueError):
+            integrate_threaded_nogil("sin", 0.0, 1.0, n_iter=0)
+
+
+class TestOpenMPKernel(unittest.TestCase):
+    def test_matches_serial_kernel(self):
+        for n_threads in (0, 1, 3):
+            with self.subTest(n_threads=n_threads):
+                val = cyintegrate_nogil.integrate_nogil_parallel("sin", 0.0, math.pi, 100_003, n_threads=n_threads)
+                self.assertAlmostEqual(val, cyintegrate_nogil.integrate_nogil("sin", 0.0, math.pi, 100_003), places=12)
+
+    def test_params_and_summation(self):
+        val = cyintegrate_nogil.integrate_nogil_parallel(
+            "poly", 0.0, 1.0, 1_000_000, [1.0], n_threads=4, summation="kahan"
+        )
+        self.assertAlmostEqual(val, 1.0, places=14)
+        # more threads than points: every point is still integrated exactly once
+        self.assertAlmostEqual(cyintegrate_nogil.integrate_nogil_parallel("poly", 0.0, 1.0, 3, [1.0], n_threads=8), 1.0)
+
+    def test_invalid_arguments(self):
+        self.assertGreaterEqual(cyintegrate_nogil.openmp_max_threads(), 1)
+        with self.assertRaises(ValueError):
+            cyintegrate_nogil.integrate_nogil_parallel("sin", 0.0, 1.0, 0)
+        with self.assertRaises(ValueError):
+            cyintegrate_nogil.integrate_nogil_parallel("sin", 0.0, 1.0, 10, n_threads=-1)
+        with self.assertRaises(KeyError):
+            cyintegrate_nogil.integrate_nogil_parallel("no_such_integrand", 0.0, 1.0)
+
+
+class TestFastKernels(unittest.TestCase):
+    def test_matches_reference(self):
+        # n_iter not divisible by the block size exercises the tail loop
+        for name, params in (("sin", None), ("cos", None), ("exp", None), ("poly", [1.0, -2.0, 3.0])):
+            for n_iter in (7, 1_000, 100_003):
+                with self.subTest(name=name, n_iter=n_iter):
+                    ref = cyintegrate_nogil.integrate_nogil(name, -0.5, 2.0, n_iter, params, summation="kahan")
+                    val = cyintegrate_nogil.integrate_nogil(name, -0.5, 2.0, n_iter, params, fast=True)
+                    self.assertAlmostEqual(val, ref, delta=1e-12 * max(1.0, abs(ref)))
+
+    def test_cython_sin_cos(self):
+        for n_iter in (10, 1_000_001):
+            with self.subTest(n_iter=n_iter):
+                self.assertAlmostEqual(
+                    cyintegrate.integrate_cy_sin(0.0, math.pi, n_iter, fast=True),
+                    cyintegrate.integrate_cy_sin(0.0, math.pi, n_iter), places=12)
+                self.assertAlmostEqual(
+                    cyintegrate.integrate_cy_cos(0.0, 3.0, n_iter, fast=True),
+                    cyintegrate.integrate_cy_cos(0.0, 3.0, n_iter), places=12)
+
+    def test_threaded(self):
+        val = integrate_threaded_nogil("sin", 0.0, math.pi, n_jobs=3, n_iter=300_001, fast=True)
+        self.assertAlmostEqual(val, integrate_sin_threaded_nogil(0.0, math.pi, n_jobs=3, n_iter=300_001), places=12)
+
+    def test_requires_naive_summation(self):
+        with self.assertRaises(ValueError):
+            cyintegrate_nogil.integrate_nogil("sin", 0.0, 1.0, 100, fast=True, summation="kahan")
+        with self.assertRaises(ValueError):
+            cyintegrate.integrate_cy_sin(0.0, 1.0, 100, summation="pairwise", fast=True)
+        with self.assertRaises(ValueError):
+            integrate_threaded_nogil("sin", 0.0, 1.0, n_iter=100, fast=True, summation="kahan")
+
+
+if __name__ == "__main__":
+    unittest.main()
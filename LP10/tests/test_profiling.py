@@ -0,0 +1,70 @@
+import json
+import math
+import os
+import unittest
+
+from integrate_pool import IntegrationPool
+from integrate_processes import integrate_processed
+from integrate_threads import integrate_threaded
+from profiling import PHASES, IntegrationProfile, JobStats, WorkerStats
+
+
+class TestIntegrationProfile(unittest.TestCase):
+    def test_threaded(self):
+        prof = IntegrationProfile()
+        ref = integrate_threaded(math.sin, 0.0, math.pi, n_jobs=3, n_iter=30_001)
+        val = integrate_threaded(math.sin, 0.0, math.pi, n_jobs=3, n_iter=30_001, profile=prof)
+        self.assertEqual(val, ref)
+        self.assertEqual(prof.calls, 1)
+        self.assertEqual(set(prof.phases), set(PHASES) - {"pickle"})
+        self.assertEqual([job.n_points for job in prof.jobs], [10_001, 10_000, 10_000])
+        for job in prof.jobs:
+            self.assertIsInstance(job, JobStats)
+            self.assertTrue(job.worker.startswith(f"{os.getpid()}/"))
+            self.assertGreaterEqual(job.turnaround, job.kernel_time)
+        self.assertAlmostEqual(prof.total, sum(prof.phases.values()))
+        self.assertGreater(prof.phases["compute"], 0.0)
+
+    def test_processes_on_pool(self):
+        prof = IntegrationProfile()
+        with IntegrationPool("process", max_workers=2) as pool:
+            for _ in range(2):
+                integrate_processed(math.sin, 0.0, math.pi, n_jobs=2, n_iter=20_000,
+                                    pool=pool, chunk_size=5000, profile=prof)
+        self.assertEqual(prof.calls, 2)
+        self.assertEqual(len(prof.jobs), 8)
+        self.assertGreater(prof.pickled_bytes, 0)
+        self.assertIn("pickle", prof.phases)
+        # persistent pool: nothing is shut down
+        self.assertLess(prof.phases["shutdown"], 0.01)
+        workers = prof.workers()
+        self.assertTrue(all(not name.startswith(f"{os.getpid()}/") for name in workers))
+        self.assertEqual(sum(w.n_points for w in workers.values()), 40_000)
+        self.assertIsInstance(next(iter(workers.values())), WorkerStats)
+        self.assertAlmostEqual(prof.kernel_time, sum(w.kernel_time for w in workers.values()))
+
+    def test_shared_memory_is_timed_as_a_whole(self):
+        prof = IntegrationProfile()
+        integrate_processed(math.sin, 0.0, 1.0, n_jobs=2, n_iter=1000, shared_memory=True, profile=prof)
+        self.assertEqual(prof.calls, 1)
+        self.assertEqual(list(prof.phases), ["compute"])
+
+    def test_report_and_reset(self):
+        prof = IntegrationProfile()
+        integrate_threaded(abs, -1.0, 1.0, n_jobs=2, n_iter=100, profile=prof)
+        data = json.loads(json.dumps(prof.to_dict()))
+        self.assertEqual(data["calls"], 1)
+        self.assertEqual(len(data["jobs"]), 2)
+        self.assertIn("compute", prof.format())
+        prof.reset()
+        self.assertEqual((prof.calls, prof.jobs, prof.phases), (0, [], {}))
+
+    def test_errors_are_propagated(self):
+        prof = IntegrationProfile()
+        with self.assertRaises(ZeroDivisionError):
+            integrate_threaded(lambda x: 1 / 0, 0.0, 1.0, n_jobs=2, n_iter=10, profile=prof)
+        self.assertEqual(prof.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
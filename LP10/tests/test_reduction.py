@@ -0,0 +1,92 @@
+import math
+import unittest
+
+import cyintegrate
+import cyintegrate_nogil
+from integrate_np import integrate_vectorized
+from integrate_py import integrate
+from integrate_threads import integrate_threaded
+from integrate_threads_nogil import integrate_threaded_nogil
+from reduction import check_summation, kahan_sum, pairwise_sum, tree_sum
+
+
+class TestReduction(unittest.TestCase):
+    def test_kahan_is_more_accurate_than_naive(self):
+        values = [0.1] * 100_000
+        naive = 0.0
+        for v in values:
+            naive += v
+        self.assertLess(abs(kahan_sum(values) - 10_000.0), abs(naive - 10_000.0))
+        self.assertEqual(kahan_sum(values), math.fsum(values))
+
+    def test_pairwise_matches_fsum(self):
+        values = [1.0 / (i + 1) for i in range(10_000)]
+        self.assertAlmostEqual(pairwise_sum(values), math.fsum(values), places=12)
+        self.assertAlmostEqual(pairwise_sum(values, block=1), math.fsum(values), places=12)
+        self.assertEqual(pairwise_sum([]), 0.0)
+
+    def test_tree_sum_depends_only_on_order(self):
+        values = [1e16, 1.0, -1e16, 1.0, 3.0]
+        self.assertEqual(tree_sum(values), tree_sum(list(values)))
+        self.assertEqual(tree_sum([2.5]), 2.5)
+
+    def test_unknown_mode(self):
+        self.assertEqual(check_summation("kahan"), 1)
+        with self.assertRaises(ValueError):
+            check_summation("fast")
+        with self.assertRaises(ValueError):
+            integrate(math.sin, 0.0, 1.0, summation="fast")
+        with self.assertRaises(ValueError):
+            cyintegrate.integrate_cy_sin(0.0, 1.0, 10, summation="fast")
+        with self.assertRaises(ValueError):
+            cyintegrate_nogil.integrate_nogil("sin", 0.0, 1.0, 10, summation="fast")
+
+
+class TestSummationModes(unittest.TestCase):
+    N = 200_000
+
+    def test_python_modes_agree(self):
+        naive = integrate(math.sin, 0.0, math.pi, n_iter=self.N)
+        for mode in ("kahan", "pairwise"):
+            with self.subTest(mode=mode):
+                self.assertAlmostEqual(integrate(math.sin, 0.0, math.pi, n_iter=self.N, summation=mode), naive, places=9)
+
+    def test_vectorized_modes_agree(self):
+        import numpy as np
+
+        for mode in ("naive", "kahan", "pairwise"):
+            with self.subTest(mode=mode):
+                val = integrate_vectorized(np.sin, 0.0, math.pi, n_iter=self.N, chunk_size=1000, summation=mode)
+                self.assertAlmostEqual(val, 2.0, places=6)
+
+    def test_cython_modes_match_python(self):
+        for mode in ("naive", "kahan", "pairwise"):
+            with self.subTest(mode=mode):
+                ref = integrate(math.cos, 0.0, 1.0, n_iter=self.N, summation="kahan")
+                self.assertAlmostEqual(cyintegrate.integrate_cy_cos(0.0, 1.0, self.N, summation=mode), ref, places=10)
+                self.assertAlmostEqual(
+                    cyintegrate_nogil.integrate_nogil("cos", 0.0, 1.0, self.N, summation=mode), ref, places=10
+                )
+
+    def test_compensated_c_kernels_beat_naive(self):
+        # f(x) = 1 on [0, 1]: exact answer is 1, naive accumulation of step drifts
+        n = 10_000_000
+        naive = cyintegrate_nogil.integrate_nogil("poly", 0.0, 1.0, n, [1.0])
+        for mode in ("kahan", "pairwise"):
+            with self.subTest(mode=mode):
+                val = cyintegrate_nogil.integrate_nogil("poly", 0.0, 1.0, n, [1.0], summation=mode)
+                self.assertLessEqual(abs(val - 1.0), abs(naive - 1.0))
+                self.assertAlmostEqual(val, 1.0, places=14)
+
+    def test_parallel_results_are_reproducible(self):
+        runs = {integrate_threaded(math.sin, 0.0, math.pi, n_jobs=4, n_iter=40_000) for _ in range(3)}
+        self.assertEqual(len(runs), 1)
+        runs = {
+            integrate_threaded_nogil("sin", 0.0, math.pi, n_jobs=4, n_iter=400_000, summation="kahan")
+            for _ in range(3)
+        }
+        self.assertEqual(len(runs), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
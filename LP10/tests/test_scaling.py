@@ -0,0 +1,55 @@
+import time
+import unittest
+
+import benchmark
+from scaling import AmdahlFit, fit_amdahl, fit_gustafson, karp_flatt, recommend_jobs, strong_scaling, weak_scaling
+
+
+def _amdahl_backend(n_iter, n_jobs, pool):
+    # 20% serial work, the rest divides perfectly between workers
+    time.sleep(n_iter * 1e-7 * (0.2 + 0.8 / n_jobs))
+
+
+class TestFits(unittest.TestCase):
+    def test_amdahl_recovers_serial_fraction(self):
+        jobs = [1, 2, 4, 8, 16]
+        fit = AmdahlFit("b", 1, 0.1)
+        self.assertAlmostEqual(fit_amdahl(jobs, [fit.speedup(p) for p in jobs]), 0.1)
+        self.assertAlmostEqual(fit.max_speedup, 10.0)
+        self.assertEqual(fit_amdahl([1, 2], [1.0, 2.0]), 0.0)
+        # slower with more workers -> clamped to fully serial
+        self.assertEqual(fit_amdahl([1, 2], [1.0, 0.5]), 1.0)
+        with self.assertRaises(ValueError):
+            fit_amdahl([1], [1.0])
+
+    def test_gustafson_and_karp_flatt(self):
+        jobs = [1, 2, 4, 8]
+        self.assertAlmostEqual(fit_gustafson(jobs, [p - 0.3 * (p - 1) for p in jobs]), 0.3)
+        self.assertIsNone(karp_flatt(1.0, 1))
+        self.assertAlmostEqual(karp_flatt(AmdahlFit("b", 1, 0.2).speedup(4), 4), 0.2)
+
+
+class TestSweeps(unittest.TestCase):
+    def setUp(self):
+        benchmark.register_backend("fake_amdahl", _amdahl_backend, parallel=True)
+
+    def tearDown(self):
+        del benchmark.BACKENDS["fake_amdahl"]
+
+    def test_strong_scaling(self):
+        points, fit = strong_scaling("fake_amdahl", 200_000, [4, 2], repeat=3, warmup=0)
+        self.assertEqual([pt.n_jobs for pt in points], [1, 2, 4])
+        self.assertEqual(points[0].speedup, 1.0)
+        self.assertGreater(points[2].speedup, 1.5)
+        self.assertAlmostEqual(fit.serial_fraction, 0.2, delta=0.1)
+        self.assertEqual(recommend_jobs(points, 0.7), 2)
+
+    def test_weak_scaling(self):
+        points, fit = weak_scaling("fake_amdahl", 100_000, [2], repeat=2, warmup=0)
+        self.assertEqual([pt.n_iter for pt in points], [100_000, 200_000])
+        self.assertIsNotNone(fit)
+        self.assertGreaterEqual(fit.alpha, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+from io import BytesIO
+from typing import NamedTuple
+from xml.etree import ElementTree as ET
+
+
+class Valute(NamedTuple):
+    """One <Valute> entry of the CBR daily document."""
+    char_code: str
+    num_code: str
+    name: str
+    nominal: int
+    value: float | None  # rubles per `nominal` units, None if Value is not a number
+    text: str  # Value as published, e.g. "93,52"
+
+
+def _number(text: str) -> float | None:
+    """Convert "93,52" to 93.52, None if the text is not a number."""
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def parse_valutes(content: bytes) -> dict:
+    """Parse CBR XML document into dict keyed by CharCode in a single pass.
+    The document is read incrementally with iterparse; every <Valute> is
+    converted when its end tag is reached and then cleared, so the tree
+    is never built completely.
+    Keyword arguments:
+        content - XML document (bytes) returned by XML_daily.asp
+    Returns:
+        Dictionary CharCode = Valute. For example:
+        {"USD": Valute("USD", "840", "Доллар США", 1, 93.52, "93,52")}
+    Raises:
+        xml.etree.ElementTree.ParseError if the document is not valid XML
+    """
+    valutes = {}
+    for _, elem in ET.iterparse(BytesIO(content), events=("end",)):
+        if elem.tag != "Valute":
+            continue
+        # children are complete when the parent's end tag is reached
+        fields = {child.tag: (child.text or "").strip() for child in elem}
+        char_code = fields.get("CharCode", "")
+        if char_code:
+            text = fields.get("Value", "")
+            nominal = fields.get("Nominal", "1")
+            valutes[char_code] = Valute(
+                char_code=char_code,
+                num_code=fields.get("NumCode", ""),
+                name=fields.get("Name", ""),
+                nominal=int(nominal) if nominal.isdigit() else 1,
+                value=_number(text),
+                text=text,
+            )
+        elem.clear()
+    return valutes
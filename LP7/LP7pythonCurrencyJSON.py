@@ -5,6 +5,7 @@ import functools
 import logging
 import traceback
 from typing import Callable, Any
+from LP7pythonRateClient import get_client
 
 def logger(func=None, *, handle=sys.stdout):
     """Parameterizable logging decorator - logging function's calls/results/exceptions
@@ -142,7 +143,7 @@ def get_currencies(currency_codes: list,
 
     # trying to send GET-request to CBR
     try:
-        response = requests.get(url, timeout=10)
+        response = get_client().get(url, timeout=10)
         response.raise_for_status()
     # processing exception
     except requests.exceptions.RequestException as e:
@@ -1,10 +1,11 @@
 import requests
-from xml.etree import ElementTree as ET
 import sys
 import functools
 import logging
 import traceback
 from typing import Callable, Any
+from LP7pythonRateClient import get_client
+from LP7pythonCbrParser import parse_valutes
 
 def logger(func=None, *, handle=sys.stdout):
     """Parameterizable logging decorator - logging function's calls/results/exceptions
@@ -139,18 +140,18 @@ def get_currencies(currency_codes: list,
     dict = {}
     # trying to send GET-request to cbr
     try:
-        response = requests.get(url, timeout=10)
+        response = get_client().get(url, timeout=10)
         response.raise_for_status()
     # processing exception
     except requests.exceptions.RequestException as e:
         raise requests.exceptions.ConnectionError(f"Ошибка при запросе к API: {e}")
     else:
-        # from XML bytes to XML-node for processing XML
-        root = ET.fromstring(response.content)
+        # one pass over the document, then lookups by CharCode
+        valutes = parse_valutes(response.content)
         # parsing codes and forming code=value element into dict
         for code in currency_codes:
-            if root.find(f".//Valute[CharCode='{code}']/Value") is None:
+            if code not in valutes:
                 dict[code] = f"Код валюты '{code}' не найден."
             else:
-                dict[code] = root.find(f".//Valute[CharCode='{code}']/Value").text
+                dict[code] = valutes[code].text
         return dict
@@ -0,0 +1,72 @@
+import unittest
+from xml.etree import ElementTree as ET
+from LP7pythonCbrParser import parse_valutes
+
+class TestParseValutes(unittest.TestCase):
+
+    def test_full_document(self):
+        """Checking that every field of <Valute> is parsed."""
+
+        xml = """<?xml version="1.0" encoding="windows-1251"?>
+        <ValCurs Date="02.03.2024" name="Foreign Currency Market">
+            <Valute ID="R01235">
+                <NumCode>840</NumCode>
+                <CharCode>USD</CharCode>
+                <Nominal>1</Nominal>
+                <Name>Доллар США</Name>
+                <Value>91,3336</Value>
+            </Valute>
+            <Valute ID="R01820">
+                <NumCode>392</NumCode>
+                <CharCode>JPY</CharCode>
+                <Nominal>100</Nominal>
+                <Name>Японских иен</Name>
+                <Value>60,8650</Value>
+            </Valute>
+        </ValCurs>
+        """
+
+        valutes = parse_valutes(xml.encode("windows-1251"))
+
+        self.assertEqual(set(valutes), {"USD", "JPY"})
+        self.assertEqual(valutes["USD"].name, "Доллар США")
+        self.assertEqual(valutes["USD"].text, "91,3336")
+        self.assertEqual(valutes["JPY"].num_code, "392")
+        self.assertEqual(valutes["JPY"].nominal, 100)
+        self.assertAlmostEqual(valutes["JPY"].value, 60.865)
+
+    def test_missing_fields(self):
+        """Checking defaults for missing Nominal/Name/NumCode and a non-numeric Value."""
+
+        xml = """
+        <ValCurs>
+            <Valute>
+                <CharCode>USD</CharCode>
+                <Value>93,52</Value>
+            </Valute>
+            <Valute>
+                <CharCode>XDR</CharCode>
+                <Value>-</Value>
+            </Valute>
+            <Valute>
+                <Value>1,0</Value>
+            </Valute>
+        </ValCurs>
+        """
+
+        valutes = parse_valutes(xml.encode("utf-8"))
+
+        self.assertEqual(set(valutes), {"USD", "XDR"})
+        self.assertEqual(valutes["USD"].nominal, 1)
+        self.assertEqual(valutes["USD"].value, 93.52)
+        self.assertEqual(valutes["USD"].name, "")
+        self.assertIsNone(valutes["XDR"].value)
+
+    def test_invalid_document(self):
+        """Checking that broken XML raises ParseError."""
+
+        with self.assertRaises(ET.ParseError):
+            parse_valutes(b"<ValCurs><Valute>")
+
+if __name__ == "__main__":
+    unittest.main()
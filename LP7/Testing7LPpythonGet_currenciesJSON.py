@@ -7,7 +7,7 @@ import io
 
 class TestGetCurrenciesJSON(unittest.TestCase):
 
-    @patch("LP7pythonCurrencyJSON.requests.get")
+    @patch("LP7pythonRateClient.RateClient.get")
     def test_real_values(self, mock_get):
         """Checking correct return of real currency."""
 
@@ -28,7 +28,7 @@ class TestGetCurrenciesJSON(unittest.TestCase):
         self.assertEqual(result["USD"], 93.52)
         self.assertEqual(result["EUR"], 101.20)
 
-    @patch("LP7pythonCurrencyJSON.requests.get")
+    @patch("LP7pythonRateClient.RateClient.get")
     def test_unknown_currency(self, mock_get):
         """Checking behavior when requesting a non-existent currency."""
 
@@ -43,7 +43,7 @@ class TestGetCurrenciesJSON(unittest.TestCase):
 
         self.assertEqual(result["ZZZ"], "Код валюты 'ZZZ' не найден.")
 
-    @patch("LP7pythonCurrencyJSON.requests.get")
+    @patch("LP7pythonRateClient.RateClient.get")
     def test_missing_valute_key(self, mock_get):
         """Checking behavior when JSON has no 'Valute' key."""
 
@@ -61,7 +61,7 @@ class TestGetCurrenciesJSON(unittest.TestCase):
         self.assertIn(KeyError, result)
         self.assertEqual(result[KeyError], "Ключа Valute не существует")
 
-    @patch("LP7pythonCurrencyJSON.requests.get")
+    @patch("LP7pythonRateClient.RateClient.get")
     def test_incorrect_json_format(self, mock_get):
         """Checking handling of ValueError (invalid JSON)."""
 
@@ -77,7 +77,7 @@ class TestGetCurrenciesJSON(unittest.TestCase):
         self.assertIn(ValueError, result)
         self.assertEqual(result[ValueError], "API вернул некорректный JSON")
 
-    @patch("LP7pythonCurrencyJSON.requests.get")
+    @patch("LP7pythonRateClient.RateClient.get")
     def test_connection_error(self, mock_get):
         """Check if ConnectionError is thrown when API is unavailable."""
 
@@ -3,6 +3,7 @@ from urllib.parse import urlparse, parse_qs
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from models import Author, App, User, Currency, User_Currency
 from utils.currencies_api import get_currencies
+from utils.rates_refresher import RatesRefresher
 
 # Jinja2 environment used for loading and rendering HTML templates.
 env = Environment(
@@ -41,6 +42,24 @@ subscriptions = [
     User_Currency("2", users[0], currencies[1])
 ]
 
+def update_rates() -> dict:
+    """Pull actual exchange rates into the `currencies` list.
+    Runs in the background refresher thread, not in request handlers.
+    Returns:
+        Dictionary with currency codes = values as returned by get_currencies
+    """
+    codes = [c.char_code for c in currencies]
+    rates = get_currencies(codes)
+
+    for c in currencies:
+        value = rates.get(c.char_code)
+        if value and value.replace(',', '.').replace('.', '', 1).isdigit():
+            c.value = float(value.replace(',', '.'))
+    return rates
+
+# Background refresh of currency rates every 5 minutes (started with the server).
+refresher = RatesRefresher(update_rates, interval=300)
+
 class MyHandler(BaseHTTPRequestHandler):
     """ HTTP request handler for the web application.
     This class routes incoming GET requests to the appropriate
@@ -119,21 +138,14 @@ class MyHandler(BaseHTTPRequestHandler):
         self.respond(html)
 
     def render_currencies(self) -> None:
-        """Render and send the currencies page with updated exchange rates.
-        Retrieves current exchange rates from an external API and updates
-        currency values before rendering the page.
+        """Render and send the currencies page with the latest exchange rates.
+        Rates are kept up to date by the background refresher, so the page
+        does not wait for the external API; the refresher status tells
+        when the rates were updated and whether they are stale.
         Returns:
             None
         """
-        codes = [c.char_code for c in currencies]
-        rates = get_currencies(codes)
-
-        for c in currencies:
-            value = rates.get(c.char_code)
-            if value and value.replace(',', '.').replace('.', '', 1).isdigit():
-                c.value = float(value.replace(',', '.'))
-
-        html = template_currencies.render(currencies=currencies)
+        html = template_currencies.render(currencies=currencies, status=refresher.status())
         self.respond(html)
 
     def render_author(self) -> None:
@@ -158,6 +170,7 @@ class MyHandler(BaseHTTPRequestHandler):
     
 #Starts the HTTP server on localhost at port 8080.
 if __name__ == "__main__":
+    refresher.start()
     server = HTTPServer(("localhost", 8080), MyHandler)
     print("Server started at http://localhost:8080")
     server.serve_forever()   
\ No newline at end of file
@@ -1,6 +1,7 @@
 import unittest
 from jinja2 import Environment, FileSystemLoader
 from models import User, Currency, Author
+from utils.rates_refresher import RefreshStatus
 
 
 class TestTemplates(unittest.TestCase):
@@ -49,6 +50,25 @@ class TestTemplates(unittest.TestCase):
         self.assertIn("75.0", html)
         self.assertIn("80.0", html)
 
+    # checks rendering of a fresh rates status in currencies.html
+    def test_currencies_template_fresh_status(self):
+        template = self.env.get_template("currencies.html")
+        status = RefreshStatus("12:30:00", 42.7, False, None)
+        html = template.render(currencies=[], status=status)
+
+        self.assertIn("12:30:00", html)
+        self.assertIn("42 с назад", html)
+        self.assertNotIn("устаревшими", html)
+
+    # checks rendering of a stale rates status with the last error
+    def test_currencies_template_stale_status(self):
+        template = self.env.get_template("currencies.html")
+        status = RefreshStatus("12:30:00", 900.0, True, "Ошибка при запросе к API")
+        html = template.render(currencies=[], status=status)
+
+        self.assertIn("устаревшими", html)
+        self.assertIn("Ошибка при запросе к API", html)
+
     # checks conditional rendering when user has no currency subscriptions
     def test_user_template_without_currencies(self):
         template = self.env.get_template("user.html")
@@ -1,5 +1,6 @@
 import requests
 from xml.etree import ElementTree as ET
+from utils.rate_client import get_client
 
 def get_currencies(currency_codes: list, 
                    url: str = 'https://www.cbr.ru/scripts/XML_daily.asp') -> dict:
@@ -15,7 +16,7 @@ def get_currencies(currency_codes: list,
     dict = {}
     # trying to send GET-request to cbr
     try:
-        response = requests.get(url, timeout=10)
+        response = get_client().get(url, timeout=10)
         response.raise_for_status()
     # processing exception
     except requests.exceptions.RequestException as e:
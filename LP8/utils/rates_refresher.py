@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Callable, NamedTuple
+
+
+class RefreshStatus(NamedTuple):
+    """What a page shows about the freshness of the rates."""
+    updated_at: str | None  # local time of the last successful refresh, "HH:MM:SS"
+    age: float | None  # seconds since that refresh, None before the first one
+    stale: bool  # never refreshed or older than `stale_after`
+    error: str | None  # message of the last failed attempt, None after a success
+
+
+class RatesRefresher:
+    """
+    Runs a rate update job in a background thread every `interval` seconds.
+    - page handlers never wait for the CBR API: they read the store the job
+      writes to and show `status()` next to it
+    - a failed job keeps the previous data; the error is reported by `status()`
+      and the job is retried on the next tick
+    - the thread is a daemon and does not keep the server process alive
+    """
+
+    def __init__(self, job: Callable[[], object], interval: float = 300.0,
+                 stale_after: float | None = None, clock: Callable[[], float] = time.time):
+        """
+        Keyword arguments:
+            job - callable pulling the rates into the store; its result is kept in `result`
+            interval - seconds between two runs of `job`
+            stale_after - age in seconds after which the data is reported as stale,
+                defaults to two intervals
+            clock - time source (seconds since the epoch)
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.job = job
+        self.interval = interval
+        self.stale_after = stale_after if stale_after is not None else 2 * interval
+        self.clock = clock
+        self.result = None
+        self.updated_at: float | None = None
+        self.error: str | None = None
+        self.refreshes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        # every start() gets its own stop event: a thread that is still
+        # finishing a job after stop() exits on its own event
+        self._stop: threading.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> bool:
+        """Run the job once in the calling thread.
+        Returns:
+            True if the job succeeded
+        """
+        with self._lock:
+            try:
+                result = self.job()
+            # the refresher thread must survive any failure of the job
+            except Exception as e:
+                self.failures += 1
+                self.error = str(e) or type(e).__name__
+                return False
+            self.result = result
+            self.updated_at = self.clock()
+            self.error = None
+            self.refreshes += 1
+            return True
+
+    def _run(self, stop: threading.Event, previous: threading.Thread | None) -> None:
+        if previous is not None:
+            # a thread stopped during a long job: let it finish first
+            previous.join()
+        while not stop.is_set():
+            self.refresh()
+            stop.wait(self.interval)
+
+    @property
+    def running(self) -> bool:
+        """The background thread is alive and has not been asked to stop."""
+        return (self._thread is not None and self._thread.is_alive()
+                and self._stop is not None and not self._stop.is_set())
+
+    def start(self) -> None:
+        """Start the background thread; the first refresh runs immediately."""
+        if self.running:
+            return
+        previous = self._thread if self._thread is not None and self._thread.is_alive() else None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop, previous),
+                                        name="rates-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> bool:
+        """Stop the background thread, waiting for a running job up to `timeout` seconds.
+        Returns:
+            True if the thread has exited; otherwise it exits after its job
+        """
+        if self._stop is not None:
+            self._stop.set()
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
+
+    def age(self) -> float | None:
+        """Seconds since the last successful refresh, None before the first one."""
+        return None if self.updated_at is None else self.clock() - self.updated_at
+
+    def status(self) -> RefreshStatus:
+        """Freshness of the data, without waiting for a running job."""
+        updated_at, error = self.updated_at, self.error
+        if updated_at is None:
+            return RefreshStatus(None, None, True, error)
+        age = max(self.clock() - updated_at, 0.0)
+        return RefreshStatus(time.strftime("%H:%M:%S", time.localtime(updated_at)), age,
+                             age > self.stale_after, error)
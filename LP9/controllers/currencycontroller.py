@@ -1,5 +1,6 @@
 from controllers.databasecontroller import CurrencyRatesCRUD
 from utils.currencies_api import get_currencies
+from utils.rates_cache import RatesCache, get_cache
 
 
 class CurrencyController:
@@ -60,6 +61,28 @@ class CurrencyController:
         })
 
 
+    def refresh_rates(self, cache: RatesCache | None = None) -> int:
+        """
+        Pull actual rates of all stored currencies into the database.
+        Used as the job of the background RatesRefresher.
+        Args:
+            cache: RatesCache to revalidate, defaults to the shared CBR cache
+        Returns:
+            Number of updated currencies
+        Raises:
+            requests.exceptions.ConnectionError if the CBR document
+            cannot be fetched or revalidated
+        """
+        cache = cache or get_cache()
+        rates = cache.snapshot(force=True).rates
+        values = {}
+        for currency in self.crud.read_all():
+            rate = rates.get(currency["char_code"])
+            if rate is not None and rate.value is not None:
+                values[currency["char_code"]] = rate.value
+        return self.crud.update_many(values) if values else 0
+
+
     def update_currency(self, char_code: str, value: float) -> None:
         """
         Update currency exchange rate.
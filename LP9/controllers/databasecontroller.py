@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 import sqlite3
+import threading
 
 
 class DatabaseController:
@@ -8,14 +11,20 @@ class DatabaseController:
     - creates database connection
     - initializes tables
     - does NOT contain business logic
+
+    The connection may be used from several server threads: every
+    statement is executed under `lock`, which must be passed to
+    every CRUD controller working with `con`.
     """
 
     def __init__(self):
         """
         Initialize SQLite in-memory database and create tables.
         """
-        self.con = sqlite3.connect(':memory:')
+        # one in-memory database shared by all request threads
+        self.con = sqlite3.connect(':memory:', check_same_thread=False)
         self.con.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
         self._create_tables()
 
     def _create_tables(self) -> None:
@@ -66,13 +75,16 @@ class CurrencyRatesCRUD:
     - does NOT contain business logic
     """
 
-    def __init__(self, con: sqlite3.Connection):
+    def __init__(self, con: sqlite3.Connection, lock: threading.RLock | None = None):
         """
         Initialize CRUD controller with database connection.
         Args:
             con: SQLite connection object
+            lock: lock serializing access to `con` (DatabaseController.lock);
+                a private lock is created if omitted
         """
         self.con = con
+        self.lock = lock if lock is not None else threading.RLock()
 
     # CREATE
     def create_many(self, data: list[dict]) -> None:
@@ -85,8 +97,9 @@ class CurrencyRatesCRUD:
             INSERT INTO currency(num_code, char_code, name, value, nominal)
             VALUES(:num_code, :char_code, :name, :value, :nominal)
         """
-        self.con.executemany(sql, data)
-        self.con.commit()
+        with self.lock:
+            self.con.executemany(sql, data)
+            self.con.commit()
 
     def create_one(self, data: dict) -> None:
         """
@@ -103,8 +116,9 @@ class CurrencyRatesCRUD:
         Returns:
             List of currency dictionaries
         """
-        cur = self.con.execute("SELECT * FROM currency")
-        return [dict(row) for row in cur.fetchall()]
+        with self.lock:
+            cur = self.con.execute("SELECT * FROM currency")
+            return [dict(row) for row in cur.fetchall()]
 
     def read_by_code(self, char_code: str) -> dict | None:
         """
@@ -114,11 +128,12 @@ class CurrencyRatesCRUD:
         Returns:
             Currency dictionary or None if not found
         """
-        cur = self.con.execute(
-            "SELECT * FROM currency WHERE char_code = ?",
-            (char_code,)
-        )
-        row = cur.fetchone()
+        with self.lock:
+            cur = self.con.execute(
+                "SELECT * FROM currency WHERE char_code = ?",
+                (char_code,)
+            )
+            row = cur.fetchone()
         return dict(row) if row else None
 
     # UPDATE
@@ -129,11 +144,28 @@ class CurrencyRatesCRUD:
             char_code: currency CharCode
             value: new exchange rate
         """
-        self.con.execute(
-            "UPDATE currency SET value = ? WHERE char_code = ?",
-            (value, char_code)
-        )
-        self.con.commit()
+        with self.lock:
+            self.con.execute(
+                "UPDATE currency SET value = ? WHERE char_code = ?",
+                (value, char_code)
+            )
+            self.con.commit()
+
+    def update_many(self, values: dict[str, float]) -> int:
+        """
+        Update several currency values in one transaction.
+        Args:
+            values: CharCode -> new exchange rate
+        Returns:
+            Number of updated rows
+        """
+        with self.lock:
+            cur = self.con.executemany(
+                "UPDATE currency SET value = ? WHERE char_code = ?",
+                [(value, char_code) for char_code, value in values.items()]
+            )
+            self.con.commit()
+            return cur.rowcount
 
     # DELETE
     def delete(self, currency_id: int) -> None:
@@ -142,9 +174,10 @@ class CurrencyRatesCRUD:
         Args:
             currency_id: currency primary key
         """
-        self.con.execute(
-            "DELETE FROM currency WHERE id = ?",
-            (currency_id,)
-        )
-        self.con.commit()
+        with self.lock:
+            self.con.execute(
+                "DELETE FROM currency WHERE id = ?",
+                (currency_id,)
+            )
+            self.con.commit()
 
@@ -1,6 +1,7 @@
 from jinja2 import Environment
 from models import App, Author
 from controllers.currencycontroller import CurrencyController
+from utils.rates_refresher import RatesRefresher
 
 class PagesController:
     """
@@ -15,7 +16,8 @@ class PagesController:
         env: Environment,
         app: App,
         author: Author,
-        currency_controller: CurrencyController
+        currency_controller: CurrencyController,
+        refresher: RatesRefresher | None = None
     ):
         """
         Initialize pages controller.
@@ -24,11 +26,14 @@ class PagesController:
             app: application metadata
             author: application author
             currency_controller: currency business controller
+            refresher: background rate refresher whose status is shown
+                on the currencies page
         """
         self.env = env
         self.app = app
         self.author = author
         self.currency_controller = currency_controller
+        self.refresher = refresher
 
     def index(self) -> str:
         """
@@ -56,12 +61,15 @@ class PagesController:
     def currencies(self) -> str:
         """
         Render currencies list page.
+        Rates are read from the database as they are; they are kept
+        up to date by the refresher, not by this request.
         Returns:
             Rendered HTML string
         """
         template = self.env.get_template("currencies.html")
         currencies = self.currency_controller.list_currencies()
-        return template.render(currencies=currencies)
+        status = self.refresher.status() if self.refresher is not None else None
+        return template.render(currencies=currencies, status=status)
 
     def render_error(self, message: str) -> str:
         """
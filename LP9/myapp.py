@@ -1,4 +1,5 @@
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import argparse
+from http.server import HTTPServer
 from urllib.parse import urlparse, parse_qs
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
@@ -8,6 +9,8 @@ from models import Author, App
 from controllers.databasecontroller import DatabaseController, CurrencyRatesCRUD
 from controllers.currencycontroller import CurrencyController
 from controllers.pages import PagesController
+from utils.rates_refresher import RatesRefresher
+from utils.server import KeepAliveHandler, PooledHTTPServer
 
 # Jinja2 environment used for loading and rendering HTML templates.
 env = Environment(
@@ -23,7 +26,7 @@ app = App("CurrenciesListApp", "2.0", main_author)
 
 # Database controller initialization
 db = DatabaseController() 
-currency_crud = CurrencyRatesCRUD(db.con)
+currency_crud = CurrencyRatesCRUD(db.con, db.lock)
 
 # Pre-fill database with initial currencies
 currency_crud.create_many([
@@ -48,14 +51,25 @@ db.con.commit()
 # Business logic controllers
 currency_controller = CurrencyController(currency_crud)
 
+# Background refresh of the currency table (started by main())
+refresher = RatesRefresher(currency_controller.refresh_rates, interval=300)
+
 # Pages rendering controller
-pages = PagesController(env, app, main_author, currency_controller)
+pages = PagesController(env, app, main_author, currency_controller, refresher)
 
-class MyHandler(BaseHTTPRequestHandler):
+class MyHandler(KeepAliveHandler):
     """ HTTP request handler for the web application.
     This class routes incoming GET requests to the appropriate
     page-rendering methods and returns HTML responses.
+
+    Responses carry Content-Length, so HTTP/1.1 clients keep the
+    connection open between requests; an idle connection is closed
+    after `idle_timeout` seconds, or earlier if the server needs its
+    worker. `timeout` limits reading a single request.
     """
+    idle_timeout = 2.0
+    timeout = 15
+
     def do_GET(self)-> None:
         """Handle an incoming HTTP GET request.
         Parses the request URL and dispatches execution to the
@@ -121,15 +135,48 @@ class MyHandler(BaseHTTPRequestHandler):
         Returns:
             None
         """
+        body = html.encode("utf-8")
         self.send_response(200)
         self.send_header("Content-type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(html.encode("utf-8"))
-    
-    
-    
+        self.wfile.write(body)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Start the HTTP server.
+    Args:
+        argv - command line arguments, sys.argv[1:] by default
+    """
+    parser = argparse.ArgumentParser(description="CurrenciesListApp HTTP server")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=8,
+                        help="connections served concurrently")
+    parser.add_argument("--single", action="store_true",
+                        help="serve one request at a time (plain HTTPServer)")
+    parser.add_argument("--refresh", type=float, default=refresher.interval,
+                        help="seconds between background rate updates, 0 disables them")
+    args = parser.parse_args(argv)
+
+    if args.single:
+        server = HTTPServer((args.host, args.port), MyHandler)
+    else:
+        server = PooledHTTPServer((args.host, args.port), MyHandler, max_workers=args.workers)
+    if args.refresh > 0:
+        refresher.interval = args.refresh
+        refresher.stale_after = 2 * args.refresh
+        refresher.start()
+    print(f"Server started at http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        refresher.stop(timeout=1)
+        server.server_close()
+
+
 #Starts the HTTP server on localhost at port 8080.
 if __name__ == "__main__":
-    server = HTTPServer(("localhost", 8080), MyHandler)
-    print("Server started at http://localhost:8080")
-    server.serve_forever()   
\ No newline at end of file
+    main()
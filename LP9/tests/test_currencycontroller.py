@@ -6,8 +6,24 @@ Tests all CRUD operations with mocked dependencies.
 import unittest
 from unittest.mock import MagicMock, patch
 
+import requests
+
 from controllers.currencycontroller import CurrencyController
 from controllers.databasecontroller import CurrencyRatesCRUD
+from utils.rates_cache import Rate, RateSnapshot
+
+
+class FakeCache:
+    """RatesCache stand-in; offline, a forced refresh fails like RatesCache does."""
+
+    def __init__(self, rates: dict, online: bool = True):
+        self.rates = rates
+        self.online = online
+
+    def snapshot(self, force: bool = False) -> RateSnapshot:
+        if force and not self.online:
+            raise requests.exceptions.ConnectionError("offline")
+        return RateSnapshot("02.03.2024", self.rates, 0.0, None, None)
 
 
 class TestCurrencyController(unittest.TestCase):
@@ -76,6 +92,33 @@ class TestCurrencyController(unittest.TestCase):
         self.assertEqual(result[0]["char_code"], "USD")
         self.mock_crud.read_all.assert_called_once()
 
+    def test_refresh_rates(self):
+        """
+        Test that refresh_rates writes the rates of stored
+        currencies to the CRUD layer in one call.
+        """
+        self.mock_crud.read_all.return_value = [{"char_code": "USD"}, {"char_code": "GBP"}]
+        self.mock_crud.update_many.return_value = 1
+        cache = FakeCache({
+            "USD": Rate("USD", "840", "Dollar", 1, 91.3336, "91,3336"),
+            "EUR": Rate("EUR", "978", "Euro", 1, 98.7079, "98,7079"),
+        })
+
+        self.assertEqual(self.controller.refresh_rates(cache), 1)
+        self.mock_crud.update_many.assert_called_once_with({"USD": 91.3336})
+
+    def test_refresh_rates_offline(self):
+        """
+        Test that a failed forced revalidation is reported
+        instead of writing the stale snapshot.
+        """
+        self.mock_crud.read_all.return_value = [{"char_code": "USD"}]
+        cache = FakeCache({"USD": Rate("USD", "840", "Dollar", 1, 91.3336, "91,3336")}, online=False)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.controller.refresh_rates(cache)
+        self.mock_crud.update_many.assert_not_called()
+
     def test_update_currency(self):
         """
         Test that updating a currency delegates
@@ -41,6 +41,17 @@ class TestDatabaseController(unittest.TestCase):
         currency = self.crud.read_by_code("USD")
         self.assertEqual(currency["value"], 91.5)
 
+    def test_update_many_currencies(self):
+        """Test updating several currencies at once."""
+        self.crud.create_many([
+            {"num_code": "840", "char_code": "USD", "name": "Dollar", "value": 90, "nominal": 1},
+            {"num_code": "978", "char_code": "EUR", "name": "Euro", "value": 98, "nominal": 1}
+        ])
+        updated = self.crud.update_many({"USD": 91.5, "EUR": 99.1, "GBP": 115.0})
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.crud.read_by_code("USD")["value"], 91.5)
+        self.assertEqual(self.crud.read_by_code("EUR")["value"], 99.1)
+
     def test_delete_currency(self):
         """Test deleting a currency by id."""
         self.crud.create_one({"num_code": "840", "char_code": "USD", "name": "Dollar", "value": 90, "nominal": 1})
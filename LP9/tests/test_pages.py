@@ -12,6 +12,7 @@ from jinja2 import Environment, DictLoader
 from controllers.pages import PagesController
 from controllers.currencycontroller import CurrencyController
 from models import App, Author
+from utils.rates_refresher import RatesRefresher
 
 
 class TestPagesController(unittest.TestCase):
@@ -63,6 +64,19 @@ class TestPagesController(unittest.TestCase):
         html = self.pages.currencies()
         self.assertIn("USD", html)
 
+    def test_currencies_page_shows_refresh_status(self):
+        """
+        Test that the refresher status is passed to the currencies template.
+        """
+        self.pages.env.loader.mapping["currencies.html"] = (
+            "{{ status.updated_at }} {{ status.stale }}"
+        )
+        self.pages.refresher = RatesRefresher(lambda: None, interval=60)
+        self.assertEqual(self.pages.currencies(), "None True")
+
+        self.pages.refresher.refresh()
+        self.assertIn("False", self.pages.currencies())
+
     def test_render_error_page(self):
         """
         Test that error page renders provided error message.
@@ -0,0 +1,108 @@
+"""
+Tests for RateClient against a local HTTP/1.1 stub server.
+The stub records the client port of every request, so a reused
+keep-alive connection is visible as the same port.
+"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from utils.rate_client import RateClient, get_client
+
+BODY = b"<ValCurs Date=\"02.03.2024\"></ValCurs>"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves BODY with an ETag; answers `failures` requests with 503 first."""
+    protocol_version = "HTTP/1.1"
+    requests = []
+    failures = 0
+
+    def do_GET(self):
+        type(self).requests.append((self.client_address[1], dict(self.headers)))
+        if type(self).failures > 0:
+            type(self).failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRateClient(unittest.TestCase):
+    """Test suite for the pooled rate client."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("localhost", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://localhost:{cls.server.server_address[1]}/scripts/XML_daily.asp"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.requests = []
+        StubHandler.failures = 0
+        self.client = RateClient(backoff_factor=0)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_connection_is_reused(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.url, conditional=False).content, BODY)
+        ports = {port for port, _ in StubHandler.requests}
+        self.assertEqual(len(StubHandler.requests), 3)
+        self.assertEqual(len(ports), 1)
+
+    def test_conditional_get_returns_remembered_response(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertIs(second, first)
+        self.assertEqual(second.content, BODY)
+        self.assertNotIn("If-None-Match", StubHandler.requests[0][1])
+        self.assertEqual(StubHandler.requests[1][1].get("If-None-Match"), '"v1"')
+        self.assertEqual(self.client.not_modified, 1)
+
+    def test_unconditional_get_passes_304_through(self):
+        response = self.client.get(self.url, headers={"If-None-Match": '"v1"'}, conditional=False)
+        self.assertEqual(response.status_code, 304)
+
+    def test_server_errors_are_retried(self):
+        StubHandler.failures = 2
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(StubHandler.requests), 3)
+
+    def test_retries_are_bounded(self):
+        StubHandler.failures = 10
+        client = RateClient(retries=1, backoff_factor=0)
+        try:
+            response = client.get(self.url)
+        finally:
+            client.close()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(StubHandler.requests), 2)
+
+    def test_shared_client(self):
+        self.assertIs(get_client(), get_client())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+"""
+Tests for RatesCache against a local stub of the CBR XML endpoint.
+The stub counts requests and answers conditional GETs with 304.
+"""
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+from utils.currencies_api import get_currencies
+from utils.rate_client import RateClient
+from utils.rates_cache import RatesCache, parse_rates
+
+DOCUMENT = """<?xml version="1.0" encoding="windows-1251"?>
+<ValCurs Date="02.03.2024" name="Foreign Currency Market">
+<Valute ID="R01235"><NumCode>840</NumCode><CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США</Name><Value>91,3336</Value></Valute>
+<Valute ID="R01239"><NumCode>978</NumCode><CharCode>EUR</CharCode><Nominal>1</Nominal><Name>Евро</Name><Value>98,7079</Value></Valute>
+<Valute ID="R01820"><NumCode>392</NumCode><CharCode>JPY</CharCode><Nominal>100</Nominal><Name>Японских иен</Name><Value>60,8650</Value></Valute>
+</ValCurs>""".encode("windows-1251")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves DOCUMENT with an ETag, 304 if the client already has it."""
+    requests = []
+    etag = '"v1"'
+    status = 200
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.status != 200:
+            self.send_response(self.status)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", "Sat, 02 Mar 2024 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(DOCUMENT)))
+        self.end_headers()
+        self.wfile.write(DOCUMENT)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRatesCache(unittest.TestCase):
+    """Test suite for the CBR rate snapshot cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("localhost", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://localhost:{cls.server.server_address[1]}/scripts/XML_daily.asp"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.requests = []
+        StubHandler.status = 200
+        self.clock = FakeClock()
+        self.cache = RatesCache(self.url, ttl=60, clock=self.clock, client=RateClient(backoff_factor=0))
+
+    def test_parse_rates(self):
+        date, rates = parse_rates(DOCUMENT)
+        self.assertEqual(date, "02.03.2024")
+        self.assertEqual(set(rates), {"USD", "EUR", "JPY"})
+        self.assertEqual(rates["JPY"].nominal, 100)
+        self.assertAlmostEqual(rates["JPY"].value, 60.865)
+        self.assertEqual(rates["USD"].text, "91,3336")
+
+    def test_parse_rates_tolerates_missing_fields(self):
+        date, rates = parse_rates(b"<ValCurs><Valute><CharCode>USD</CharCode><Value>93,52</Value></Valute>"
+                                  b"<Valute><CharCode>XDR</CharCode><Value>-</Value></Valute>"
+                                  b"<Valute><Value>1,0</Value></Valute></ValCurs>")
+        self.assertEqual(date, "")
+        self.assertEqual(set(rates), {"USD", "XDR"})
+        self.assertEqual(rates["USD"].nominal, 1)
+        self.assertEqual(rates["USD"].value, 93.52)
+        self.assertIsNone(rates["XDR"].value)
+
+    def test_one_download_for_many_lookups(self):
+        self.assertEqual(self.cache.get("usd").value, 91.3336)
+        self.assertEqual(self.cache.get("EUR").num_code, "978")
+        self.assertIsNone(self.cache.get("ZZZ"))
+        self.assertEqual(len(StubHandler.requests), 1)
+        self.assertEqual(self.cache.downloads, 1)
+
+    def test_revalidation_after_ttl(self):
+        self.cache.get("USD")
+        self.clock.now = 61.0
+        self.assertEqual(self.cache.age(), 61.0)
+        self.assertEqual(self.cache.get("USD").value, 91.3336)
+        self.assertEqual(len(StubHandler.requests), 2)
+        self.assertEqual(StubHandler.requests[1].get("If-None-Match"), '"v1"')
+        self.assertEqual(StubHandler.requests[1].get("If-Modified-Since"), "Sat, 02 Mar 2024 00:00:00 GMT")
+        self.assertEqual((self.cache.downloads, self.cache.revalidations), (1, 1))
+        self.assertEqual(self.cache.age(), 0.0)
+
+    def test_changed_document_is_downloaded(self):
+        self.cache.get("USD")
+        StubHandler.etag = '"v2"'
+        try:
+            self.cache.snapshot(force=True)
+        finally:
+            StubHandler.etag = '"v1"'
+        self.assertEqual(self.cache.downloads, 2)
+        self.assertEqual(self.cache.snapshot().etag, '"v2"')
+
+    def test_stale_snapshot_is_served_on_errors(self):
+        self.cache.get("USD")
+        StubHandler.status = 500
+        self.clock.now = 120.0
+        self.assertEqual(self.cache.get("EUR").value, 98.7079)
+        self.cache.clear()
+        with self.assertRaises(requests.exceptions.ConnectionError) as ctx:
+            self.cache.get("USD")
+        self.assertIsNotNone(ctx.exception.__cause__)
+
+    def test_no_refetch_during_outage(self):
+        self.cache.get("USD")
+        StubHandler.requests = []
+        StubHandler.status = 500
+        self.clock.now = 120.0
+        for _ in range(5):
+            self.assertEqual(self.cache.get("USD").value, 91.3336)
+        self.assertEqual(self.cache.failures, 1)
+        requests_in_outage = len(StubHandler.requests)
+
+        # the next attempt is made after retry_after seconds
+        StubHandler.status = 200
+        self.clock.now += self.cache.retry_after
+        self.cache.get("USD")
+        self.assertEqual(len(StubHandler.requests), requests_in_outage + 1)
+        self.assertEqual(self.cache.age(), 0.0)
+
+    def test_stale_snapshot_is_served_during_refresh(self):
+        self.cache.get("USD")
+        self.clock.now = 120.0
+        started, release = threading.Event(), threading.Event()
+        fetch = self.cache._fetch
+
+        def slow_fetch(previous):
+            started.set()
+            release.wait(5)
+            return fetch(previous)
+
+        self.cache._fetch = slow_fetch
+        refresh = threading.Thread(target=self.cache.snapshot)
+        refresh.start()
+        try:
+            self.assertTrue(started.wait(5))
+            # answered from the stale snapshot, without waiting for the refresh
+            self.assertEqual(self.cache.get("EUR").value, 98.7079)
+        finally:
+            release.set()
+            refresh.join()
+        self.assertEqual(self.cache.age(), 0.0)
+
+    def test_forced_refresh_reports_its_own_failure(self):
+        self.cache.get("USD")
+        self.clock.now = 120.0
+        started, release = threading.Event(), threading.Event()
+        fetch = self.cache._fetch
+        calls = []
+
+        def racing_fetch(previous):
+            calls.append(previous)
+            if len(calls) == 1:
+                started.set()
+                release.wait(5)
+                return fetch(previous)
+            raise requests.exceptions.ConnectionError("CBR is down")
+
+        self.cache._fetch = racing_fetch
+        refresh = threading.Thread(target=self.cache.snapshot)
+        refresh.start()
+        errors = []
+
+        def forced():
+            try:
+                self.cache.snapshot(force=True)
+            except requests.exceptions.ConnectionError as e:
+                errors.append(e)
+
+        forced_refresh = threading.Thread(target=forced)
+        try:
+            self.assertTrue(started.wait(5))
+            forced_refresh.start()
+            time.sleep(0.05)
+        finally:
+            # the concurrent refresh succeeds, the forced one still fails
+            release.set()
+            refresh.join()
+            forced_refresh.join()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(errors), 1)
+        self.assertIsNotNone(errors[0].__cause__)
+        self.assertEqual(self.cache.failures, 1)
+        self.assertEqual(self.cache.get("EUR").value, 98.7079)
+
+    def test_concurrent_callers_share_one_download(self):
+        threads = [threading.Thread(target=self.cache.get, args=("USD",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(StubHandler.requests), 1)
+
+    def test_get_currencies_uses_cache(self):
+        result = get_currencies(["USD", "ZZZ"], self.url, cache=self.cache)
+        self.assertEqual(result, {"USD": "91,3336", "ZZZ": "Код валюты 'ZZZ' не найден."})
+        get_currencies(["EUR"], self.url, cache=self.cache)
+        self.assertEqual(len(StubHandler.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for RatesRefresher.
+Jobs are plain functions; time is controlled by a fake clock.
+"""
+
+import threading
+import unittest
+
+from utils.rates_refresher import RatesRefresher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRatesRefresher(unittest.TestCase):
+    """Test suite for the background rate refresher."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.calls = 0
+
+    def job(self):
+        self.calls += 1
+        return self.calls
+
+    def test_status_before_first_refresh(self):
+        refresher = RatesRefresher(self.job, interval=60, clock=self.clock)
+        status = refresher.status()
+        self.assertIsNone(status.updated_at)
+        self.assertIsNone(status.age)
+        self.assertTrue(status.stale)
+
+    def test_refresh_and_staleness(self):
+        refresher = RatesRefresher(self.job, interval=60, clock=self.clock)
+        self.assertTrue(refresher.refresh())
+        self.assertEqual(refresher.result, 1)
+
+        self.clock.now += 90
+        status = refresher.status()
+        self.assertEqual(status.age, 90)
+        self.assertFalse(status.stale)
+
+        self.clock.now += 60
+        self.assertTrue(refresher.status().stale)
+
+    def test_failed_job_keeps_previous_data(self):
+        refresher = RatesRefresher(self.job, interval=60, clock=self.clock)
+        refresher.refresh()
+        refresher.job = lambda: 1 / 0
+
+        self.clock.now += 10
+        self.assertFalse(refresher.refresh())
+        status = refresher.status()
+        self.assertEqual(refresher.result, 1)
+        self.assertEqual(status.age, 10)
+        self.assertEqual(status.error, "division by zero")
+        self.assertEqual((refresher.refreshes, refresher.failures), (1, 1))
+
+    def test_background_thread(self):
+        done = threading.Event()
+
+        def job():
+            done.set()
+
+        refresher = RatesRefresher(job, interval=60)
+        refresher.start()
+        try:
+            self.assertTrue(done.wait(5))
+            self.assertTrue(refresher.running)
+        finally:
+            refresher.stop(timeout=5)
+        self.assertFalse(refresher.running)
+        self.assertEqual(refresher.refreshes, 1)
+
+    def test_restart_while_a_job_is_running(self):
+        release = threading.Event()
+        active, overlaps = [], []
+
+        def job():
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(len(active))
+            release.wait(5)
+            active.pop()
+
+        refresher = RatesRefresher(job, interval=60)
+        refresher.start()
+        old = refresher._thread
+        # the join times out while the job is still running
+        self.assertFalse(refresher.stop(timeout=0.05))
+        self.assertFalse(refresher.running)
+        self.assertIs(refresher._thread, old)
+
+        refresher.start()
+        self.assertTrue(refresher.running)
+        release.set()
+        old.join(5)
+        self.assertFalse(old.is_alive())
+        try:
+            for _ in range(100):
+                if refresher.refreshes == 2:
+                    break
+                threading.Event().wait(0.01)
+            self.assertEqual(refresher.refreshes, 2)
+            self.assertEqual(overlaps, [])
+            # the old thread exited on its own stop event, one loop is left
+            alive = [t for t in threading.enumerate() if t.name == "rates-refresher"]
+            self.assertEqual(alive, [refresher._thread])
+        finally:
+            self.assertTrue(refresher.stop(timeout=5))
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            RatesRefresher(self.job, interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+Tests for PooledHTTPServer and for sharing the database between threads.
+Servers are started on a free localhost port in a background thread.
+"""
+
+import http.client
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+
+from controllers.databasecontroller import DatabaseController, CurrencyRatesCRUD
+from myapp import MyHandler
+from utils.server import PooledHTTPServer
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Handler whose '/slow' route blocks until the test releases it."""
+    protocol_version = "HTTP/1.1"
+    release = threading.Event()
+
+    def do_GET(self):
+        if self.path == "/slow":
+            self.release.wait(5)
+        body = self.path.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietHandler(MyHandler):
+    idle_timeout = 0.3
+
+    def log_message(self, *args):
+        pass
+
+
+class LingeringHandler(QuietHandler):
+    """Would keep idle connections longer than the test runs."""
+    idle_timeout = 30.0
+
+
+def start(server):
+    """Run server.serve_forever() in a daemon thread."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledHTTPServer(unittest.TestCase):
+    """Test suite for the concurrent serving mode."""
+
+    def test_slow_request_does_not_block_others(self):
+        """A request waiting in one worker does not delay other clients."""
+        SlowHandler.release.clear()
+        server = PooledHTTPServer(("localhost", 0), SlowHandler, max_workers=4)
+        port = start(server)
+        try:
+            slow = http.client.HTTPConnection("localhost", port, timeout=5)
+            slow.request("GET", "/slow")
+            t0 = time.perf_counter()
+            fast = http.client.HTTPConnection("localhost", port, timeout=5)
+            fast.request("GET", "/fast")
+            self.assertEqual(fast.getresponse().read(), b"/fast")
+            self.assertLess(time.perf_counter() - t0, 1.0)
+            SlowHandler.release.set()
+            self.assertEqual(slow.getresponse().read(), b"/slow")
+            slow.close()
+            fast.close()
+        finally:
+            SlowHandler.release.set()
+            stop(server)
+
+    @patch("myapp.pages")
+    def test_keep_alive(self, mock_pages):
+        """Several requests are served over one HTTP/1.1 connection."""
+        mock_pages.index.return_value = "INDEX PAGE"
+        server = PooledHTTPServer(("localhost", 0), QuietHandler, max_workers=2)
+        port = start(server)
+        try:
+            conn = http.client.HTTPConnection("localhost", port, timeout=5)
+            for _ in range(3):
+                conn.request("GET", "/")
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.read().decode("utf-8"), "INDEX PAGE")
+                self.assertEqual(response.getheader("Content-Length"), str(len("INDEX PAGE")))
+            # the same socket was used for every request
+            self.assertIsNotNone(conn.sock)
+            conn.close()
+        finally:
+            stop(server)
+
+    @patch("myapp.pages")
+    def test_idle_keep_alive_clients_do_not_block_new_ones(self, mock_pages):
+        """Idle kept-alive connections holding every worker are closed for a new client."""
+        mock_pages.index.return_value = "INDEX PAGE"
+        server = PooledHTTPServer(("localhost", 0), LingeringHandler, max_workers=2)
+        port = start(server)
+        idle = []
+        try:
+            for _ in range(server.max_workers):
+                conn = http.client.HTTPConnection("localhost", port, timeout=5)
+                conn.request("GET", "/")
+                conn.getresponse().read()
+                idle.append(conn)
+            time.sleep(0.1)
+            t0 = time.perf_counter()
+            conn = http.client.HTTPConnection("localhost", port, timeout=5)
+            conn.request("GET", "/")
+            self.assertEqual(conn.getresponse().read(), b"INDEX PAGE")
+            self.assertLess(time.perf_counter() - t0, 1.0)
+            conn.close()
+        finally:
+            t0 = time.perf_counter()
+            stop(server)
+            self.assertLess(time.perf_counter() - t0, 1.0)
+            for conn in idle:
+                conn.close()
+
+    @patch("myapp.pages")
+    def test_idle_timeout(self, mock_pages):
+        """An idle kept-alive connection is closed after idle_timeout."""
+        mock_pages.index.return_value = "INDEX PAGE"
+        server = PooledHTTPServer(("localhost", 0), QuietHandler, max_workers=2)
+        port = start(server)
+        try:
+            sock = socket.create_connection(("localhost", port), timeout=5)
+            sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            t0 = time.perf_counter()
+            data = b""
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+            self.assertIn(b"INDEX PAGE", data)
+            self.assertLess(time.perf_counter() - t0, QuietHandler.idle_timeout + 1.0)
+            sock.close()
+        finally:
+            stop(server)
+
+    @patch("myapp.pages")
+    def test_pipelined_requests(self, mock_pages):
+        """Requests already buffered on the connection are not mistaken for idleness."""
+        mock_pages.index.return_value = "INDEX PAGE"
+        server = PooledHTTPServer(("localhost", 0), QuietHandler, max_workers=1)
+        port = start(server)
+        try:
+            sock = socket.create_connection(("localhost", port), timeout=5)
+            request = b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            sock.sendall(request * 2 + request.replace(b"\r\n\r\n", b"\r\nConnection: close\r\n\r\n"))
+            data = b""
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+            self.assertEqual(data.count(b"INDEX PAGE"), 3)
+            sock.close()
+        finally:
+            stop(server)
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            PooledHTTPServer(("localhost", 0), SlowHandler, max_workers=0)
+
+
+class TestSharedDatabase(unittest.TestCase):
+    """The in-memory database is shared by the request threads."""
+
+    def test_concurrent_writes_and_reads(self):
+        db = DatabaseController()
+        crud = CurrencyRatesCRUD(db.con, db.lock)
+        errors = []
+
+        def worker(i):
+            try:
+                for j in range(20):
+                    crud.create_one({"num_code": str(i), "char_code": f"C{i}{j}", "name": "X",
+                                     "value": float(j), "nominal": 1})
+                    crud.read_all()
+            except Exception as e:  # collected and reported by the test
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(crud.read_all()), 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# answers worth retrying: rate limiting and temporary server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateClient:
+    """
+    HTTP client shared by the rate fetchers.
+    - one requests.Session with a connection pool: repeated requests to the
+      same host reuse a kept-alive TCP/TLS connection instead of a new handshake
+    - connection errors and RETRY_STATUSES are retried `retries` times with
+      exponential backoff (Retry-After is respected)
+    - with `conditional=True` the last 200 response of a URL is remembered
+      together with its ETag/Last-Modified; the next request sends
+      If-None-Match/If-Modified-Since and a 304 answer returns the remembered
+      response, so an unchanged document is not transferred again
+    """
+
+    def __init__(self, pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5,
+                 timeout: float = 10.0):
+        """
+        Args:
+            pool_size: connections kept per host
+            retries: retries of a failed request (0 disables them)
+            backoff_factor: sleep before the n-th retry is backoff_factor * 2 ** (n - 1) seconds
+            timeout: default HTTP timeout in seconds
+        """
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        if retries < 0:
+            raise ValueError("retries must be non-negative")
+        self.timeout = timeout
+        self.not_modified = 0
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=("GET", "HEAD"),
+            # after the last retry hand the error response to raise_for_status()
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._responses: dict = {}  # url -> last 200 response with validators
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: dict | None = None, timeout: float | None = None,
+            conditional: bool = True) -> requests.Response:
+        """GET `url` through the pooled session.
+        Args:
+            url: address of the document
+            headers: additional request headers
+            timeout: HTTP timeout in seconds, defaults to `self.timeout`
+            conditional: revalidate the remembered response of `url` instead
+                of downloading it again; with False the answer (including a
+                304) is returned as is
+        Returns:
+            requests.Response
+        Raises:
+            requests.exceptions.RequestException on connection errors
+        """
+        headers = dict(headers or {})
+        cached = None
+        if conditional:
+            with self._lock:
+                cached = self._responses.get(url)
+            if cached is not None:
+                if cached.headers.get("ETag"):
+                    headers.setdefault("If-None-Match", cached.headers["ETag"])
+                if cached.headers.get("Last-Modified"):
+                    headers.setdefault("If-Modified-Since", cached.headers["Last-Modified"])
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+        if not conditional:
+            return response
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.not_modified += 1
+            return cached
+        if response.status_code == 200 and ("ETag" in response.headers or "Last-Modified" in response.headers):
+            with self._lock:
+                self._responses[url] = response
+        return response
+
+    def close(self) -> None:
+        """Close the pooled connections and forget remembered responses."""
+        with self._lock:
+            self._responses.clear()
+        self.session.close()
+
+
+_client: RateClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> RateClient:
+    """Process-wide RateClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = RateClient()
+        return _client
@@ -0,0 +1,210 @@
+import threading
+import time
+from io import BytesIO
+from typing import Callable, NamedTuple
+from xml.etree import ElementTree as ET
+
+import requests
+
+from utils.rate_client import RateClient, get_client
+
+CBR_URL = 'https://www.cbr.ru/scripts/XML_daily.asp'
+
+
+class Rate(NamedTuple):
+    """One <Valute> entry of the CBR daily document."""
+    char_code: str
+    num_code: str
+    name: str
+    nominal: int
+    value: float | None  # rubles per `nominal` units, None if Value is not a number
+    text: str  # Value as published, e.g. "93,52"
+
+
+class RateSnapshot(NamedTuple):
+    """Parsed daily document with the validators of the response."""
+    date: str
+    rates: dict  # CharCode -> Rate
+    fetched_at: float  # clock() of the last download or 304 revalidation
+    etag: str | None
+    last_modified: str | None
+
+
+def _number(text: str) -> float | None:
+    """Convert "93,52" to 93.52, None if the text is not a number."""
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def parse_rates(content: bytes) -> tuple[str, dict]:
+    """Index all <Valute> entries of a CBR document by CharCode in one pass.
+    The document is read with iterparse: every <Valute> is converted when
+    its end tag is reached and cleared right away, the tree is never built
+    completely. Missing NumCode/Name/Nominal are tolerated.
+    Args:
+        content - XML_daily.asp response body
+    Returns:
+        (document date, {CharCode: Rate})
+    Raises:
+        xml.etree.ElementTree.ParseError if the document is not valid XML
+    """
+    date = ""
+    rates = {}
+    for event, elem in ET.iterparse(BytesIO(content), events=("start", "end")):
+        if event == "start":
+            if elem.tag == "ValCurs":
+                date = elem.get("Date", "")
+            continue
+        if elem.tag != "Valute":
+            continue
+        fields = {child.tag: (child.text or "").strip() for child in elem}
+        char_code = fields.get("CharCode", "")
+        if char_code:
+            text = fields.get("Value", "")
+            nominal = fields.get("Nominal", "1")
+            rates[char_code] = Rate(
+                char_code=char_code,
+                num_code=fields.get("NumCode", ""),
+                name=fields.get("Name", ""),
+                nominal=int(nominal) if nominal.isdigit() else 1,
+                value=_number(text),
+                text=text,
+            )
+        elem.clear()
+    return date, rates
+
+
+class RatesCache:
+    """
+    In-memory snapshot of the CBR daily rates.
+    - the document is downloaded once and indexed by CharCode
+    - after `ttl` seconds the snapshot is revalidated with a conditional
+      GET (If-None-Match / If-Modified-Since); a 304 answer keeps the
+      parsed rates and only restarts the TTL
+    - concurrent callers wait for a single download; once there is a
+      snapshot they get it at once while another thread refreshes it
+    - if a refresh fails, the previous snapshot is served and the next
+      attempt is made only after `retry_after` seconds
+    """
+
+    def __init__(self, url: str = CBR_URL, ttl: float = 3600.0, timeout: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic, client: RateClient | None = None,
+                 retry_after: float = 60.0):
+        """
+        Args:
+            url: CBR XML endpoint
+            ttl: seconds a snapshot is served without revalidation
+            timeout: HTTP timeout in seconds
+            clock: time source (monotonic seconds)
+            client: HTTP client, defaults to the shared pooled RateClient
+            retry_after: seconds a stale snapshot is served without new
+                attempts after a failed refresh
+        """
+        if ttl < 0:
+            raise ValueError("ttl must be non-negative")
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.clock = clock
+        self.client = client or get_client()
+        self.downloads = 0
+        self.revalidations = 0
+        self.failures = 0
+        self.retry_after = retry_after
+        self._next_attempt = float("-inf")  # clock() before which a failed refresh is not retried
+        self._snapshot: RateSnapshot | None = None
+        self._lock = threading.Lock()
+
+    def _fetch(self, previous: RateSnapshot | None) -> RateSnapshot:
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+        # the cache keeps its own validators, so a 304 is passed through as is
+        response = self.client.get(self.url, headers=headers, timeout=self.timeout, conditional=False)
+        if response.status_code == 304 and previous is not None:
+            self.revalidations += 1
+            return previous._replace(fetched_at=self.clock())
+        response.raise_for_status()
+        date, rates = parse_rates(response.content)
+        self.downloads += 1
+        return RateSnapshot(date, rates, self.clock(),
+                            response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def snapshot(self, force: bool = False) -> RateSnapshot:
+        """Current snapshot, refreshed first if it is older than `ttl`.
+        Args:
+            force - revalidate even if the snapshot is fresh; a failed
+                revalidation raises instead of returning the stale snapshot
+        Returns:
+            RateSnapshot
+        Raises:
+            requests.exceptions.ConnectionError if the document cannot be
+            fetched and there is no snapshot yet or `force` is set
+        """
+        snap = self._snapshot
+        if not force and self._usable(snap):
+            return snap
+        if not force and snap is not None:
+            # a refresh is running in another thread: serve the stale snapshot meanwhile
+            if not self._lock.acquire(blocking=False):
+                return snap
+        else:
+            self._lock.acquire()
+        try:
+            snap = self._snapshot
+            # another thread may have refreshed while we waited for the lock
+            if not force and self._usable(snap):
+                return snap
+            try:
+                self._snapshot = self._fetch(snap)
+            except (requests.exceptions.RequestException, ET.ParseError, ValueError) as e:
+                self.failures += 1
+                if snap is not None:
+                    # keep serving the stale snapshot, without new attempts for a while
+                    self._next_attempt = self.clock() + self.retry_after
+                if snap is None or force:
+                    raise requests.exceptions.ConnectionError(f"Ошибка при запросе к API: {e}") from e
+            else:
+                self._next_attempt = float("-inf")
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+    def _usable(self, snap: RateSnapshot | None) -> bool:
+        """Snapshot is fresh, or stale but a failed refresh must not be retried yet."""
+        if snap is None:
+            return False
+        now = self.clock()
+        return now - snap.fetched_at < self.ttl or now < self._next_attempt
+
+    def get(self, char_code: str) -> Rate | None:
+        """Rate for an alphabetic code (case-insensitive), None if it is not published."""
+        return self.snapshot().rates.get(char_code.upper())
+
+    def age(self) -> float | None:
+        """Seconds since the last download or revalidation, None before the first one."""
+        snap = self._snapshot
+        return None if snap is None else self.clock() - snap.fetched_at
+
+    def clear(self) -> None:
+        """Drop the snapshot; the next lookup downloads the document again."""
+        with self._lock:
+            self._snapshot = None
+            self._next_attempt = float("-inf")
+
+
+_caches: dict = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(url: str = CBR_URL) -> RatesCache:
+    """Process-wide RatesCache for `url`."""
+    with _caches_lock:
+        if url not in _caches:
+            _caches[url] = RatesCache(url)
+        return _caches[url]
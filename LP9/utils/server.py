@@ -0,0 +1,138 @@
+import select
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTP server that handles connections in a bounded pool of worker threads.
+
+    A slow request (e.g. waiting for the CBR API) occupies one worker
+    instead of the whole server. At most `max_workers` connections are
+    served at a time; further connections wait in the listen backlog
+    until a worker becomes free, so the number of threads stays bounded.
+    With HTTP/1.1 keep-alive a connection holds its worker between
+    requests; handlers derived from KeepAliveHandler register such idle
+    connections, and when every worker is busy the server closes them to
+    serve the new client.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, max_workers: int = 8):
+        """
+        Args:
+            server_address: (host, port) pair
+            handler_class: BaseHTTPRequestHandler subclass
+            max_workers: number of connections served concurrently
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        super().__init__(server_address, handler_class)
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        self._idle: set = set()  # kept-alive connections waiting for their next request
+        self._idle_lock = threading.Lock()
+
+    def process_request(self, request, client_address) -> None:
+        """
+        Hand the accepted connection to a worker thread.
+        If all workers are busy, idle keep-alive connections are closed
+        first; the accept loop blocks only while every worker is
+        processing a request.
+        """
+        if not self._slots.acquire(blocking=False):
+            self.close_idle_connections()
+            self._slots.acquire()
+        try:
+            self._pool.submit(self._process, request, client_address)
+        except RuntimeError:
+            # pool is shut down
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process(self, request, client_address) -> None:
+        """Worker side: same as socketserver.ThreadingMixIn.process_request_thread."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def mark_idle(self, connection: socket.socket) -> None:
+        """Handler side: `connection` waits for its next request and may be closed."""
+        with self._idle_lock:
+            self._idle.add(connection)
+
+    def mark_busy(self, connection: socket.socket) -> bool:
+        """Handler side: the wait is over. Returns False if the server closed `connection`."""
+        with self._idle_lock:
+            if connection not in self._idle:
+                return False
+            self._idle.remove(connection)
+            return True
+
+    def close_idle_connections(self) -> int:
+        """Close all idle keep-alive connections, their workers finish at once.
+        Returns:
+            Number of closed connections
+        """
+        with self._idle_lock:
+            idle, self._idle = self._idle, set()
+        for connection in idle:
+            try:
+                # wakes the handler waiting in select() with end of stream
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        return len(idle)
+
+    def server_close(self) -> None:
+        """Stop accepting connections and wait for the workers."""
+        super().server_close()
+        self.close_idle_connections()
+        self._pool.shutdown(wait=True)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 request handler with a short keep-alive.
+    Between two requests of one connection the handler waits at most
+    `idle_timeout` seconds; under PooledHTTPServer the connection is
+    registered as idle meanwhile, so the server can take the worker back.
+    `timeout` still limits reading a request that has started.
+    """
+    protocol_version = "HTTP/1.1"
+    idle_timeout = 2.0
+
+    def handle(self) -> None:
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._wait_for_request():
+            self.handle_one_request()
+
+    def _wait_for_request(self) -> bool:
+        """Wait for the next request on the connection, False to close it."""
+        connection = self.connection
+        # a pipelined request may already be in the read buffer
+        connection.settimeout(0.0)
+        try:
+            buffered = self.rfile.peek(1)
+        except OSError:
+            buffered = b""
+        finally:
+            connection.settimeout(self.timeout)
+        if buffered:
+            return True
+        pooled = isinstance(self.server, PooledHTTPServer)
+        if pooled:
+            self.server.mark_idle(connection)
+        ready, _, _ = select.select([connection], [], [], self.idle_timeout)
+        if pooled and not self.server.mark_busy(connection):
+            return False
+        return bool(ready)